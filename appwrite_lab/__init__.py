@@ -1,12 +1,36 @@
-from .labs import Labs
+from typing import TYPE_CHECKING
 
-_labs: Labs | None = None
+if TYPE_CHECKING:
+    from .async_labs import AsyncLabs
+    from .labs import Labs
+    from .pool import LabPool
+
+# Imported on first access, so `import appwrite_lab` (and the CLI) stays fast
+_LAZY = {
+    "Labs": ".labs",
+    "AsyncLabs": ".async_labs",
+    "LabPool": ".pool",
+}
+
+_labs: "Labs | None" = None
 is_cli: bool = False
 
 
-def get_global_labs() -> Labs:
+def __getattr__(name: str):
+    if name in _LAZY:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_global_labs() -> "Labs":
     global _labs
     if not _labs:
+        from .labs import Labs
+
         _labs = Labs()
     return _labs
 
@@ -16,4 +40,4 @@ def set_cli_true():
     is_cli = True
 
 
-__all__ = ["Labs", "get_labs"]
+__all__ = ["Labs", "AsyncLabs", "LabPool", "get_labs"]
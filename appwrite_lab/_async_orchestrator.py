@@ -0,0 +1,417 @@
+import asyncio
+import contextlib
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+
+from .automations.models import AppwriteUserCreation
+from .config import ENGINE_API, READINESS_TIMEOUT
+from ._engine import (
+    AsyncEngineClient,
+    Container,
+    EngineAPIError,
+    connect_async,
+    label_filters,
+    parse_ps_output,
+)
+from ._orchestrator import (
+    OrchestratorError,
+    Response,
+    ServiceOrchestrator,
+    command_error,
+    extract_port_from_pod_info,
+    new_lab,
+    port_allocation,
+)
+from ._readiness import (
+    ReadinessReport,
+    container_probe_async,
+    http_probe_async,
+    wait_until_ready_async,
+)
+from ._trace import annotate, emit, span, traced
+from .models import Automation, Lab
+
+
+async def run_cmd_async(
+    cmd: list[str], envs: dict[str, str] | None = None
+) -> subprocess.CompletedProcess:
+    """Run a command as an asyncio subprocess and return the output.
+
+    Raises like `run_cmd` when the command fails.
+
+    Args:
+        cmd: The command to run.
+        envs: The environment variables to set.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env={**os.environ, **envs} if envs else None,
+    )
+    stdout, stderr = await proc.communicate()
+    result = subprocess.CompletedProcess(
+        cmd, proc.returncode, stdout.decode(), stderr.decode()
+    )
+    if result.returncode != 0:
+        raise command_error(result.stderr)
+    return result
+
+
+@contextlib.asynccontextmanager
+async def port_allocation_async() -> AsyncIterator[None]:
+    """
+    Hold `port_allocation` from a coroutine.
+
+    The lock is waited for in a thread, leaving the loop free. When the task
+    is cancelled meanwhile, the thread still takes the lock, so whichever of
+    the two comes last releases it again.
+    """
+    held = port_allocation()
+    guard = threading.Lock()
+    state = {"acquired": False, "abandoned": False}
+
+    def acquire():
+        held.__enter__()
+        with guard:
+            if state["abandoned"]:
+                held.__exit__(None, None, None)
+            else:
+                state["acquired"] = True
+
+    try:
+        await asyncio.to_thread(acquire)
+    except asyncio.CancelledError:
+        with guard:
+            state["abandoned"] = True
+            if state["acquired"]:
+                held.__exit__(None, None, None)
+        raise
+    try:
+        yield
+    finally:
+        held.__exit__(None, None, None)
+
+
+class AsyncServiceOrchestrator:
+    def __init__(self, orchestrator: ServiceOrchestrator):
+        """
+        Asyncio counterpart of `ServiceOrchestrator`, to deploy, query and tear
+        down many labs together from one event loop.
+
+        Compose commands run as asyncio subprocesses, and containers are
+        queried through an asyncio Engine API client (or an asyncio `ps`
+        without an engine socket), so the loop keeps running while labs come
+        up. Automations run their synchronous implementation in a thread.
+
+        Args:
+            orchestrator: The orchestrator whose state, backend and automation
+                worker are shared.
+        """
+        self.sync = orchestrator
+        self.state = orchestrator.state
+        self._engine: asyncio.Task | None = None
+
+    @property
+    def backend(self) -> str:
+        return self.sync.backend
+
+    def get_lab(self, name: str) -> Lab | None:
+        """
+        Get a lab by name.
+        """
+        return self.sync.get_lab(name)
+
+    async def engine(self) -> AsyncEngineClient | None:
+        """The asyncio Engine API client of the running loop, or `None` to use the CLI."""
+        loop = asyncio.get_running_loop()
+        # Clients are bound to the loop they were opened in
+        if self._engine is None or self._engine.get_loop() is not loop:
+            self._engine = loop.create_task(
+                connect_async(self.backend) if ENGINE_API else asyncio.sleep(0)
+            )
+        # Shared by every caller, so one of them being cancelled must not cancel it
+        return await asyncio.shield(self._engine)
+
+    async def containers(
+        self,
+        project: str | None = None,
+        service: str | None = None,
+        name: str | None = None,
+        compose_only: bool = True,
+    ) -> list[Container]:
+        """
+        List running compose containers, as in `ServiceOrchestrator.containers`.
+
+        Args:
+            project: Only containers of this compose project.
+            service: Only containers of this compose service.
+            name: Only containers whose name contains this.
+            compose_only: Whether to leave out containers that no compose
+                project started, when neither `project` nor `service` is given.
+        """
+        labels = {}
+        if compose_only or project is not None or service is not None:
+            labels = label_filters(project, service)
+        if (engine := await self.engine()) is not None:
+            try:
+                return await engine.containers(labels=labels, name=name)
+            except EngineAPIError:
+                pass
+        cmd = [self.sync.util, "ps"]
+        for key, value in labels.items():
+            label = key if value is None else f"{key}={value}"
+            cmd.extend(["--filter", f"label={label}"])
+        if name:
+            cmd.extend(["--filter", f"name={name}"])
+        result = await run_cmd_async([*cmd, "--format", "json"])
+        return parse_ps_output(result.stdout)
+
+    async def cached_containers(
+        self, project: str | None = None, name: str | None = None
+    ) -> list[Container]:
+        """
+        List running compose containers from the inventory of the synchronous
+        orchestrator while it is live, otherwise through `containers`.
+
+        Args:
+            project: Only containers of this compose project.
+            name: Only containers whose name contains this.
+        """
+        inventory = self.sync._inventory
+        if inventory is not None and inventory.live:
+            return inventory.containers(project=project, name=name)
+        return await self.containers(project=project, name=name)
+
+    async def get_running_pods(self):
+        """
+        Get the names of all running pods.
+        """
+        pods = await self.containers(compose_only=False)
+        return {pod.name: pod.to_ps() for pod in pods}
+
+    async def get_pods_by_project(self, project_name: str):
+        """
+        Get the names of all pods by project name.
+
+        Args:
+            project_name: The name of the project to get the pods for.
+        """
+        pods = await self.cached_containers(project=project_name)
+        return [pod.to_ps() for pod in pods]
+
+    async def get_pod_by_service(self, project_name: str, service: str) -> dict | None:
+        """
+        Get the pod of a compose service within a project.
+
+        Args:
+            project_name: The name of the project the service belongs to.
+            service: The compose service name (e.g. `traefik`).
+        """
+        pods = await self.containers(project=project_name, service=service)
+        return pods[0].to_ps() if pods else None
+
+    async def check_pod_status(self, pod_name: str):
+        """
+        Check the status of a pod, as in `ServiceOrchestrator.check_pod_status`.
+        """
+        pods = await self.cached_containers(name=pod_name)
+        if any(pod.name == pod_name for pod in pods):
+            return True
+        pods = await self.containers(name=pod_name, compose_only=False)
+        return any(pod.name == pod_name for pod in pods)
+
+    async def _run_cmd_safely(self, cmd: list[str], envs: dict[str, str] = {}):
+        try:
+            return await run_cmd_async(cmd, envs)
+        except OrchestratorError as e:
+            return Response(error=True, message=f"{str(e)}", data=str(e))
+
+    async def _sync_inventory(self, project: str):
+        if self.sync._inventory is not None:
+            await asyncio.to_thread(self.sync._sync_inventory, project)
+
+    async def _deploy_compose_service(
+        self,
+        project: str,
+        template_paths: list[Path] | Path,
+        env_file: Path | None = None,
+        env_vars: dict[str, str] = {},
+        extra_args: list[str] = [],
+    ):
+        """
+        Barebone deployment of a service, as an asyncio subprocess.
+
+        Args:
+            project: The name of the project to deploy the service to.
+            template_paths: The path to the template to use for the service.
+            env_vars: The environment variables to set.
+            env_file: The path to the environment file to use for the service.
+            extra_args: Extra arguments to pass to the compose command.
+        """
+        cmd = self.sync._compose_up_cmd(project, template_paths, env_file, extra_args)
+        cmd_res = await self._run_cmd_safely(cmd, envs=env_vars)
+        await self._sync_inventory(project)
+        return cmd_res
+
+    @traced
+    async def deploy_appwrite_lab(
+        self,
+        name: str,
+        version: str,
+        port: int | None = None,
+        auth: AppwriteUserCreation | None = None,
+        **kwargs: dict[str, str],
+    ):
+        """
+        Deploy an Appwrite lab, as in `ServiceOrchestrator.deploy_appwrite_lab`.
+
+        Args:
+            name: The name to give to the deployment/project.
+            version: The version of the service to deploy.
+            port: The port to use for the Appwrite service. Must not be in use by another service.
+                Unset for an auto-assigned port.
+            auth: The authentication credentials.
+
+        Keyword Args:
+            just_deploy: Deploy the lab without creating an API key or project.
+            from_golden: Start from the golden image of the version instead of
+                bootstrapping through Playwright.
+            ready_timeout: Seconds the lab has to pass its readiness checks.
+        """
+        annotate(lab=name, version=version)
+        sync = self.sync
+        templates = sync._lab_templates(
+            name, version, await self.get_pods_by_project(name)
+        )
+        if type(templates) is Response:
+            return templates
+        async with port_allocation_async():
+            compose_args = sync._lab_compose_args(name, templates, port)
+            if type(compose_args) is Response:
+                return compose_args
+            ports, env_vars, services = compose_args
+            with span("compose_up", services="appwrite"):
+                cmd_res = await self._deploy_compose_service(**services["appwrite"])
+            if type(cmd_res) is Response and cmd_res.error:
+                return cmd_res
+            with span("compose_up", services="mailpit"):
+                await self._deploy_compose_service(**services["mailpit"])
+
+        with span("port_discovery"):
+            traefik_pod = await self.get_pod_by_service(name, "traefik")
+        if not traefik_pod:
+            await self.teardown_service(name)
+            return sync._deploy_failed(name, "traefik is not running")
+        ports["http"] = extract_port_from_pod_info(traefik_pod)
+        lab = new_lab(name, version, auth, ports, env_vars)
+
+        if kwargs.get("from_golden", False):
+            return await asyncio.to_thread(sync._deploy_from_golden, lab)
+
+        report = await self.wait_for_lab(
+            name, lab.url, timeout=kwargs.get("ready_timeout", READINESS_TIMEOUT)
+        )
+        if not report.is_ready:
+            await self.teardown_service(name)
+            return sync._deploy_failed(
+                name, f"{', '.join(report.pending)} did not become ready", report
+            )
+        lab.readiness = report.ready
+        if kwargs.get("just_deploy", False):
+            return Response(
+                error=False,
+                message=f"Lab '{name}' deployed with --just-deploy flag.",
+                data=lab,
+            )
+        api_key_res = await self.deploy_playwright_automation(
+            lab=lab,
+            automation=Automation.CREATE_USER_AND_API_KEY,
+            model=sync._api_key_model(lab),
+        )
+        if type(api_key_res) is Response and api_key_res.error:
+            api_key_res.message = sync._deploy_failed(
+                name, "failed to create API key"
+            ).message
+            await self.teardown_service(name)
+            return api_key_res
+        return sync._lab_deployed(lab, api_key_res.data)
+
+    @traced
+    async def wait_for_lab(
+        self, name: str, url: str, timeout: float = READINESS_TIMEOUT
+    ) -> ReadinessReport:
+        """
+        Wait until a lab's components are ready, as in `ServiceOrchestrator.wait_for_lab`.
+
+        Args:
+            name: The name of the lab.
+            url: The URL of the lab.
+            timeout: The overall deadline in seconds.
+        """
+
+        def service_pod(service: str):
+            return lambda: self.get_pod_by_service(name, service)
+
+        start_ns = time.time_ns()
+        async with httpx.AsyncClient(timeout=5) as client:
+            probes = {
+                "mariadb": container_probe_async(service_pod("mariadb")),
+                "redis": container_probe_async(service_pod("redis")),
+                "api": http_probe_async(client, f"{url}/v1/health/version"),
+                "console": http_probe_async(client, f"{url}/console/"),
+            }
+            report = await wait_until_ready_async(probes, timeout=timeout)
+        for component, seconds in report.ready.items():
+            emit(f"ready:{component}", start_ns, int(seconds * 1e9))
+        annotate(lab=name, pending=report.pending)
+        return report
+
+    async def deploy_playwright_automation(self, *args, **kwargs) -> str | Response:
+        """
+        Run an automation on a lab, as in `ServiceOrchestrator.deploy_playwright_automation`.
+
+        The automation runs in a thread, leaving the loop free.
+        """
+        return await asyncio.to_thread(
+            self.sync.deploy_playwright_automation, *args, **kwargs
+        )
+
+    async def run_automation_plan(self, *args, **kwargs) -> Response:
+        """
+        Run several automations as one plan, as in `ServiceOrchestrator.run_automation_plan`.
+
+        The plan runs in a thread, leaving the loop free.
+        """
+        return await asyncio.to_thread(self.sync.run_automation_plan, *args, **kwargs)
+
+    @traced
+    async def teardown_service(self, name: str):
+        """
+        Wind down a service.
+
+        Args:
+            name: The name of the service to teardown.
+        """
+        annotate(lab=name)
+        if not await self.get_pods_by_project(name):
+            return self.sync._nothing_to_stop(name)
+        with span("compose_down"):
+            cmd_res = await self._run_cmd_safely(self.sync._compose_down_cmd(name))
+        await self._sync_inventory(name)
+        return self.sync._lab_torn_down(name, cmd_res)
+
+    async def aclose(self):
+        """Close the Engine API client of the running loop."""
+        if self._engine is not None and self._engine.get_loop() is (
+            asyncio.get_running_loop()
+        ):
+            if (engine := await self._engine) is not None:
+                await engine.aclose()
+            self._engine = None
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import asdict, dataclass, field
+
+from .config import DISCOVERY_CACHE
+from .utils import get_discovery_path
+
+_VERSION = re.compile(r"v?\d+\.\d+[\w.+-]*")
+
+
+class DiscoveryError(RuntimeError): ...
+
+
+@dataclass(frozen=True)
+class Toolchain:
+    """The container backend and the binaries that drive it."""
+
+    backend: str
+    util: str | None
+    compose: tuple[str, ...]
+    # `compose-plugin` (`docker compose`), `docker-compose` or `podman-compose`
+    flavor: str
+    version: str = ""
+    # The modification time (ns) of each binary, to tell when one was replaced
+    binaries: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Toolchain":
+        return cls(**{**data, "compose": tuple(data["compose"])})
+
+    def is_current(self) -> bool:
+        """Whether every binary is still in place and unchanged."""
+        try:
+            return all(
+                os.stat(path).st_mtime_ns == mtime
+                for path, mtime in self.binaries.items()
+            )
+        except OSError:
+            return False
+
+
+def _stamp(*paths: str | None) -> dict[str, int]:
+    return {path: os.stat(path).st_mtime_ns for path in paths if path}
+
+
+def _compose_plugin() -> str | None:
+    """The path of the `docker compose` CLI plugin, where Docker looks for it."""
+    config = os.getenv("DOCKER_CONFIG", os.path.expanduser("~/.docker"))
+    for directory in (
+        os.path.join(config, "cli-plugins"),
+        "/usr/local/lib/docker/cli-plugins",
+        "/usr/local/libexec/docker/cli-plugins",
+        "/usr/lib/docker/cli-plugins",
+        "/usr/libexec/docker/cli-plugins",
+    ):
+        path = os.path.join(directory, "docker-compose")
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _version(compose: list[str]) -> str | None:
+    """The version of a compose command, or `None` when it does not run."""
+    try:
+        result = subprocess.run(
+            [*compose, "version"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    match = _VERSION.search(result.stdout)
+    return match.group(0) if match else result.stdout.strip()
+
+
+def detect(backend: str = "auto") -> Toolchain:
+    """
+    Find the container backend and its binaries on the PATH.
+
+    With `auto`, Docker wins when it has a working compose (the plugin or the
+    standalone `docker-compose`), then Podman with `podman-compose`.
+
+    Args:
+        backend: `auto`, `docker` or `podman`.
+
+    Raises:
+        DiscoveryError: When `auto` finds neither backend.
+    """
+    if backend != "podman":
+        docker = shutil.which("docker")
+        if docker or backend == "docker":
+            # The standalone binary is preferred when both are installed
+            plugin = None
+            if standalone := shutil.which("docker-compose"):
+                compose, flavor = [standalone], "docker-compose"
+            else:
+                compose, flavor = [docker, "compose"], "compose-plugin"
+                # Upgrading the plugin leaves the docker binary untouched
+                plugin = _compose_plugin()
+            version = _version(compose) if compose[0] else None
+            if backend == "docker" or standalone or version is not None:
+                return Toolchain(
+                    "docker",
+                    docker,
+                    tuple(compose),
+                    flavor,
+                    version or "",
+                    _stamp(docker, standalone or plugin),
+                )
+    podman, podman_compose = shutil.which("podman"), shutil.which("podman-compose")
+    if backend == "podman" or (podman and podman_compose):
+        return Toolchain(
+            "podman",
+            podman,
+            (podman_compose,),
+            "podman-compose",
+            (_version([podman_compose]) if podman_compose else None) or "",
+            _stamp(podman, podman_compose),
+        )
+    raise DiscoveryError("Neither Docker nor Podman found.")
+
+
+def _cache_key(backend: str) -> str:
+    # Another PATH can resolve to other binaries
+    path = os.environ.get("PATH", "")
+    return f"{backend}:{hashlib.sha256(path.encode()).hexdigest()[:16]}"
+
+
+def _load_cache() -> dict:
+    try:
+        with open(get_discovery_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(entries: dict):
+    path = get_discovery_path()
+    temp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        temp.write_text(json.dumps(entries))
+        os.replace(temp, path)
+    except OSError:
+        temp.unlink(missing_ok=True)
+
+
+def discover(backend: str = "auto", cache: bool = DISCOVERY_CACHE) -> Toolchain:
+    """
+    Find the container backend and its binaries, as `detect` does, reusing
+    what an earlier process found.
+
+    The result is kept in the state directory per backend and PATH, and found
+    again once one of its binaries is moved, removed or replaced.
+
+    Args:
+        backend: `auto`, `docker` or `podman`.
+        cache: Whether to read and keep the result in the cache.
+    """
+    if not cache:
+        return detect(backend)
+    key = _cache_key(backend)
+    entries = _load_cache()
+    if entry := entries.get(key):
+        try:
+            toolchain = Toolchain.from_dict(entry)
+        except TypeError:
+            toolchain = None
+        if toolchain and toolchain.is_current():
+            return toolchain
+    toolchain = detect(backend)
+    if toolchain.util:
+        entries[key] = asdict(toolchain)
+        _save_cache(entries)
+    return toolchain
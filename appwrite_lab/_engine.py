@@ -0,0 +1,390 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+PROJECT_LABEL = "com.docker.compose.project"
+SERVICE_LABEL = "com.docker.compose.service"
+
+# A published port as `ps` prints it, e.g. `0.0.0.0:8005->80/tcp` or `443/tcp`
+_PS_PORT = re.compile(
+    r"(?:(?P<ip>[^,]*):(?P<public>\d+)->)?(?P<private>\d+)/(?P<protocol>\w+)"
+)
+
+
+class EngineAPIError(Exception): ...
+
+
+@dataclass(frozen=True)
+class PortBinding:
+    private_port: int
+    protocol: str = "tcp"
+    public_port: int | None = None
+    ip: str | None = None
+
+    def __str__(self) -> str:
+        if self.public_port is None:
+            return f"{self.private_port}/{self.protocol}"
+        ip = f"[{self.ip}]" if self.ip and ":" in self.ip else self.ip or ""
+        return f"{ip}:{self.public_port}->{self.private_port}/{self.protocol}"
+
+
+@dataclass(frozen=True)
+class Container:
+    id: str
+    name: str
+    image: str = ""
+    state: str = ""
+    status: str = ""
+    labels: dict[str, str] = field(default_factory=dict)
+    ports: tuple[PortBinding, ...] = ()
+
+    @property
+    def project(self) -> str | None:
+        """The compose project the container belongs to."""
+        return self.labels.get(PROJECT_LABEL)
+
+    @property
+    def service(self) -> str | None:
+        """The compose service the container runs."""
+        return self.labels.get(SERVICE_LABEL)
+
+    @classmethod
+    def from_api(cls, data: dict) -> "Container":
+        """Build a container from an item of the Engine API `/containers/json`."""
+        return cls(
+            id=data["Id"],
+            name=data["Names"][0].lstrip("/") if data.get("Names") else data["Id"],
+            image=data.get("Image", ""),
+            state=data.get("State", ""),
+            status=data.get("Status", ""),
+            labels=data.get("Labels") or {},
+            ports=tuple(
+                PortBinding(
+                    private_port=port["PrivatePort"],
+                    protocol=port.get("Type", "tcp"),
+                    public_port=port.get("PublicPort"),
+                    ip=port.get("IP"),
+                )
+                for port in data.get("Ports") or []
+            ),
+        )
+
+    @classmethod
+    def from_ps(cls, data: dict) -> "Container":
+        """Build a container from an item of `ps --format json`, Docker or Podman."""
+        names, labels, ports = data.get("Names"), data.get("Labels"), data.get("Ports")
+        if isinstance(labels, str):
+            labels = dict(
+                label.split("=", 1) for label in labels.split(",") if "=" in label
+            )
+        if isinstance(ports, str):
+            ports = tuple(
+                PortBinding(
+                    private_port=int(match["private"]),
+                    protocol=match["protocol"],
+                    public_port=int(match["public"]) if match["public"] else None,
+                    ip=match["ip"].strip("[]") if match["ip"] is not None else None,
+                )
+                for port in ports.split(",")
+                if (match := _PS_PORT.fullmatch(port.strip()))
+            )
+        else:
+            ports = tuple(
+                PortBinding(
+                    private_port=port["container_port"],
+                    protocol=port.get("protocol", "tcp"),
+                    public_port=port.get("host_port"),
+                    ip=port.get("host_ip"),
+                )
+                for port in ports or []
+            )
+        return cls(
+            id=data.get("ID") or data.get("Id", ""),
+            name=names[0] if isinstance(names, list) else names,
+            image=data.get("Image", ""),
+            state=data.get("State", ""),
+            status=data.get("Status", ""),
+            labels=labels or {},
+            ports=ports,
+        )
+
+    def to_ps(self) -> dict:
+        """The container as `docker ps --format json` prints it."""
+        return {
+            "ID": self.id,
+            "Names": self.name,
+            "Image": self.image,
+            "Labels": ",".join(f"{key}={value}" for key, value in self.labels.items()),
+            "Ports": ", ".join(str(port) for port in self.ports),
+            "State": self.state,
+            "Status": self.status,
+        }
+
+
+def label_filters(
+    project: str | None = None, service: str | None = None
+) -> dict[str, str | None]:
+    """The compose labels to filter containers on, of any project if none is given."""
+    labels = {PROJECT_LABEL: project}
+    if service is not None:
+        labels[SERVICE_LABEL] = service
+    return labels
+
+
+def _label_filters(labels: dict[str, str | None]) -> list[str]:
+    return [key if value is None else f"{key}={value}" for key, value in labels.items()]
+
+
+def _containers_params(
+    labels: dict[str, str | None] | None, name: str | None, id: str | None, all: bool
+) -> dict:
+    filters = {}
+    if labels:
+        filters["label"] = _label_filters(labels)
+    if name:
+        filters["name"] = [name]
+    if id:
+        filters["id"] = [id]
+    params = {"filters": json.dumps(filters)} if filters else {}
+    if all:
+        params["all"] = "true"
+    return params
+
+
+def _parse_containers(response: httpx.Response) -> list[Container]:
+    if response.is_error:
+        raise EngineAPIError(
+            f"Engine API error {response.status_code}: {response.text.strip()}"
+        )
+    return [Container.from_api(item) for item in response.json()]
+
+
+def parse_ps_output(stdout: str) -> list[Container]:
+    """
+    Parse the output of `ps --format json`.
+
+    Docker prints a JSON object per line, Podman a single JSON array.
+    """
+    stdout = stdout.strip()
+    if stdout.startswith("["):
+        items = json.loads(stdout)
+    else:
+        items = [json.loads(line) for line in stdout.splitlines() if line.strip()]
+    return [Container.from_ps(item) for item in items]
+
+
+def find_socket(backend: str = "docker") -> Path | None:
+    """
+    Find the Engine API socket of a container backend.
+
+    `DOCKER_HOST` for Docker and `CONTAINER_HOST` for Podman win when they
+    name a unix socket; TCP hosts are left to the CLI. Podman only considers
+    its own sockets, never a Docker daemon's.
+
+    Args:
+        backend: `docker` or `podman`.
+    """
+    host = os.getenv("CONTAINER_HOST" if backend == "podman" else "DOCKER_HOST")
+    if host:
+        return (
+            Path(host.removeprefix("unix://")) if host.startswith("unix://") else None
+        )
+    if backend == "podman":
+        runtime_dir = os.getenv("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+        candidates = [
+            Path(runtime_dir) / "podman/podman.sock",
+            Path("/run/podman/podman.sock"),
+        ]
+    else:
+        candidates = [
+            Path("/var/run/docker.sock"),
+            Path.home() / ".docker/run/docker.sock",
+        ]
+    return next((path for path in candidates if path.is_socket()), None)
+
+
+class EngineClient:
+    def __init__(self, socket_path: str | Path, timeout: float = 10):
+        """
+        Client of the Docker Engine API, or Podman's Docker-compatible API.
+
+        Requests share one keep-alive connection over the unix socket, instead
+        of forking the CLI for each query.
+
+        Args:
+            socket_path: The unix socket of the engine.
+            timeout: The timeout of each request in seconds.
+        """
+        self.socket_path = Path(socket_path)
+        self.client = httpx.Client(
+            transport=httpx.HTTPTransport(uds=str(self.socket_path)),
+            base_url="http://localhost",
+            timeout=timeout,
+        )
+
+    def ping(self) -> bool:
+        """Whether the engine answers."""
+        try:
+            return self.client.get("/_ping").status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    def containers(
+        self,
+        labels: dict[str, str | None] | None = None,
+        name: str | None = None,
+        id: str | None = None,
+        all: bool = False,
+    ) -> list[Container]:
+        """
+        List containers, filtered by the engine.
+
+        Args:
+            labels: Labels the containers must have, as `key: value`, or
+                `key: None` for any value.
+            name: Part of the container name, as `ps --filter name=` matches it.
+            id: The ID of the container.
+            all: Include stopped containers.
+        """
+        params = _containers_params(labels, name, id, all)
+        try:
+            response = self.client.get("/containers/json", params=params)
+        except httpx.HTTPError as e:
+            raise EngineAPIError(f"Engine API unreachable: {e}") from e
+        return _parse_containers(response)
+
+    def events(
+        self, labels: dict[str, str | None] | None = None, since: float | None = None
+    ) -> Iterator[dict]:
+        """
+        Stream container events until the engine closes the connection.
+
+        Exec events, which healthchecks fire constantly, are left out.
+
+        Args:
+            labels: Labels the containers must have, as in `containers`.
+            since: Replay the events since this Unix time first.
+
+        Yields:
+            Each event as the engine sends it, e.g. with `Action: "start"`.
+        """
+        filters = {"type": ["container"]}
+        if labels:
+            filters["label"] = _label_filters(labels)
+        params = {"filters": json.dumps(filters)}
+        if since is not None:
+            params["since"] = f"{since:.9f}"
+        try:
+            with self.client.stream(
+                "GET",
+                "/events",
+                params=params,
+                timeout=httpx.Timeout(self.client.timeout.connect, read=None),
+            ) as response:
+                if response.is_error:
+                    response.read()
+                    raise EngineAPIError(
+                        f"Engine API error {response.status_code}: "
+                        f"{response.text.strip()}"
+                    )
+                for line in response.iter_lines():
+                    if line.strip():
+                        event = json.loads(line)
+                        if not event.get("Action", "").startswith("exec_"):
+                            yield event
+        except httpx.HTTPError as e:
+            raise EngineAPIError(f"Engine API events stream broke: {e}") from e
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class AsyncEngineClient:
+    def __init__(self, socket_path: str | Path, timeout: float = 10):
+        """
+        Asyncio client of the Engine API, like `EngineClient`.
+
+        Args:
+            socket_path: The unix socket of the engine.
+            timeout: The timeout of each request in seconds.
+        """
+        self.socket_path = Path(socket_path)
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=str(self.socket_path)),
+            base_url="http://localhost",
+            timeout=timeout,
+        )
+
+    async def ping(self) -> bool:
+        """Whether the engine answers."""
+        try:
+            return (await self.client.get("/_ping")).status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def containers(
+        self,
+        labels: dict[str, str | None] | None = None,
+        name: str | None = None,
+        id: str | None = None,
+        all: bool = False,
+    ) -> list[Container]:
+        """List containers, filtered by the engine, as in `EngineClient.containers`."""
+        params = _containers_params(labels, name, id, all)
+        try:
+            response = await self.client.get("/containers/json", params=params)
+        except httpx.HTTPError as e:
+            raise EngineAPIError(f"Engine API unreachable: {e}") from e
+        return _parse_containers(response)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+def connect(backend: str = "docker") -> EngineClient | None:
+    """
+    Connect to the Engine API of a backend, if its socket is there and answers.
+
+    Args:
+        backend: `docker` or `podman`.
+    """
+    if not (path := find_socket(backend)):
+        return None
+    client = EngineClient(path)
+    if client.ping():
+        return client
+    client.close()
+    return None
+
+
+async def connect_async(backend: str = "docker") -> AsyncEngineClient | None:
+    """
+    Connect to the Engine API of a backend with an asyncio client, as in `connect`.
+
+    Args:
+        backend: `docker` or `podman`.
+    """
+    if not (path := find_socket(backend)):
+        return None
+    client = AsyncEngineClient(path)
+    if await client.ping():
+        return client
+    await client.aclose()
+    return None
@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator
+
+from ._seed import SYSTEM_FIELDS, _version, run_bounded
+from .automations.automations import LabContext, LabRequestError
+
+# Items fetched per list request
+PAGE_SIZE = 100
+
+# First Appwrite version taking queries as JSON rather than `method(values)` strings
+JSON_QUERIES_VERSION = (1, 5)
+
+
+@dataclass
+class ExportReport:
+    documents: dict[str, int] = field(default_factory=dict)
+    users: int = 0
+    files: int = 0
+    errors: list[str] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+def relationship_ids(document: dict, keys: list[str]) -> dict:
+    """
+    Replace the related documents a document embeds with their IDs.
+
+    Args:
+        document: The document as returned by the server.
+        keys: The keys of the relationship attributes of its collection.
+    """
+    for key in keys:
+        related = document.get(key)
+        if isinstance(related, list):
+            document[key] = [
+                item["$id"] if isinstance(item, dict) else item for item in related
+            ]
+        elif isinstance(related, dict):
+            document[key] = related["$id"]
+    return document
+
+
+class Exporter:
+    def __init__(self, context: LabContext):
+        """
+        Write the data of a project of a lab to a directory, as a seed source.
+
+        Every collection is written to
+        `collections/<databaseId>/<collectionId>.ndjson`, users to
+        `users.ndjson` and files to `buckets/<bucketId>/<fileId>/<name>`, the
+        layout `Seeder` reads back. Lists are paged through and written as
+        they arrive, so memory use does not grow with the data.
+
+        Args:
+            context: The pooled client of the project, which bounds the
+                requests in flight and retries them.
+        """
+        self.context = context
+        self.json_queries = _version(context.lab.version) >= JSON_QUERIES_VERSION
+        self._pending = context.max_parallel * 2
+        self._workers = ThreadPoolExecutor(max_workers=self._pending)
+        self._lock = threading.Lock()
+
+    def export(self, dest: Path) -> ExportReport:
+        """
+        Export the users, every collection and every bucket of the project.
+
+        Args:
+            dest: The directory to write to, created if missing.
+
+        Returns:
+            The records written, the errors, and the seconds each source took.
+        """
+        report = ExportReport()
+        dest.mkdir(parents=True, exist_ok=True)
+        tasks: list[tuple[str, Callable, tuple]] = [
+            ("users", self._export_users, (dest / "users.ndjson",))
+        ]
+        for database in self._pages("/databases", "databases"):
+            for collection in self._pages(
+                f"/databases/{database['$id']}/collections", "collections"
+            ):
+                label = f"{database['$id']}/{collection['$id']}"
+                report.documents[label] = 0
+                tasks.append(
+                    (
+                        f"collection:{label}",
+                        self._export_collection,
+                        (collection, dest / "collections" / f"{label}.ndjson"),
+                    )
+                )
+        for bucket in self._pages("/storage/buckets", "buckets"):
+            tasks.append(
+                (
+                    f"bucket:{bucket['$id']}",
+                    self._export_bucket,
+                    (bucket["$id"], dest / "buckets" / bucket["$id"]),
+                )
+            )
+
+        with ThreadPoolExecutor(max_workers=len(tasks)) as sources:
+            futures = [
+                sources.submit(self._timed, report, label, fn, *args, report)
+                for label, fn, args in tasks
+            ]
+            for future in futures:
+                future.result()
+        return report
+
+    def _export_users(self, path: Path, report: ExportReport):
+        with open(path, "w") as f:
+            for user in self._pages("/users", "users"):
+                f.write(json.dumps(user) + "\n")
+                with self._lock:
+                    report.users += 1
+
+    def _export_collection(self, collection: dict, path: Path, report: ExportReport):
+        label = f"{collection['databaseId']}/{collection['$id']}"
+        relationships = [
+            attribute["key"]
+            for attribute in collection.get("attributes", [])
+            if attribute.get("type") == "relationship"
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            for document in self._pages(
+                f"/databases/{collection['databaseId']}"
+                f"/collections/{collection['$id']}/documents",
+                "documents",
+            ):
+                document = {k: v for k, v in document.items() if k not in SYSTEM_FIELDS}
+                f.write(json.dumps(relationship_ids(document, relationships)) + "\n")
+                with self._lock:
+                    report.documents[label] += 1
+
+    def _export_bucket(self, bucket_id: str, path: Path, report: ExportReport):
+        path.mkdir(parents=True, exist_ok=True)
+        run_bounded(
+            self._workers,
+            lambda file: self._download_file(bucket_id, file, path, report),
+            self._pages(f"/storage/buckets/{bucket_id}/files", "files"),
+            self._pending,
+        )
+
+    def _download_file(
+        self, bucket_id: str, file: dict, path: Path, report: ExportReport
+    ):
+        # The file ID names the directory, so seeding keeps it
+        dest = path / file["$id"] / Path(file["name"]).name
+        dest.parent.mkdir(exist_ok=True)
+        try:
+            self.context.download(
+                f"/storage/buckets/{bucket_id}/files/{file['$id']}/download", dest
+            )
+        except LabRequestError as e:
+            with self._lock:
+                report.errors.append(f"file {bucket_id}/{file['$id']}: {e.args[0]}")
+            return
+        with self._lock:
+            report.files += 1
+
+    def _pages(self, path: str, key: str) -> Iterator[dict]:
+        """Page through a list endpoint with a cursor, one page in memory at a time."""
+        cursor = None
+        while True:
+            queries = [self._query("limit", PAGE_SIZE)]
+            if cursor:
+                queries.append(self._query("cursorAfter", cursor))
+            page = self.context.request("GET", path, params={"queries[]": queries})
+            items = page[key]
+            yield from items
+            if len(items) < PAGE_SIZE:
+                return
+            cursor = items[-1]["$id"]
+
+    def _query(self, method: str, value: str | int) -> str:
+        if self.json_queries:
+            return json.dumps({"method": method, "values": [value]})
+        return f"{method}({json.dumps(value)})"
+
+    def _timed(self, report: ExportReport, label: str, fn: Callable, *args):
+        start = time.monotonic()
+        try:
+            fn(*args)
+        except (LabRequestError, OSError) as e:
+            with self._lock:
+                report.errors.append(f"{label}: {e}")
+        finally:
+            elapsed = round(time.monotonic() - start, 3)
+            with self._lock:
+                report.timings[label] = elapsed
+
+    def close(self):
+        self._workers.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,137 @@
+import threading
+import time
+
+from ._engine import PROJECT_LABEL, Container, EngineAPIError, EngineClient
+
+
+class ContainerInventory:
+    def __init__(self, engine: EngineClient, max_delay: float = 30):
+        """
+        The running containers of compose projects, kept current by engine events.
+
+        Containers are listed once, then each container event (start, die,
+        health status, ...) re-reads only the container it is about. When the
+        event stream breaks, the inventory is marked stale until it has
+        reconnected and listed the containers again.
+
+        Args:
+            engine: The Engine API client to list and follow containers with.
+            max_delay: The upper bound of the delay between reconnects in seconds.
+        """
+        self.engine = engine
+        self.max_delay = max_delay
+        self._containers: dict[str, Container] = {}
+        self._lock = threading.Lock()
+        self._live = threading.Event()
+        self._attempted = threading.Event()
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def live(self) -> bool:
+        """Whether the inventory is following events, so reads are current."""
+        return self._live.is_set()
+
+    def start(self, timeout: float = 10) -> bool:
+        """
+        Start following events in a background thread.
+
+        Args:
+            timeout: The seconds to wait for the first listing.
+
+        Returns:
+            Whether the inventory is live.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._follow, name="appwrite-lab-inventory", daemon=True
+            )
+            self._thread.start()
+        self._attempted.wait(timeout)
+        return self.live
+
+    def containers(
+        self,
+        project: str | None = None,
+        service: str | None = None,
+        name: str | None = None,
+    ) -> list[Container]:
+        """
+        The running containers, filtered like `ServiceOrchestrator.containers`.
+
+        Args:
+            project: Only containers of this compose project.
+            service: Only containers of this compose service.
+            name: Only containers whose name contains this.
+        """
+        with self._lock:
+            containers = list(self._containers.values())
+        return [
+            container
+            for container in containers
+            if (project is None or container.project == project)
+            and (service is None or container.service == service)
+            and (name is None or name in container.name)
+        ]
+
+    def sync(self, project: str):
+        """
+        List the containers of a project again, without waiting for their events.
+
+        Called after changing a project, so reads right after see the change.
+
+        Args:
+            project: The compose project.
+
+        Raises:
+            EngineAPIError: If the engine did not answer.
+        """
+        containers = self.engine.containers(labels={PROJECT_LABEL: project})
+        with self._lock:
+            for key in [
+                key
+                for key, container in self._containers.items()
+                if container.project == project
+            ]:
+                del self._containers[key]
+            self._containers.update((c.id, c) for c in containers)
+
+    def close(self):
+        """Stop following events, at the latest when the next event arrives."""
+        self._closed.set()
+        self._live.clear()
+
+    def _follow(self):
+        delay = 0.5
+        while not self._closed.is_set():
+            # Events since the listing are replayed, so none fall in between
+            since = time.time()
+            try:
+                containers = self.engine.containers(labels={PROJECT_LABEL: None})
+                with self._lock:
+                    self._containers = {c.id: c for c in containers}
+                self._live.set()
+                self._attempted.set()
+                delay = 0.5
+                for event in self.engine.events({PROJECT_LABEL: None}, since=since):
+                    if self._closed.is_set():
+                        return
+                    self._apply(event)
+            except EngineAPIError:
+                pass
+            self._live.clear()
+            self._attempted.set()
+            if self._closed.wait(delay):
+                return
+            delay = min(delay * 2, self.max_delay)
+
+    def _apply(self, event: dict):
+        container_id = event.get("id") or event.get("Actor", {}).get("ID")
+        if not container_id:
+            return
+        found = []
+        if event.get("Action") != "destroy":
+            found = self.engine.containers(id=container_id)
+        with self._lock:
+            self._containers.pop(container_id, None)
+            self._containers.update((c.id, c) for c in found)
@@ -1,23 +1,74 @@
+import contextlib
+import functools
 import os
 import re
 import shutil
 import subprocess
 import json
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
+
+import httpx
 
 from appwrite_lab.automations.models import (
     BaseVarModel,
     AppwriteAPIKeyCreation,
+    AppwriteRunPlan,
     AppwriteUserCreation,
 )
+from appwrite_lab.automations.console import (
+    ConsoleClient,
+    ConsoleAPIError,
+    CONSOLE_AUTOMATIONS,
+    run_console_automation,
+)
 from ._state import State
 from dataclasses import dataclass
-from .models import Lab, Automation, Project
-from dotenv import dotenv_values
+from .models import Lab, Automation, AutomationEngine, AutomationStep, Project
 from appwrite_lab.utils import console
-from .utils import is_cli
-from .config import APPWRITE_PLAYWRIGHT_IMAGE
+from .utils import (
+    is_cli,
+    port_in_use,
+    file_lock,
+    get_free_ports,
+    get_snapshot_dir,
+    get_session_dir,
+    get_sessions_path,
+    get_state_path,
+)
+from .config import (
+    APPWRITE_PLAYWRIGHT_IMAGE,
+    AUTOMATION_ENGINE,
+    AUTOMATION_WORKER,
+    CONTAINER_CACHE,
+    ENGINE_API,
+    READINESS_TIMEOUT,
+    SESSIONS_MOUNT,
+    SNAPSHOT_IMAGE,
+)
+from ._discovery import Toolchain, discover
+from ._engine import (
+    Container,
+    EngineAPIError,
+    EngineClient,
+    connect,
+    label_filters,
+    parse_ps_output,
+)
+from ._inventory import ContainerInventory
+from ._trace import annotate, emit, span, traced
+from ._worker import AutomationWorker, AutomationWorkerError
+from ._readiness import (
+    ReadinessReport,
+    wait_until_ready,
+    http_probe,
+    container_probe,
+    is_pod_healthy,
+)
 from dataclasses import asdict
 
 
@@ -41,13 +92,25 @@ class Response:
 class OrchestratorError(Exception): ...
 
 
+GOLDEN_TAG = "golden"
+
+# Host ports published by a lab, mapped to the template variable that sets them
+LAB_PORT_VARS = {
+    "http": "_APP_PORT",
+    "https": "_APP_HTTPS_PORT",
+    "sms_shim": "_APP_SMS_SHIM_PORT",
+    "mailpit": "_APP_MAILPIT_PORT",
+    "smtp": "_APP_MAILPIT_SMTP_PORT",
+}
+
+
 class ServiceOrchestrator:
     def __init__(self, state: State, backend: str = "auto"):
-        self.backend = backend if backend != "auto" else detect_backend()
+        self._backend = backend
         self.state = state
-        self.default_env_vars = str(
-            Path(__file__).parent / "templates" / "environment" / "dotenv"
-        )
+        self._worker: AutomationWorker | None = None
+        self._inventory: ContainerInventory | None = None
+        self._inventory_lock = threading.Lock()
 
     def get_labs(self):
         """
@@ -80,7 +143,12 @@ class ServiceOrchestrator:
                 "Admin Email",
                 "Admin Password",
                 "Project ID",
+                "Status",
             ]
+            pods_by_lab: dict[str, list[dict]] = {}
+            if labs:
+                for pod in self.cached_containers():
+                    pods_by_lab.setdefault(pod.project, []).append(pod.to_ps())
             data = []
             for val in labs.values():
                 project = Project(**val.get("projects", {}).get("default"))
@@ -92,45 +160,129 @@ class ServiceOrchestrator:
                         val["admin_email"],
                         val["admin_password"],
                         project.project_id,
+                        get_lab_status(pods_by_lab.get(val["name"], [])),
                     ]
                 )
             return headers, data
         return labs
 
+    def containers(
+        self,
+        project: str | None = None,
+        service: str | None = None,
+        name: str | None = None,
+        compose_only: bool = True,
+    ) -> list[Container]:
+        """
+        List running compose containers, through the Engine API when it is available.
+
+        Falls back to `ps --format json` when the engine socket is missing or
+        stops answering.
+
+        Args:
+            project: Only containers of this compose project.
+            service: Only containers of this compose service.
+            name: Only containers whose name contains this.
+            compose_only: Whether to leave out containers that no compose
+                project started, when neither `project` nor `service` is given.
+        """
+        labels = {}
+        if compose_only or project is not None or service is not None:
+            labels = label_filters(project, service)
+        if self.engine is not None:
+            try:
+                return self.engine.containers(labels=labels, name=name)
+            except EngineAPIError:
+                pass
+        cmd = [self.util, "ps"]
+        for key, value in labels.items():
+            label = key if value is None else f"{key}={value}"
+            cmd.extend(["--filter", f"label={label}"])
+        if name:
+            cmd.extend(["--filter", f"name={name}"])
+        result = run_cmd([*cmd, "--format", "json"])
+        return parse_ps_output(result.stdout)
+
+    def cached_containers(
+        self, project: str | None = None, name: str | None = None
+    ) -> list[Container]:
+        """
+        List running compose containers from the inventory, while it is live.
+
+        Falls back to `containers` when the inventory is off or stale.
+
+        Args:
+            project: Only containers of this compose project.
+            name: Only containers whose name contains this.
+        """
+        inventory = self.inventory
+        if inventory is not None and inventory.live:
+            return inventory.containers(project=project, name=name)
+        return self.containers(project=project, name=name)
+
+    @property
+    def inventory(self) -> ContainerInventory | None:
+        """
+        The container inventory, started on first use.
+
+        `None` when the Engine API or the cache is off, or the inventory
+        could not be started.
+        """
+        if not CONTAINER_CACHE or self.engine is None:
+            return None
+        with self._inventory_lock:
+            if self._inventory is None:
+                inventory = ContainerInventory(self.engine)
+                if not inventory.start():
+                    inventory.close()
+                    return None
+                self._inventory = inventory
+            return self._inventory
+
+    def _sync_inventory(self, project: str):
+        """
+        Bring the inventory up to date with a project the orchestrator just changed.
+
+        An inventory that cannot be synced is dropped, to be started again on
+        the next read.
+
+        Args:
+            project: The compose project.
+        """
+        with self._inventory_lock:
+            inventory = self._inventory
+        if inventory is None:
+            return
+        try:
+            inventory.sync(project)
+        except EngineAPIError:
+            inventory.close()
+            with self._inventory_lock:
+                if self._inventory is inventory:
+                    self._inventory = None
+
     def get_running_pods(self):
         """
         Get the names of all running pods.
         """
-        cmd = [self.util, "ps", "--format", "json"]
-        result = run_cmd(cmd)
-        pods = {
-            pod["Names"]: pod
-            for line in result.stdout.strip().splitlines()
-            if line.strip()
-            for pod in [json.loads(line)]
-        }
-        return pods
+        return {pod.name: pod.to_ps() for pod in self.containers(compose_only=False)}
 
     def get_running_pods_by_project(self, name: str):
         """
         Get the names of all running pods by project name.
         """
-        cmd = [
-            self.util,
-            "ps",
-            "--filter",
-            f"label=com.docker.compose.project={name}",
-            "--format",
-            "json",
-        ]
-        result = run_cmd(cmd)
-        pods = {
-            pod["Names"]: pod
-            for line in result.stdout.strip().splitlines()
-            if line.strip()
-            for pod in [json.loads(line)]
-        }
-        return pods
+        return {pod.name: pod.to_ps() for pod in self.cached_containers(project=name)}
+
+    def get_pod_by_service(self, project_name: str, service: str) -> dict | None:
+        """
+        Get the pod of a compose service within a project.
+
+        Args:
+            project_name: The name of the project the service belongs to.
+            service: The compose service name (e.g. `traefik`).
+        """
+        pods = self.containers(project=project_name, service=service)
+        return pods[0].to_ps() if pods else None
 
     def _deploy_compose_service(
         self,
@@ -150,6 +302,27 @@ class ServiceOrchestrator:
             env_file: The path to the environment file to use for the service.
             extra_args: Extra arguments to pass to the compose command.
         """
+        cmd = self._compose_up_cmd(project, template_paths, env_file, extra_args)
+        cmd_res = self._run_cmd_safely(cmd, envs=env_vars)
+        self._sync_inventory(project)
+        return cmd_res
+
+    def _compose_up_cmd(
+        self,
+        project: str,
+        template_paths: list[Path] | Path,
+        env_file: Path | None = None,
+        extra_args: list[str] = [],
+    ) -> list[str]:
+        """
+        Build the command that brings up the services of compose templates.
+
+        Args:
+            project: The name of the project to deploy the services to.
+            template_paths: The compose templates of the services.
+            env_file: The path to the environment file to use for the services.
+            extra_args: Extra arguments to pass to the compose command.
+        """
         if isinstance(template_paths, Path):
             template_paths = [template_paths]
 
@@ -157,7 +330,7 @@ class ServiceOrchestrator:
         for path in template_paths:
             file_overlays.extend(["-f", str(path)])
 
-        cmd = [
+        return [
             *self.compose,
             *file_overlays,
             *(["--env-file", str(env_file)] if env_file else []),
@@ -167,113 +340,219 @@ class ServiceOrchestrator:
             "up",
             "-d",
         ]
-        return self._run_cmd_safely(cmd, envs=env_vars)
 
+    def _compose_down_cmd(self, name: str) -> list[str]:
+        """
+        Build the command that removes the services and volumes of a project.
+
+        Args:
+            name: The name of the project.
+        """
+        return [
+            *self.compose,
+            "-p",
+            name,
+            "down",
+            "-v",
+            "--timeout",
+            "0",
+            "--remove-orphans",
+        ]
+
+    # The steps of deploying and tearing down a lab, shared with the
+    # asynchronous orchestrator, which only awaits the IO in between
+
+    def _lab_templates(
+        self, name: str, version: str, pods: list
+    ) -> "LabTemplates | Response":
+        """
+        The templates of a new lab, or a response why it cannot be deployed.
+
+        Args:
+            name: The name of the lab.
+            version: The version of the lab.
+            pods: The running pods of the lab's project.
+        """
+        if pods:
+            return Response(
+                error=True, message=f"Lab '{name}' already deployed.", data=None
+            )
+        templates = get_lab_templates(version)
+        if not templates.appwrite.exists():
+            return Response(
+                error=True, message=f"Template {version} not found.", data=None
+            )
+        return templates
+
+    def _lab_compose_args(
+        self, name: str, templates: "LabTemplates", port: int | None = None
+    ) -> tuple[dict, dict, dict[str, dict]] | Response:
+        """
+        Assign the host ports of a new lab and the compose arguments of its
+        services. Call it within `port_allocation`.
+
+        Args:
+            name: The name of the lab.
+            templates: The templates of the lab.
+            port: The port requested for the Appwrite service, if any.
+
+        Returns:
+            The ports and environment variables of the lab, and the
+            `_deploy_compose_service` arguments of `appwrite` and `mailpit`,
+            or a response when the port is taken.
+        """
+        if port and port_in_use(port):
+            return Response(
+                error=True, message=f"Port {port} is already in use.", data=None
+            )
+        # Namespace the lab and assign its host ports
+        ports = allocate_lab_ports(port)
+        env_vars = get_lab_env_vars(name, ports)
+        return (
+            ports,
+            env_vars,
+            {
+                "appwrite": dict(
+                    project=name,
+                    template_paths=[templates.appwrite, templates.twilio_shim],
+                    env_file=templates.env_file,
+                    env_vars=env_vars,
+                ),
+                "mailpit": dict(
+                    project=name, template_paths=templates.mailpit, env_vars=env_vars
+                ),
+            },
+        )
+
+    @staticmethod
+    def _deploy_failed(name: str, reason: str, data=None) -> Response:
+        """The response of a lab that was deployed but is being spun down."""
+        return Response(
+            error=True,
+            message=f"Lab '{name}' deployed, but {reason}. Spinning down lab.",
+            data=data,
+        )
+
+    @staticmethod
+    def _api_key_model(lab: Lab) -> AppwriteAPIKeyCreation:
+        """The default API key every bootstrapped lab gets."""
+        return AppwriteAPIKeyCreation(
+            key_name="default_key",
+            project_name=lab.projects["default"].project_name,
+            key_expiry="Never",
+        )
+
+    def _lab_deployed(self, lab: Lab, api_key: str) -> Response:
+        """Record a bootstrapped lab with its API key."""
+        lab.projects["default"].api_key = api_key
+        self.state.set_item("labs", lab.name, asdict(lab))
+        return Response(
+            error=False,
+            message=f"Lab '{lab.name}' deployed.",
+            data=lab,
+        )
+
+    @staticmethod
+    def _nothing_to_stop(name: str) -> Response:
+        return Response(
+            error=True,
+            message=f"Nothing to stop by name of '{name}'.",
+            data=None,
+        )
+
+    def _lab_torn_down(self, name: str, cmd_res) -> Response:
+        """
+        Forget a lab once its compose down ran, or report why it failed.
+
+        Args:
+            name: The name of the lab.
+            cmd_res: The result of compose down.
+        """
+        if type(cmd_res) is Response and cmd_res.error:
+            cmd_res.message = f"Failed to teardown lab {name}. \
+                        'Please run 'docker-compose -p {name} down -v' manually."
+            return cmd_res
+        self.state.pop_item("labs", name)
+        shutil.rmtree(get_sessions_path() / name, ignore_errors=True)
+
+        return Response(
+            message=f"Lab '{name}' stopped.",
+            data=None,
+        )
+
+    @traced
     def deploy_appwrite_lab(
         self,
         name: str,
         version: str,
-        port: int,
+        port: int | None = None,
         auth: AppwriteUserCreation | None = None,
         **kwargs: dict[str, str],
     ):
         """
         Deploy an Appwrite lab.
 
+        Every lab is deployed in its own namespace (containers, networks and
+        host ports), so several labs can run side by side on the same host.
+
         Args:
             name: The name to give to the deployment/project.
             version: The version of the service to deploy.
             port: The port to use for the Appwrite service. Must not be in use by another service.
+                Unset for an auto-assigned port.
             auth: The authentication credentials.
 
+        Keyword Args:
+            just_deploy: Deploy the lab without creating an API key or project.
+            from_golden: Start from the golden image of the version instead of
+                bootstrapping through Playwright.
+            ready_timeout: Seconds the lab has to pass its readiness checks.
         """
-        # sync
-        appwrite_config = asdict(auth) if auth else {}
+        annotate(lab=name, version=version)
+        templates = self._lab_templates(name, version, self.get_pods_by_project(name))
+        if type(templates) is Response:
+            return templates
 
-        pods_by_project = self.get_pods_by_project(name)
-        if len(pods_by_project) > 0:
-            return Response(
-                error=True, message=f"Lab '{name}' already deployed.", data=None
-            )
-        converted_version = version.replace(".", "_")
+        # Until compose publishes them, nothing else may take the lab's ports
+        with port_allocation():
+            compose_args = self._lab_compose_args(name, templates, port)
+            if type(compose_args) is Response:
+                return compose_args
+            ports, env_vars, services = compose_args
 
-        # Gather paths
-        template_path = (
-            Path(__file__).parent
-            / "templates"
-            / f"docker_compose_{converted_version}.yml"
-        )
+            # What actually deploys the initial appwrite service
+            with span("compose_up", services="appwrite"):
+                cmd_res = self._deploy_compose_service(**services["appwrite"])
+            # if CLI, will throw error in actual Response object
+            if type(cmd_res) is Response and cmd_res.error:
+                return cmd_res
 
-        twilio_shim_path = (
-            Path(__file__).parent
-            / "templates"
-            / "extras"
-            / "twilio-shim"
-            / "docker_compose.yml"
-        )
+            # Deploy mail server (mailpit)
+            with span("compose_up", services="mailpit"):
+                self._deploy_compose_service(**services["mailpit"])
 
-        env_file = Path(__file__).parent / "templates" / "environment" / "dotenv"
-        if not template_path.exists():
-            return Response(
-                error=True, message=f"Template {version} not found.", data=None
-            )
-
-        # Override default env vars for port
-        env_vars = get_env_vars(self.default_env_vars)
-        if port != 80:
-            env_vars["_APP_PORT"] = str(port)
+        # Get the port traefik actually published for this lab
+        with span("port_discovery"):
+            traefik_pod = self.get_pod_by_service(name, "traefik")
+        if not traefik_pod:
+            self.teardown_service(name)
+            return self._deploy_failed(name, "traefik is not running")
+        ports["http"] = extract_port_from_pod_info(traefik_pod)
+        lab = new_lab(name, version, auth, ports, env_vars)
 
-        # What actually deploys the initial appwrite service
-        cmd_res = self._deploy_compose_service(
-            project=name,
-            template_paths=[template_path, twilio_shim_path],
-            env_file=env_file,
-        )
+        if kwargs.get("from_golden", False):
+            return self._deploy_from_golden(lab)
 
-        # Deploy mail server (mailpit)
-        mailpit_template_path = (
-            Path(__file__).parent
-            / "templates"
-            / "extras"
-            / "mailpit"
-            / "docker_compose.yml"
+        # Wait for the lab to be ready before handing it out or automating it
+        report = self.wait_for_lab(
+            name, lab.url, timeout=kwargs.get("ready_timeout", READINESS_TIMEOUT)
         )
-        self._deploy_compose_service(project=name, template_paths=mailpit_template_path)
-        # if CLI, will throw error in actual Response object
-        if type(cmd_res) is Response and cmd_res.error:
-            return cmd_res
-
-        # Get appwrite pods
-        project_pods = self.get_running_pods_by_project(name)
-        if traefik_pod := project_pods.get("appwrite-traefik", None):
-            ports = traefik_pod["Ports"].split(",")
-            port = extract_port_from_pod_info(traefik_pod)
-            assert len(ports) > 1, OrchestratorError(
-                "Failed to extract port from pod info."
+        if not report.is_ready:
+            self.teardown_service(name)
+            return self._deploy_failed(
+                name, f"{', '.join(report.pending)} did not become ready", report
             )
-            port = extract_port_from_pod_info(traefik_pod)
-            url = f"http://localhost:{port}"
-        else:
-            url = ""
-        proj_id = appwrite_config.pop("project_id", None)
-        proj_name = appwrite_config.pop("project_name", None)
-        _kwargs = {
-            **appwrite_config,
-            "projects": {"default": Project(proj_id, proj_name, None)},
-        }
-        lab = Lab(
-            name=name,
-            version=version,
-            url=url,
-            **_kwargs,
-            sms_shim_url="https://localhost:4443",
-            mailpit_url="http://localhost:8025",
-        )
-
-        lab.generate_missing_config()
-        # ensure project_id and project_name are set
-        proj_id = proj_id or lab.projects.get("default").project_id
-        proj_name = proj_name or lab.projects.get("default").project_name
+        lab.readiness = report.ready
         if kwargs.get("just_deploy", False):
             return Response(
                 error=False,
@@ -284,26 +563,140 @@ class ServiceOrchestrator:
         api_key_res = self.deploy_playwright_automation(
             lab=lab,
             automation=Automation.CREATE_USER_AND_API_KEY,
-            model=AppwriteAPIKeyCreation(
-                key_name="default_key", project_name=proj_name, key_expiry="Never"
-            ),
+            model=self._api_key_model(lab),
         )
         if type(api_key_res) is Response and api_key_res.error:
-            api_key_res.message = f"Lab '{name}' deployed, but failed to create API key. Spinning down lab."
+            api_key_res.message = self._deploy_failed(
+                name, "failed to create API key"
+            ).message
             self.teardown_service(name)
             return api_key_res
-        lab.projects["default"].api_key = api_key_res.data
+        return self._lab_deployed(lab, api_key_res.data)
 
-        stored_labs: dict = self.state.get("labs", {}).copy()
-        stored_labs[name] = asdict(lab)
-        self.state.set("labs", stored_labs)
+    def _deploy_from_golden(self, lab: Lab):
+        """
+        Finish deploying a lab by restoring the golden image of its version.
+
+        The golden admin user, its team and project are removed, and the lab's
+        admin user, team and default project are created afresh, so no two
+        labs share their IDs. All through the console REST API instead of a
+        browser.
+
+        Args:
+            lab: The freshly deployed, not yet bootstrapped lab.
+        """
+        name = lab.name
+        project = lab.projects["default"]
+        self.state.set_item("labs", name, asdict(lab))
+        restore_res = self.restore_lab(
+            name, GOLDEN_TAG, source=get_golden_name(lab.version)
+        )
+        if restore_res.error:
+            self.teardown_service(name)
+            return Response(
+                error=True,
+                message=f"Lab '{name}' deployed, but no golden image for version "
+                f"{lab.version} could be restored. Bake one with "
+                f"'awlab new golden --version {lab.version}'. Spinning down lab.",
+                data=restore_res.message,
+            )
+        golden: Lab = restore_res.data
+        golden_project = golden.projects["default"]
+
+        try:
+            with ConsoleClient(lab.url) as console:
+                console.login(golden.admin_email, golden.admin_password)
+                team_id = console.get_project(golden_project.project_id)["teamId"]
+                console.delete_project(golden_project.project_id)
+                console.delete_team(team_id)
+                console.block_account()
+            with ConsoleClient(lab.url) as console:
+                console.create_account(lab.admin_email, lab.admin_password)
+                console.login(lab.admin_email, lab.admin_password)
+                console.create_project(
+                    project.project_id, project.project_name, console.create_team()
+                )
+                project.api_key = console.create_api_key(
+                    project.project_id, "default_key"
+                )
+        except ConsoleAPIError as e:
+            self.teardown_service(name)
+            return Response(
+                error=True,
+                message=f"Lab '{name}' deployed, but failed to issue credentials "
+                "from its golden image. Spinning down lab.",
+                data=str(e),
+            )
+        lab.projects = {"default": project}
+        lab.readiness = golden.readiness
+        self.state.set_item("labs", name, asdict(lab))
 
         return Response(
             error=False,
-            message=f"Lab '{name}' deployed.",
+            message=f"Lab '{name}' deployed from golden image.",
             data=lab,
         )
 
+    def bake_golden_lab(self, version: str):
+        """
+        Bake the golden image of an Appwrite version.
+
+        A lab is deployed and bootstrapped once, and its data is snapshotted
+        so later labs of the same version can start from it.
+
+        Args:
+            version: The Appwrite version to bake.
+        """
+        name = get_golden_name(version)
+        if self.get_pods_by_project(name):
+            self.teardown_service(name)
+        deploy_res = self.deploy_appwrite_lab(name, version)
+        if deploy_res.error:
+            return deploy_res
+        snapshot_res = self.snapshot_lab(name, GOLDEN_TAG)
+        self.teardown_service(name)
+        if snapshot_res.error:
+            return snapshot_res
+        return Response(
+            message=f"Golden image for version {version} baked.",
+            data=snapshot_res.data,
+        )
+
+    @traced
+    def wait_for_lab(
+        self, name: str, url: str, timeout: float = READINESS_TIMEOUT
+    ) -> ReadinessReport:
+        """
+        Wait until a lab's components are ready.
+
+        MariaDB and Redis are checked through their container healthchecks,
+        the Appwrite API and console through HTTP. All checks run concurrently.
+
+        Args:
+            name: The name of the lab.
+            url: The URL of the lab.
+            timeout: The overall deadline in seconds.
+        """
+
+        def service_pod(service: str):
+            return lambda: self.get_pod_by_service(name, service)
+
+        start_ns = time.time_ns()
+        with httpx.Client(timeout=5) as client:
+            probes = {
+                "mariadb": container_probe(service_pod("mariadb")),
+                "redis": container_probe(service_pod("redis")),
+                "api": http_probe(client, f"{url}/v1/health/version"),
+                "console": http_probe(client, f"{url}/console/"),
+            }
+            report = wait_until_ready(probes, timeout=timeout)
+        # Each component as a span from the start of the wait until it was ready
+        for component, seconds in report.ready.items():
+            emit(f"ready:{component}", start_ns, int(seconds * 1e9))
+        annotate(lab=name, pending=report.pending)
+        return report
+
+    @traced
     def deploy_playwright_automation(
         self,
         lab: Lab,
@@ -311,8 +704,10 @@ class ServiceOrchestrator:
         project: Project | None = None,
         model: BaseVarModel = None,
         args: list[str] = [],
+        files: dict[str, Path | str] = {},
         *,
         print_data: bool = False,
+        engine: AutomationEngine | str = AUTOMATION_ENGINE,
     ) -> str | Response:
         """
         Deploy playwright automations on a lab (very few automations supported).
@@ -322,16 +717,48 @@ class ServiceOrchestrator:
         Open to expandability if needed - which is why this function is structured
         this way.
 
+        Automations that have a console REST equivalent run over HTTP from the
+        host process unless the Playwright engine is selected. With the `auto`
+        engine, the Playwright container is the fallback when that fails
+        before changing the lab.
+
+        Playwright automations run on the long-lived automation worker, and
+        only fall back to a one-off container when the worker is disabled or
+        cannot be reached.
+
         Args:
             lab: The lab to deploy the automations for.
             automation: The automation to deploy.
             model: The model args to use for the automation.
-            args: Extra arguments to the container.
+            args: Extra arguments to the container. Forces a one-off container.
+            files: Files to place in the automation's working directory, by name.
             project: The project to use for the automation, if not provided, the default project is used.
 
         Keyword Args:
             print_data: Whether to print the data of the response instead of the message.
+            engine: The automation engine to use (`auto`, `http` or `playwright`).
         """
+        project = project or lab.projects["default"]
+        project = Project(**project) if isinstance(project, dict) else project
+        engine = AutomationEngine(engine)
+        annotate(lab=lab.name, automation=automation.value, engine=engine.value)
+        if engine != AutomationEngine.PLAYWRIGHT and automation in CONSOLE_AUTOMATIONS:
+            try:
+                with span("console_http"):
+                    _data = run_console_automation(lab, automation, project, model)
+                return Response(
+                    error=False,
+                    message=f"Automation {automation.value} completed over HTTP.",
+                    data=_data,
+                    _print_data=print_data,
+                )
+            except ConsoleAPIError as e:
+                if engine == AutomationEngine.HTTP or not e.fallback_safe:
+                    return Response(
+                        error=True,
+                        message=f"Failed to run automation {automation.value}: {e}",
+                        data=str(e),
+                    )
         automation = automation.value
         function = (
             Path(__file__).parent / "automations" / "scripts" / f"{automation}.py"
@@ -344,10 +771,15 @@ class ServiceOrchestrator:
             )
         automation_dir = Path(__file__).parent / "automations"
         container_work_dir = "/work/automations"
-        project = project or lab.projects["default"]
-        project = Project(**project) if isinstance(project, dict) else project
         proj_id = project.project_id
         api_key = project.api_key
+        # Cached sessions of the admin user, mounted under SESSIONS_MOUNT
+        session_dir = get_session_dir(lab.name, lab.admin_email)
+        session_dir.mkdir(parents=True, exist_ok=True)
+        sessions_path = get_sessions_path()
+        container_session_dir = (
+            f"{SESSIONS_MOUNT}/{session_dir.relative_to(sessions_path).as_posix()}"
+        )
 
         env_vars = {
             "APPWRITE_URL": lab.url,
@@ -357,11 +789,42 @@ class ServiceOrchestrator:
             "APPWRITE_API_KEY": api_key,
             "APPWRITE_PROJECT_NAME": project.project_name,
             "HOME": container_work_dir,
+            "APPWRITE_SESSION_DIR": container_session_dir,
             **(model.as_dict_with_prefix("APPWRITE") if model else {}),
         }
+        # Prefer the warm worker; extra container args need a one-off container
+        if AUTOMATION_WORKER and not args:
+            try:
+                with span("worker_run"):
+                    result = self.worker.run(
+                        automation,
+                        {key: str(value) for key, value in env_vars.items()},
+                        files={
+                            name: Path(path).read_text() for name, path in files.items()
+                        },
+                    )
+            except AutomationWorkerError:
+                result = None
+            if result and not result["ok"]:
+                return Response(
+                    error=True,
+                    message=f"Failed to deploy playwright automation {automation}.",
+                    data=result["error"],
+                )
+            if result:
+                return Response(
+                    error=False,
+                    message=f"Playwright automation {automation} deployed successfully.",
+                    data=result["data"],
+                    _print_data=print_data,
+                )
+
         docker_env_args = []
         for key, value in env_vars.items():
             docker_env_args.extend(["-e", f"{key}={value}"])
+        file_mount_args = []
+        for name, path in files.items():
+            file_mount_args.extend(["-v", f"{path}:/work/{name}"])
         with tempfile.TemporaryDirectory() as temp_dir:
             shutil.copytree(automation_dir, temp_dir, dirs_exist_ok=True)
             function = Path(temp_dir) / "automations" / "scripts" / f"{automation}.py"
@@ -375,6 +838,9 @@ class ServiceOrchestrator:
                 f"{os.getuid()}:{os.getgid()}",
                 "-v",
                 f"{temp_dir}:{container_work_dir}:Z",
+                "-v",
+                f"{sessions_path}:{SESSIONS_MOUNT}:z",
+                *file_mount_args,
                 *args,
                 *docker_env_args,
                 APPWRITE_PLAYWRIGHT_IMAGE,
@@ -382,7 +848,8 @@ class ServiceOrchestrator:
                 "-m",
                 f"automations.scripts.{automation}",
             ]
-            cmd_res = self._run_cmd_safely(cmd)
+            with span("container_run"):
+                cmd_res = self._run_cmd_safely(cmd)
             if type(cmd_res) is Response and cmd_res.error:
                 cmd_res.message = (
                     f"Failed to deploy playwright automation {automation}."
@@ -401,6 +868,115 @@ class ServiceOrchestrator:
                 _print_data=print_data,
             )
 
+    @traced
+    def run_automation_plan(
+        self,
+        lab: Lab,
+        steps: list[AutomationStep],
+        project: Project | None = None,
+        files: dict[str, Path | str] = {},
+        *,
+        engine: AutomationEngine | str = AUTOMATION_ENGINE,
+    ) -> Response:
+        """
+        Run several automations in order as one plan, logging in once.
+
+        Steps with a console REST equivalent share one console session.
+        Consecutive Playwright steps run together as a single automation, in
+        one container (or worker job) with one browser context and one
+        Appwrite CLI login. A step whose REST run fails before changing the lab
+        falls back to Playwright with the `auto` engine, like
+        `deploy_playwright_automation`.
+
+        Args:
+            lab: The lab to run the plan on.
+            steps: The steps of the plan, in order.
+            project: The project to use for the automations, if not provided, the default project is used.
+            files: Files to place in the automations' working directory, by name.
+
+        Keyword Args:
+            engine: The automation engine to use (`auto`, `http` or `playwright`).
+
+        Returns:
+            A response whose data is the result of every step, in order. Optional
+            steps that failed have a None result.
+        """
+        project = project or lab.projects["default"]
+        project = Project(**project) if isinstance(project, dict) else project
+        engine = AutomationEngine(engine)
+        annotate(lab=lab.name, steps=[step.automation.value for step in steps])
+
+        def over_http(step: AutomationStep) -> bool:
+            return (
+                engine != AutomationEngine.PLAYWRIGHT
+                and step.automation in CONSOLE_AUTOMATIONS
+            )
+
+        results = []
+        with ConsoleClient.for_lab(lab) as client:
+            i = 0
+            while i < len(steps):
+                step = steps[i]
+                if over_http(step):
+                    try:
+                        with span("console_http", automation=step.automation.value):
+                            results.append(
+                                run_console_automation(
+                                    lab, step.automation, project, step.model, client
+                                )
+                            )
+                        i += 1
+                        continue
+                    except ConsoleAPIError as e:
+                        if engine == AutomationEngine.HTTP or not e.fallback_safe:
+                            if step.required:
+                                return Response(
+                                    error=True,
+                                    message=f"Failed to run automation {step.automation.value}: {e}",
+                                    data=str(e),
+                                )
+                            results.append(None)
+                            i += 1
+                            continue
+                # Batch this step with the Playwright steps that follow it
+                j = i + 1
+                while j < len(steps) and not over_http(steps[j]):
+                    j += 1
+                plan = [
+                    {
+                        "automation": step.automation.value,
+                        "env": {
+                            key: str(value)
+                            for key, value in (
+                                step.model.as_dict_with_prefix("APPWRITE")
+                                if step.model
+                                else {}
+                            ).items()
+                        },
+                        "required": step.required,
+                    }
+                    for step in steps[i:j]
+                ]
+                res = self.deploy_playwright_automation(
+                    lab=lab,
+                    automation=Automation.RUN_PLAN,
+                    project=project,
+                    model=AppwriteRunPlan(plan=json.dumps(plan)),
+                    files=files,
+                    engine=AutomationEngine.PLAYWRIGHT,
+                )
+                if res.error:
+                    res.message = "Failed to run automation plan."
+                    return res
+                results.extend(json.loads(res.data))
+                i = j
+        return Response(
+            error=False,
+            message=f"Automation plan of {len(steps)} steps completed.",
+            data=results,
+        )
+
+    @traced
     def teardown_service(self, name: str):
         """
         Wind down a service.
@@ -408,64 +984,209 @@ class ServiceOrchestrator:
         Args:
             name: The name of the service to teardown.
         """
-        pods_by_project = self.get_pods_by_project(name)
-        if not pods_by_project:
+        annotate(lab=name)
+        if not self.get_pods_by_project(name):
+            return self._nothing_to_stop(name)
+        with span("compose_down"):
+            cmd_res = self._run_cmd_safely(self._compose_down_cmd(name))
+        self._sync_inventory(name)
+        return self._lab_torn_down(name, cmd_res)
+
+    def snapshot_lab(self, name: str, tag: str):
+        """
+        Snapshot the named volumes of a lab into the local snapshot store.
+
+        The lab is stopped while its volumes are archived so the data is
+        consistent, and started again afterwards.
+
+        Args:
+            name: The name of the lab to snapshot.
+            tag: The tag to store the snapshot under. Existing snapshots are replaced.
+        """
+        if not (lab := self.get_lab(name)):
+            return Response(error=True, message=f"Lab '{name}' not found.", data=None)
+        volumes = self.get_project_volumes(name)
+        if not volumes:
             return Response(
-                error=True,
-                message=f"Nothing to stop by name of '{name}'.",
-                data=None,
+                error=True, message=f"Lab '{name}' has no volumes.", data=None
             )
-        cmd = [
-            *self.compose,
-            "-p",
-            name,
-            "down",
-            "-v",
-            "--timeout",
-            "0",
-            "--remove-orphans",
+        snapshot_dir = get_snapshot_dir(name, tag)
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+        snapshot_dir.mkdir(parents=True)
+
+        jobs = [
+            self._volume_archive_cmd(
+                volume, volume.removeprefix(f"{name}_"), snapshot_dir
+            )
+            for volume in volumes
         ]
-        cmd_res = self._run_cmd_safely(cmd)
+        cmd_res = self._with_lab_stopped(name, jobs)
         if type(cmd_res) is Response and cmd_res.error:
-            cmd_res.message = f"Failed to teardown lab {name}. \
-                        'Please run 'docker-compose -p {name} down -v' manually."
+            cmd_res.message = f"Failed to snapshot lab '{name}': {cmd_res.message}"
             return cmd_res
-        labs: dict = self.state.get("labs", {}).copy()
-        labs.pop(name, None)
-        self.state.set("labs", labs)
+        with open(snapshot_dir / "lab.json", "w") as f:
+            json.dump(asdict(lab), f)
+        report = self.wait_for_lab(name, lab.url)
+        if not report.is_ready:
+            return Response(
+                error=True,
+                message=f"Snapshot '{tag}' of lab '{name}' created, but "
+                f"{', '.join(report.pending)} did not become ready again.",
+                data=str(snapshot_dir),
+            )
 
         return Response(
-            message=f"Lab '{name}' stopped.",
-            data=None,
+            message=f"Snapshot '{tag}' of lab '{name}' created.",
+            data=str(snapshot_dir),
         )
 
-    def check_pod_status(self, pod_name: str):
+    def restore_lab(self, name: str, tag: str, source: str | None = None):
         """
-        Check the status of a pod.
+        Roll a lab's volumes back to a snapshot.
+
+        The credentials and projects of the snapshot replace the lab's own,
+        since they live in the restored database. The lab keeps its URL and ports.
+
+        Args:
+            name: The name of the lab to restore.
+            tag: The tag of the snapshot.
+            source: The lab the snapshot was taken from. Defaults to the lab itself.
         """
-        pods = self.get_running_pods()
-        if pod_name not in pods:
-            return False
-        return True
+        if not (lab := self.get_lab(name)):
+            return Response(error=True, message=f"Lab '{name}' not found.", data=None)
+        snapshot_dir = get_snapshot_dir(source or name, tag)
+        if not (snapshot_dir / "lab.json").exists():
+            return Response(
+                error=True,
+                message=f"Snapshot '{tag}' of lab '{source or name}' not found.",
+                data=None,
+            )
 
-    def get_pods_by_project(self, project_name: str):
+        jobs = [
+            self._volume_archive_cmd(
+                f"{name}_{archive.stem}", archive.stem, snapshot_dir, restore=True
+            )
+            for archive in snapshot_dir.glob("*.tar")
+        ]
+        cmd_res = self._with_lab_stopped(name, jobs)
+        if type(cmd_res) is Response and cmd_res.error:
+            cmd_res.message = f"Failed to restore lab '{name}': {cmd_res.message}"
+            return cmd_res
+
+        with open(snapshot_dir / "lab.json") as f:
+            snapshot = json.load(f)
+        lab.admin_email = snapshot["admin_email"]
+        lab.admin_password = snapshot["admin_password"]
+        lab.projects = {
+            key: Project(**project) for key, project in snapshot["projects"].items()
+        }
+        report = self.wait_for_lab(name, lab.url)
+        if not report.is_ready:
+            return Response(
+                error=True,
+                message=f"Lab '{name}' restored to snapshot '{tag}', but "
+                f"{', '.join(report.pending)} did not become ready.",
+                data=report,
+            )
+        lab.readiness = report.ready
+        self.state.set_item("labs", name, asdict(lab))
+
+        return Response(
+            message=f"Lab '{name}' restored to snapshot '{tag}'.",
+            data=lab,
+        )
+
+    def get_project_volumes(self, name: str) -> list[str]:
         """
-        Get the names of all pods by project name.
+        Get the names of all volumes of a compose project.
 
         Args:
-            project_name: The name of the project to get the pods for.
+            name: The name of the project.
         """
         result = run_cmd(
             [
                 self.util,
-                "ps",
+                "volume",
+                "ls",
                 "--filter",
-                f"label=com.docker.compose.project={project_name}",
+                f"label=com.docker.compose.project={name}",
                 "--format",
-                "json",
+                "{{.Name}}",
             ]
         )
-        return _stdout_to_json(result.stdout)
+        return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+    def _with_lab_stopped(self, name: str, cmds: list[list[str]]):
+        """
+        Stop a lab, run commands concurrently, then start the lab again.
+
+        Args:
+            name: The name of the lab.
+            cmds: The commands to run while the lab is stopped.
+        """
+        cmd_res = self._run_cmd_safely([*self.compose, "-p", name, "stop"])
+        if type(cmd_res) is Response and cmd_res.error:
+            return cmd_res
+        try:
+            with ThreadPoolExecutor(max_workers=max(len(cmds), 1)) as pool:
+                results = list(pool.map(self._run_cmd_safely, cmds))
+        finally:
+            start_res = self._run_cmd_safely([*self.compose, "-p", name, "start"])
+            self._sync_inventory(name)
+        for res in [*results, start_res]:
+            if type(res) is Response and res.error:
+                return res
+        return start_res
+
+    def _volume_archive_cmd(
+        self, volume: str, key: str, snapshot_dir: Path, restore: bool = False
+    ) -> list[str]:
+        """
+        Build the command that archives a volume into, or restores it from, a snapshot.
+
+        Args:
+            volume: The name of the volume.
+            key: The name of the archive within the snapshot.
+            snapshot_dir: The directory of the snapshot.
+            restore: Restore the volume from the archive instead of archiving it.
+        """
+        if restore:
+            script = f"find /data -mindepth 1 -delete && tar -C /data -xf /snapshot/{key}.tar"
+        else:
+            script = f"tar -C /data -cf /snapshot/{key}.tar ."
+        return [
+            self.util,
+            "run",
+            "--rm",
+            "-v",
+            f"{volume}:/data{'' if restore else ':ro'}",
+            "-v",
+            f"{snapshot_dir}:/snapshot:Z",
+            SNAPSHOT_IMAGE,
+            "sh",
+            "-c",
+            script,
+        ]
+
+    def check_pod_status(self, pod_name: str):
+        """
+        Check the status of a pod.
+
+        Pods of labs are found in the inventory; any other pod is looked up.
+        """
+        if any(pod.name == pod_name for pod in self.cached_containers(name=pod_name)):
+            return True
+        pods = self.containers(name=pod_name, compose_only=False)
+        return any(pod.name == pod_name for pod in pods)
+
+    def get_pods_by_project(self, project_name: str):
+        """
+        Get the names of all pods by project name.
+
+        Args:
+            project_name: The name of the project to get the pods for.
+        """
+        return [pod.to_ps() for pod in self.cached_containers(project=project_name)]
 
     def _run_cmd_safely(self, cmd: list[str], envs: dict[str, str] = {}):
         """
@@ -481,40 +1202,36 @@ class ServiceOrchestrator:
             return Response(error=True, message=f"{str(e)}", data=str(e))
 
     @property
-    def util(self):
-        return shutil.which(self.backend)
+    def worker(self) -> AutomationWorker:
+        if self._worker is None:
+            self._worker = AutomationWorker(self.util)
+        return self._worker
+
+    @functools.cached_property
+    def toolchain(self) -> Toolchain:
+        """The backend and its binaries, discovered on first use."""
+        return discover(self._backend)
+
+    @functools.cached_property
+    def backend(self) -> str:
+        return self.toolchain.backend
+
+    @functools.cached_property
+    def engine(self) -> EngineClient | None:
+        """The Engine API client of the backend, or `None` to use the CLI."""
+        return connect(self.backend) if ENGINE_API else None
 
     @property
-    def compose(self):
-        if self.backend == "docker":
-            # Try docker-compose first, then fall back to docker compose
-            compose_cmd = shutil.which("docker-compose")
-            if compose_cmd:
-                return [compose_cmd]
-            else:
-                return [shutil.which("docker"), "compose"]
-        else:
-            return [shutil.which(f"{self.backend}-compose")]
+    def util(self) -> str | None:
+        return self.toolchain.util
 
+    @property
+    def compose(self) -> list[str]:
+        return list(self.toolchain.compose)
 
-def detect_backend():
-    if shutil.which("docker"):
-        try:
-            subprocess.run(
-                ["docker", "compose", "version"],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            return "docker"
-        except Exception:
-            pass
-        # Check for legacy 'docker-compose' binary
-        if shutil.which("docker-compose"):
-            return "docker"
-    if shutil.which("podman") and shutil.which("podman-compose"):
-        return "podman"
-    raise RuntimeError("Neither Docker nor Podman found.")
+
+def detect_backend() -> str:
+    return discover().backend
 
 
 def run_cmd(cmd: list[str], envs: dict[str, str] | None = None):
@@ -531,20 +1248,30 @@ def run_cmd(cmd: list[str], envs: dict[str, str] | None = None):
         env={**os.environ, **envs} if envs else None,
     )
     if result.returncode != 0:
-        error_msg = result.stderr.strip()
-        if error_msg:
-            # Look for the actual error message in the traceback
-            lines = error_msg.split("\n")
-            for line in reversed(lines):
-                if "PlaywrightAutomationError:" in line or "OrchestratorError:" in line:
-                    # Extract just the error message part
-                    if ":" in line:
-                        error_msg = line.split(":", 1)[1].strip()
-                    break
-        raise OrchestratorError(f"An error occured running a command: {error_msg}")
+        raise command_error(result.stderr)
     return result
 
 
+def command_error(stderr: str) -> OrchestratorError:
+    """
+    Build the error of a failed command from what it wrote to stderr.
+
+    Args:
+        stderr: The stderr of the command.
+    """
+    error_msg = stderr.strip()
+    if error_msg:
+        # Look for the actual error message in the traceback
+        lines = error_msg.split("\n")
+        for line in reversed(lines):
+            if "PlaywrightAutomationError:" in line or "OrchestratorError:" in line:
+                # Extract just the error message part
+                if ":" in line:
+                    error_msg = line.split(":", 1)[1].strip()
+                break
+    return OrchestratorError(f"An error occured running a command: {error_msg}")
+
+
 def get_template_versions():
     """
     List all lab template versions available.
@@ -569,21 +1296,135 @@ def get_template_versions():
     return versions
 
 
-def _stdout_to_json(stdout: str):
+def get_golden_name(version: str) -> str:
+    """
+    Get the name of the lab the golden image of a version is baked from.
+
+    Args:
+        version: The Appwrite version.
+    """
+    return f"golden-{version.replace('.', '-')}"
+
+
+# Held by a deploy from allocating its host ports until compose has bound them
+_port_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def port_allocation() -> Iterator[None]:
+    """
+    Hold the host port allocation of this host, across threads and processes.
+
+    Ports are found free by binding them and releasing them again, so a
+    deploy holds this until compose published its ports, and concurrent
+    deploys never pick the same port.
+    """
+    with _port_lock, file_lock(get_state_path().parent / "ports.lock"):
+        yield
+
+
+def allocate_lab_ports(port: int | None = None) -> dict[str, int]:
     """
-    Convert stdout to a JSON object.
+    Allocate a distinct free host port for every port a lab publishes.
+
+    Call it within `port_allocation` and keep holding that until the ports
+    are published.
 
     Args:
-        stdout: The stdout to convert to a JSON object.
+        port: The port to use for the Appwrite service, if one was requested.
     """
-    return [json.loads(line) for line in stdout.strip().splitlines() if line.strip()]
+    ports = dict(zip(LAB_PORT_VARS, get_free_ports(len(LAB_PORT_VARS))))
+    if port:
+        ports["http"] = port
+    return ports
 
 
-def get_env_vars(name: str):
+def get_lab_env_vars(name: str, ports: dict[str, int]) -> dict[str, str]:
     """
-    Get the default environment variables.
+    Get the environment variables that namespace a lab's compose templates.
+
+    Args:
+        name: The name of the lab.
+        ports: The host ports of the lab, keyed like `LAB_PORT_VARS`.
+    """
+    return {
+        "_APP_LAB_NAMESPACE": name,
+        "_APP_LAB_NETWORK": f"{name}_appwrite",
+        "_APP_COMPUTE_RUNTIMES_NETWORK": f"{name}_runtimes",
+        **{LAB_PORT_VARS[key]: str(value) for key, value in ports.items()},
+    }
+
+
+@dataclass
+class LabTemplates:
+    appwrite: Path
+    twilio_shim: Path
+    mailpit: Path
+    env_file: Path
+
+
+def get_lab_templates(version: str) -> LabTemplates:
+    """
+    Get the compose templates and environment file a lab of a version deploys.
+
+    Args:
+        version: The Appwrite version.
+    """
+    templates = Path(__file__).parent / "templates"
+    return LabTemplates(
+        appwrite=templates / f"docker_compose_{version.replace('.', '_')}.yml",
+        twilio_shim=templates / "extras" / "twilio-shim" / "docker_compose.yml",
+        mailpit=templates / "extras" / "mailpit" / "docker_compose.yml",
+        env_file=templates / "environment" / "dotenv",
+    )
+
+
+def new_lab(
+    name: str,
+    version: str,
+    auth: AppwriteUserCreation | None,
+    ports: dict[str, int],
+    env_vars: dict[str, str],
+) -> Lab:
+    """
+    Build the record of a freshly deployed lab, generating missing credentials.
+
+    Args:
+        name: The name of the lab.
+        version: The Appwrite version of the lab.
+        auth: The authentication credentials, if any were given.
+        ports: The host ports of the lab, with the one traefik published as `http`.
+        env_vars: The environment variables the lab was deployed with.
+    """
+    appwrite_config = asdict(auth) if auth else {}
+    proj_id = appwrite_config.pop("project_id", None)
+    proj_name = appwrite_config.pop("project_name", None)
+    lab = Lab(
+        name=name,
+        version=version,
+        url=f"http://localhost:{ports['http']}",
+        **appwrite_config,
+        projects={"default": Project(proj_id, proj_name, None)},
+        sms_shim_url=f"https://localhost:{ports['sms_shim']}",
+        mailpit_url=f"http://localhost:{ports['mailpit']}",
+        network=env_vars["_APP_LAB_NETWORK"],
+        ports=ports,
+    )
+    lab.generate_missing_config()
+    return lab
+
+
+def get_lab_status(pods: list[dict]) -> str:
+    """
+    Sum up the health of the pods of a lab, e.g. `healthy` or `3/12 healthy`.
+
+    Args:
+        pods: The pods of the lab, as returned by `get_pods_by_project`.
     """
-    return dotenv_values(name)
+    if not pods:
+        return "stopped"
+    healthy = sum(is_pod_healthy(pod) for pod in pods)
+    return "healthy" if healthy == len(pods) else f"{healthy}/{len(pods)} healthy"
 
 
 def extract_port_from_pod_info(pod_info: dict) -> int:
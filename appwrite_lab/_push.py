@@ -0,0 +1,592 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+import httpx
+
+from ._readiness import wait_until_ready
+from .models import SyncType
+
+
+class SchemaPushError(Exception): ...
+
+
+# Resources the native engine pushes; functions and settings go through the Appwrite CLI
+NATIVE_SYNC_TYPES = (
+    SyncType.COLLECTIONS,
+    SyncType.BUCKETS,
+    SyncType.TEAMS,
+    SyncType.TOPICS,
+)
+
+# Attribute properties that can only change by recreating the attribute
+IMMUTABLE_ATTRIBUTE_KEYS = (
+    "type",
+    "format",
+    "array",
+    "relatedCollection",
+    "relationType",
+    "twoWay",
+    "twoWayKey",
+)
+MUTABLE_ATTRIBUTE_KEYS = ("required", "default", "size", "min", "max", "elements")
+
+# Attribute and index statuses that end the wait
+_SETTLED = ("available", "failed", "stuck")
+
+
+@dataclass
+class PushReport:
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    # Attributes dropped and created again to change an immutable property
+    recreated: list[str] = field(default_factory=list)
+    # Attributes that need a recreate, left as they are since it drops their data
+    recreate_skipped: list[str] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        """Whether the push changed anything on the server."""
+        return bool(self.created or self.updated or self.deleted)
+
+
+def attribute_endpoint(attribute: dict) -> str:
+    """
+    Get the endpoint type of an attribute, as in `/attributes/{type}`.
+
+    Args:
+        attribute: The attribute as defined in appwrite.json.
+    """
+    if attribute["type"] == "string" and attribute.get("format") in (
+        "email",
+        "enum",
+        "url",
+        "ip",
+    ):
+        return attribute["format"]
+    return "float" if attribute["type"] == "double" else attribute["type"]
+
+
+def attribute_update_endpoint(attribute: dict) -> str:
+    """
+    Get the endpoint that updates an attribute, as in `/attributes/{endpoint}`.
+
+    Relationships are updated at `/attributes/{key}/relationship`, every other
+    type at `/attributes/{type}/{key}`.
+
+    Args:
+        attribute: The attribute as defined in appwrite.json.
+    """
+    if attribute["type"] == "relationship":
+        return f"{attribute['key']}/relationship"
+    return f"{attribute_endpoint(attribute)}/{attribute['key']}"
+
+
+def attribute_body(attribute: dict, update: bool = False) -> dict:
+    """
+    Build the request body that creates or updates an attribute.
+
+    Args:
+        attribute: The attribute as defined in appwrite.json.
+        update: Build the body of an update instead of a create.
+    """
+    if attribute["type"] == "relationship":
+        if update:
+            return {"onDelete": attribute.get("onDelete")}
+        return {
+            "key": attribute["key"],
+            "relatedCollectionId": attribute["relatedCollection"],
+            "type": attribute["relationType"],
+            "twoWay": attribute.get("twoWay", False),
+            "twoWayKey": attribute.get("twoWayKey"),
+            "onDelete": attribute.get("onDelete", "restrict"),
+        }
+    body = {"required": attribute["required"], "default": attribute.get("default")}
+    if not update:
+        body["key"] = attribute["key"]
+        body["array"] = attribute.get("array", False)
+    for key in ("size", "min", "max", "elements"):
+        if attribute.get(key) is not None:
+            body[key] = attribute[key]
+    return body
+
+
+def attribute_changes(local: dict, remote: dict) -> str | None:
+    """
+    Compare an attribute of appwrite.json with the one on the server.
+
+    Properties unset in appwrite.json are not compared, and an empty string
+    counts as unset on either side, as the server leaves such properties out.
+
+    Args:
+        local: The attribute as defined in appwrite.json.
+        remote: The attribute as returned by the server.
+
+    Returns:
+        `recreate` or `update` when the attribute has to change, otherwise None.
+    """
+
+    def differs(key: str) -> bool:
+        value = _unset_as_none(local.get(key))
+        return value is not None and value != _unset_as_none(remote.get(key))
+
+    if any(differs(key) for key in IMMUTABLE_ATTRIBUTE_KEYS):
+        return "recreate"
+    if any(differs(key) for key in (*MUTABLE_ATTRIBUTE_KEYS, "onDelete")):
+        return "update"
+    return None
+
+
+def _unset_as_none(value):
+    return None if value == "" else value
+
+
+def index_changed(local: dict, remote: dict) -> bool:
+    """
+    Compare an index of appwrite.json with the one on the server.
+
+    Args:
+        local: The index as defined in appwrite.json.
+        remote: The index as returned by the server.
+    """
+    if (local["type"], local["attributes"]) != (remote["type"], remote["attributes"]):
+        return True
+    return bool(local.get("orders")) and local["orders"] != remote.get("orders")
+
+
+class SchemaPusher:
+    def __init__(
+        self,
+        url: str,
+        project_id: str,
+        api_key: str,
+        max_parallel: int = 8,
+        timeout: float = 30,
+        attribute_timeout: float = 300,
+        allow_recreate: bool = False,
+    ):
+        """
+        Push the resources of an appwrite.json config through the server API.
+
+        Each resource is compared with the live schema of the project and only
+        the required create, update and delete calls are made. Independent
+        calls run concurrently, and attributes and indexes are awaited until
+        the server reports them available.
+
+        Args:
+            url: The URL of the Appwrite instance.
+            project_id: The ID of the project to push to.
+            api_key: An API key of the project with the databases, storage,
+                teams and messaging write scopes.
+            max_parallel: The maximum number of requests in flight, across all
+                resources pushed at once.
+            timeout: The timeout of each request in seconds.
+            attribute_timeout: Seconds to wait for attributes and indexes to
+                become available.
+            allow_recreate: Delete and create again attributes whose type or
+                another immutable property changed, dropping their data.
+                Otherwise they are left as they are and reported.
+        """
+        self.client = httpx.Client(
+            base_url=f"{url}/v1",
+            headers={"X-Appwrite-Project": project_id, "X-Appwrite-Key": api_key},
+            timeout=timeout,
+        )
+        self.max_parallel = max_parallel
+        self.attribute_timeout = attribute_timeout
+        self.allow_recreate = allow_recreate
+        # Caps the requests in flight across all resource types pushed at once
+        self._slots = threading.BoundedSemaphore(max_parallel)
+
+    def push(
+        self, config: dict, resources: Iterable[str] = NATIVE_SYNC_TYPES
+    ) -> PushReport:
+        """
+        Push the resources of a config to the project.
+
+        Resource types are pushed concurrently, since none depends on another.
+        Resources that exist on the server but not in the config are kept,
+        except attributes and indexes of pushed collections.
+
+        Args:
+            config: The loaded appwrite.json config.
+            resources: The sync types to push, among `NATIVE_SYNC_TYPES`.
+
+        Returns:
+            What was created, updated, deleted or left unchanged, and the
+            seconds each resource type and collection took.
+        """
+        report = PushReport()
+        pushers = {
+            SyncType.COLLECTIONS: self._push_collections,
+            SyncType.BUCKETS: self._push_buckets,
+            SyncType.TEAMS: self._push_teams,
+            SyncType.TOPICS: self._push_topics,
+        }
+        self._map(
+            lambda resource: self._timed(
+                report, str(resource), pushers[resource], config, report
+            ),
+            list(resources),
+        )
+        return report
+
+    def _push_buckets(self, config: dict, report: PushReport):
+        self._map(
+            lambda bucket: self._upsert(
+                report,
+                f"bucket:{bucket['$id']}",
+                f"/storage/buckets/{bucket['$id']}",
+                "/storage/buckets",
+                {"bucketId": bucket["$id"]},
+                _body(
+                    bucket,
+                    "$permissions",
+                    "fileSecurity",
+                    "name",
+                    "enabled",
+                    "maximumFileSize",
+                    "allowedFileExtensions",
+                    "compression",
+                    "encryption",
+                    "antivirus",
+                ),
+            ),
+            config.get("buckets", []),
+        )
+
+    def _push_teams(self, config: dict, report: PushReport):
+        self._map(
+            lambda team: self._upsert(
+                report,
+                f"team:{team['$id']}",
+                f"/teams/{team['$id']}",
+                "/teams",
+                {"teamId": team["$id"]},
+                {"name": team["name"]},
+                update=("PUT", f"/teams/{team['$id']}/name"),
+            ),
+            config.get("teams", []),
+        )
+
+    def _push_topics(self, config: dict, report: PushReport):
+        self._map(
+            lambda topic: self._upsert(
+                report,
+                f"topic:{topic['$id']}",
+                f"/messaging/topics/{topic['$id']}",
+                "/messaging/topics",
+                {"topicId": topic["$id"]},
+                _body(topic, "name", "subscribe"),
+                update=("PATCH", f"/messaging/topics/{topic['$id']}"),
+            ),
+            config.get("topics", []),
+        )
+
+    def _push_collections(self, config: dict, report: PushReport):
+        """
+        Push the databases and collections of a config, with their attributes and indexes.
+
+        Every collection exists before any relationship is created, since a
+        relationship may point to any of them. Past that, each collection
+        goes through its own attributes and indexes independently.
+        """
+        self._map(
+            lambda database: self._upsert(
+                report,
+                f"database:{database['$id']}",
+                f"/databases/{database['$id']}",
+                "/databases",
+                {"databaseId": database["$id"]},
+                _body(database, "name", "enabled"),
+            ),
+            config.get("databases", []),
+        )
+        collections = config.get("collections", [])
+        remotes = self._map(
+            lambda collection: self._upsert(
+                report,
+                f"collection:{collection['$id']}",
+                _collection_path(collection),
+                f"/databases/{collection['databaseId']}/collections",
+                {"collectionId": collection["$id"]},
+                _body(
+                    collection, "$permissions", "documentSecurity", "name", "enabled"
+                ),
+            ),
+            collections,
+        )
+        self._map(
+            lambda item: self._timed(
+                report,
+                f"collection:{item[0]['$id']}",
+                self._push_collection_schema,
+                *item,
+                report,
+            ),
+            list(zip(collections, remotes)),
+        )
+
+    def _push_collection_schema(
+        self, collection: dict, remote: dict, report: PushReport
+    ):
+        """Bring the attributes and indexes of one collection in line with the config."""
+        path = _collection_path(collection)
+        remote_attributes = {a["key"]: a for a in remote.get("attributes", [])}
+        remote_indexes = {i["key"]: i for i in remote.get("indexes", [])}
+        local_attributes = {a["key"]: a for a in collection.get("attributes", [])}
+        local_indexes = {i["key"]: i for i in collection.get("indexes", [])}
+
+        stale_attributes, updates, creates, relationships = [], [], [], []
+        for key, attribute in remote_attributes.items():
+            # Child sides of relationships are managed by their parent
+            if key not in local_attributes and attribute.get("side") != "child":
+                stale_attributes.append(key)
+        for key, attribute in local_attributes.items():
+            if attribute.get("side") == "child":
+                continue
+            change = (
+                attribute_changes(attribute, remote_attributes[key])
+                if key in remote_attributes
+                else "create"
+            )
+            if change == "recreate":
+                if not self.allow_recreate:
+                    report.recreate_skipped.append(f"attribute:{_label(path, key)}")
+                    continue
+                report.recreated.append(f"attribute:{_label(path, key)}")
+                stale_attributes.append(key)
+            if change == "update":
+                updates.append(attribute)
+            elif change:
+                target = (
+                    relationships if attribute["type"] == "relationship" else creates
+                )
+                target.append(attribute)
+            else:
+                report.unchanged.append(f"attribute:{_label(path, key)}")
+
+        stale_indexes, indexes = [], []
+        for key, index in remote_indexes.items():
+            if key not in local_indexes or index_changed(local_indexes[key], index):
+                stale_indexes.append(key)
+        for key, index in local_indexes.items():
+            if key in remote_indexes and not index_changed(index, remote_indexes[key]):
+                report.unchanged.append(f"index:{_label(path, key)}")
+            else:
+                indexes.append(index)
+
+        # Indexes go before the attributes they cover, and come back after them
+        self._delete(report, "index", "indexes", path, stale_indexes)
+        self._delete(report, "attribute", "attributes", path, stale_attributes)
+        self._map(
+            lambda attribute: self._request(
+                "PATCH",
+                f"{path}/attributes/{attribute_update_endpoint(attribute)}",
+                attribute_body(attribute, update=True),
+            ),
+            updates,
+        )
+        report.updated.extend(f"attribute:{_label(path, a['key'])}" for a in updates)
+        for batch in (creates, relationships):
+            self._map(
+                lambda attribute: self._request(
+                    "POST",
+                    f"{path}/attributes/{attribute_endpoint(attribute)}",
+                    attribute_body(attribute),
+                ),
+                batch,
+            )
+            report.created.extend(f"attribute:{_label(path, a['key'])}" for a in batch)
+            self._wait("attributes", path, [a["key"] for a in batch])
+        self._map(
+            lambda index: self._request(
+                "POST",
+                f"{path}/indexes",
+                {
+                    "key": index["key"],
+                    "type": index["type"],
+                    "attributes": index["attributes"],
+                    "orders": index.get("orders") or [],
+                },
+            ),
+            indexes,
+        )
+        report.created.extend(f"index:{_label(path, i['key'])}" for i in indexes)
+        self._wait("indexes", path, [i["key"] for i in indexes])
+
+    def _timed(self, report: PushReport, name: str, fn: Callable, *args):
+        """Run a push step and record how long it took."""
+        start = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            report.timings[name] = round(time.monotonic() - start, 3)
+
+    def _upsert(
+        self,
+        report: PushReport,
+        label: str,
+        path: str,
+        create_path: str,
+        create_id: dict,
+        body: dict,
+        update: tuple[str, str] | None = None,
+    ) -> dict:
+        """
+        Create a resource, or update it when it differs from the body.
+
+        Args:
+            report: The report to record the change in.
+            label: The name of the resource in the report.
+            path: The path of the resource.
+            create_path: The path to create the resource at.
+            create_id: The ID parameter of the create call.
+            body: The properties of the resource.
+            update: The method and path of the update call. Defaults to a PUT on `path`.
+
+        Returns:
+            The resource as returned by the server.
+        """
+        remote = self._get(path)
+        if remote is None:
+            report.created.append(label)
+            return self._request("POST", create_path, {**create_id, **body})
+        if any(
+            remote.get("$permissions" if key == "permissions" else key) != value
+            for key, value in body.items()
+        ):
+            report.updated.append(label)
+            method, update_path = update or ("PUT", path)
+            self._request(method, update_path, body)
+            return remote
+        report.unchanged.append(label)
+        return remote
+
+    def _delete(
+        self,
+        report: PushReport,
+        kind: str,
+        segment: str,
+        path: str,
+        keys: list[str],
+    ):
+        """Delete attributes or indexes of a collection and wait until they are gone."""
+        self._map(lambda key: self._request("DELETE", f"{path}/{segment}/{key}"), keys)
+        report.deleted.extend(f"{kind}:{_label(path, key)}" for key in keys)
+        self._wait(segment, path, keys, gone=True)
+
+    def _wait(self, segment: str, path: str, keys: list[str], gone: bool = False):
+        """
+        Wait until attributes or indexes of a collection are available, or gone.
+
+        The collection is polled once per round, however many of its
+        attributes or indexes are awaited.
+
+        Args:
+            segment: `attributes` or `indexes`.
+            path: The path of the collection.
+            keys: The keys of the awaited attributes or indexes.
+            gone: Wait for the items to be deleted instead.
+
+        Raises:
+            SchemaPushError: If an item failed or did not settle in time.
+        """
+        if not keys:
+            return
+        statuses: dict[str, str] = {}
+
+        def check():
+            remote = {
+                item["key"]: item["status"]
+                for item in self._request("GET", path).get(segment, [])
+            }
+            if gone:
+                return not set(keys) & remote.keys()
+            for key in keys:
+                statuses[_label(path, key)] = remote.get(key, "missing")
+            return all(remote.get(key) in _SETTLED for key in keys)
+
+        ready = wait_until_ready({path: check}, timeout=self.attribute_timeout)
+        failed = [
+            f"{label} ({status})"
+            for label, status in statuses.items()
+            if status != "available"
+        ]
+        if not ready.is_ready or (failed and not gone):
+            raise SchemaPushError(
+                f"{segment.capitalize()} of {path} did not become "
+                f"{'deleted' if gone else 'available'}: " + ", ".join(failed or keys)
+            )
+
+    def _map(self, fn: Callable, items: list) -> list:
+        """Apply a function to every item concurrently, in order."""
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            return list(pool.map(fn, items))
+
+    def _get(self, path: str) -> dict | None:
+        """Get a resource, or None if it does not exist."""
+        try:
+            return self._request("GET", path)
+        except SchemaPushError as e:
+            if e.args[1:] == (404,):
+                return None
+            raise
+
+    def _request(self, method: str, path: str, json: dict | None = None) -> dict:
+        """
+        Send a request and raise a SchemaPushError if it fails.
+
+        Args:
+            method: The HTTP method.
+            path: The path relative to `/v1`.
+            json: The JSON body of the request.
+        """
+        try:
+            with self._slots:
+                response = self.client.request(method, path, json=json)
+        except httpx.HTTPError as e:
+            raise SchemaPushError(f"{method} {path} failed: {e}")
+        if response.is_error:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise SchemaPushError(
+                f"{method} {path} failed: {message}", response.status_code
+            )
+        return response.json() if response.content else {}
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _body(resource: dict, *keys: str) -> dict:
+    """Pick the properties of a resource that are set, as request parameters."""
+    return {
+        key.removeprefix("$"): resource[key]
+        for key in keys
+        if resource.get(key) is not None
+    }
+
+
+def _collection_path(collection: dict) -> str:
+    return f"/databases/{collection['databaseId']}/collections/{collection['$id']}"
+
+
+def _label(path: str, key: str) -> str:
+    """Name an attribute or index of a collection path as `<collection>.<key>`."""
+    return f"{path.rsplit('/', 1)[-1]}.{key}"
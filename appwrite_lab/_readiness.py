@@ -0,0 +1,197 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+Probe = Callable[[], bool]
+AsyncProbe = Callable[[], Awaitable[bool]]
+
+
+@dataclass
+class ReadinessReport:
+    ready: dict[str, float] = field(default_factory=dict)
+    pending: list[str] = field(default_factory=list)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether every component became ready before the deadline."""
+        return not self.pending
+
+
+def wait_until_ready(
+    probes: dict[str, Probe],
+    timeout: float = 300,
+    initial_delay: float = 0.25,
+    max_delay: float = 5.0,
+) -> ReadinessReport:
+    """
+    Poll every probe concurrently until it passes or the deadline is reached.
+
+    Each probe is retried with exponential backoff. A probe that raises is
+    treated as not ready yet.
+
+    Args:
+        probes: The probes to poll, keyed by component name.
+        timeout: The overall deadline in seconds, shared by all probes.
+        initial_delay: The delay before the first retry in seconds.
+        max_delay: The upper bound of the delay between retries in seconds.
+
+    Returns:
+        The seconds each component took to become ready, and the components
+        that were still pending at the deadline.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+
+    def poll(probe: Probe) -> float | None:
+        delay = initial_delay
+        while True:
+            try:
+                if probe():
+                    return time.monotonic() - start
+            except Exception:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+    report = ReadinessReport()
+    if not probes:
+        return report
+    with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+        futures = {name: pool.submit(poll, probe) for name, probe in probes.items()}
+    for name, future in futures.items():
+        elapsed = future.result()
+        if elapsed is None:
+            report.pending.append(name)
+        else:
+            report.ready[name] = round(elapsed, 3)
+    return report
+
+
+async def wait_until_ready_async(
+    probes: dict[str, AsyncProbe],
+    timeout: float = 300,
+    initial_delay: float = 0.25,
+    max_delay: float = 5.0,
+) -> ReadinessReport:
+    """
+    Await every probe concurrently until it passes or the deadline is reached.
+
+    The asyncio counterpart of `wait_until_ready`, with the same backoff.
+
+    Args:
+        probes: The probes to poll, keyed by component name.
+        timeout: The overall deadline in seconds, shared by all probes.
+        initial_delay: The delay before the first retry in seconds.
+        max_delay: The upper bound of the delay between retries in seconds.
+
+    Returns:
+        The seconds each component took to become ready, and the components
+        that were still pending at the deadline.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+
+    async def poll(probe: AsyncProbe) -> float | None:
+        delay = initial_delay
+        while True:
+            try:
+                if await probe():
+                    return time.monotonic() - start
+            except Exception:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+    report = ReadinessReport()
+    elapsed = await asyncio.gather(*(poll(probe) for probe in probes.values()))
+    for name, seconds in zip(probes, elapsed):
+        if seconds is None:
+            report.pending.append(name)
+        else:
+            report.ready[name] = round(seconds, 3)
+    return report
+
+
+def http_probe(client: httpx.Client, url: str) -> Probe:
+    """
+    Probe that passes once the URL answers with a 200.
+
+    Args:
+        client: The HTTP client to use.
+        url: The URL to request.
+    """
+
+    def probe():
+        return client.get(url).status_code == 200
+
+    return probe
+
+
+def container_probe(get_pod: Callable[[], dict | None]) -> Probe:
+    """
+    Probe that passes once the container is running and healthy.
+
+    Args:
+        get_pod: Returns the pod information of the container, if it exists.
+    """
+
+    def probe():
+        pod = get_pod()
+        return bool(pod) and is_pod_healthy(pod)
+
+    return probe
+
+
+def http_probe_async(client: httpx.AsyncClient, url: str) -> AsyncProbe:
+    """
+    Asyncio probe that passes once the URL answers with a 200.
+
+    Args:
+        client: The HTTP client to use.
+        url: The URL to request.
+    """
+
+    async def probe():
+        return (await client.get(url)).status_code == 200
+
+    return probe
+
+
+def container_probe_async(get_pod: Callable[[], Awaitable[dict | None]]) -> AsyncProbe:
+    """
+    Asyncio probe that passes once the container is running and healthy.
+
+    Args:
+        get_pod: Returns the pod information of the container, if it exists.
+    """
+
+    async def probe():
+        pod = await get_pod()
+        return bool(pod) and is_pod_healthy(pod)
+
+    return probe
+
+
+def is_pod_healthy(pod_info: dict) -> bool:
+    """Check whether a pod is running and, if it defines a healthcheck, healthy.
+
+    Args:
+        pod_info: The pod information as returned by `ps --format json`.
+    """
+    if pod_info.get("State") != "running":
+        return False
+    # e.g. "Up 5 seconds (healthy)" or "Up 2 seconds (health: starting)"
+    status = pod_info.get("Status", "")
+    if "(" in status:
+        return "(healthy)" in status
+    return True
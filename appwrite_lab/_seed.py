@@ -0,0 +1,418 @@
+import csv
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from .automations.automations import LabContext, LabRequestError
+
+# Fixture formats, by file suffix
+SEED_FORMATS = (".ndjson", ".json", ".csv")
+
+# Password hashes users can be imported with, as in `/users/{hash}`
+USER_HASHES = ("argon2", "bcrypt", "md5", "phpass", "scrypt", "scrypt-modified", "sha")
+
+# Document fields set by the server, dropped before writing
+SYSTEM_FIELDS = (
+    "$createdAt",
+    "$updatedAt",
+    "$collectionId",
+    "$databaseId",
+    "$sequence",
+    "$internalId",
+)
+
+# Files above this size are uploaded in chunks of this size, as Appwrite requires
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+
+# First Appwrite version with the bulk document API
+BULK_DOCUMENTS_VERSION = (1, 7)
+
+# Options of each password hash, as named by the import endpoints
+_HASH_OPTIONS = {
+    "sha": {"version": "passwordVersion"},
+    "scrypt": {
+        "salt": "passwordSalt",
+        "costCpu": "passwordCpu",
+        "costMemory": "passwordMemory",
+        "costParallel": "passwordParallel",
+        "length": "passwordLength",
+    },
+    "scrypt-modified": {
+        "salt": "passwordSalt",
+        "saltSeparator": "passwordSaltSeparator",
+        "signerKey": "passwordSignerKey",
+    },
+}
+
+
+@dataclass
+class SeedReport:
+    documents: dict[str, int] = field(default_factory=dict)
+    users: int = 0
+    files: int = 0
+    # Records that already existed on the server
+    skipped: int = 0
+    errors: list[str] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+
+
+def read_records(path: Path) -> Iterator[dict]:
+    """
+    Stream the records of a fixture file.
+
+    NDJSON and CSV files are read one line at a time. JSON files hold a list
+    of records, or an object with them under `documents` or `users`, and are
+    loaded whole.
+
+    Args:
+        path: The fixture file, in one of `SEED_FORMATS`.
+    """
+    with open(path, newline="" if path.suffix == ".csv" else None) as f:
+        if path.suffix == ".ndjson":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif path.suffix == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            records = json.load(f)
+            if isinstance(records, dict):
+                records = records.get("documents", records.get("users", []))
+            yield from records
+
+
+def coerce_csv_record(record: dict[str, str], attributes: dict[str, dict]) -> dict:
+    """
+    Convert the string cells of a CSV record to the types of the collection attributes.
+
+    Empty cells are left out. Arrays, relationships and `$permissions` are
+    parsed as JSON.
+
+    Args:
+        record: The CSV record.
+        attributes: The attributes of the collection, by key.
+    """
+    data = {}
+    for key, value in record.items():
+        if value is None or value == "":
+            continue
+        attribute = attributes.get(key, {})
+        kind = attribute.get("type")
+        if attribute.get("array") or key == "$permissions" or kind == "relationship":
+            data[key] = json.loads(value)
+        elif kind == "integer":
+            data[key] = int(value)
+        elif kind == "double":
+            data[key] = float(value)
+        elif kind == "boolean":
+            data[key] = value.strip().lower() in ("true", "1", "yes")
+        else:
+            data[key] = value
+    return data
+
+
+def _batched(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_bounded(
+    executor: ThreadPoolExecutor, fn: Callable, items: Iterable, limit: int
+):
+    """
+    Run `fn` on each item concurrently, reading items only as tasks finish.
+
+    Args:
+        executor: The executor to run the tasks on.
+        fn: The function to call with each item.
+        items: The items, read lazily so at most `limit` are held at once.
+        limit: The maximum number of tasks submitted and not yet done.
+
+    Raises:
+        Exception: The first exception raised by a task.
+    """
+    pending: set[Future] = set()
+    for item in items:
+        if len(pending) >= limit:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+        pending.add(executor.submit(fn, item))
+    for future in wait(pending).done:
+        future.result()
+
+
+def _fixture_files(directory: Path) -> list[Path]:
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file() and path.suffix in SEED_FORMATS
+    )
+
+
+def _version(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in version.lstrip("v").split(".")[:2])
+
+
+class Seeder:
+    def __init__(self, context: LabContext, batch_size: int = 100):
+        """
+        Write fixture data into a project of a lab through the server API.
+
+        A seed source is a directory laid out as:
+
+            users.(ndjson|json|csv)
+            collections/<databaseId>/<collectionId>.(ndjson|json|csv)
+            buckets/<bucketId>/<file>
+            buckets/<bucketId>/<fileId>/<file>
+
+        Records are streamed from disk and written in batches, with every
+        collection, the users and every bucket seeded concurrently. Records
+        whose ID already exists are skipped, so a source can be seeded again.
+
+        Args:
+            context: The pooled client of the project, which bounds the
+                requests in flight and retries them.
+            batch_size: The number of documents written per request.
+        """
+        self.context = context
+        self.batch_size = batch_size
+        self.bulk = _version(context.lab.version) >= BULK_DOCUMENTS_VERSION
+        # Tasks queued beyond the requests in flight, so sources are not read ahead
+        self._pending = context.max_parallel * 2
+        self._workers = ThreadPoolExecutor(max_workers=self._pending)
+        self._lock = threading.Lock()
+
+    def seed(self, source: Path) -> SeedReport:
+        """
+        Seed every users, collection and bucket fixture of a source directory.
+
+        Args:
+            source: The seed source directory.
+
+        Returns:
+            The records written and skipped, the errors, and the seconds each
+            source took.
+        """
+        report = SeedReport()
+        tasks: list[tuple[str, Callable, tuple]] = []
+        for path in _fixture_files(source):
+            if path.stem == "users":
+                tasks.append(("users", self._seed_users, (path,)))
+        collections = source / "collections"
+        if collections.is_dir():
+            for database in sorted(p for p in collections.iterdir() if p.is_dir()):
+                for path in _fixture_files(database):
+                    label = f"{database.name}/{path.stem}"
+                    report.documents[label] = 0
+                    tasks.append(
+                        (
+                            f"collection:{label}",
+                            self._seed_collection,
+                            (database.name, path.stem, path),
+                        )
+                    )
+        buckets = source / "buckets"
+        if buckets.is_dir():
+            for bucket in sorted(p for p in buckets.iterdir() if p.is_dir()):
+                tasks.append((f"bucket:{bucket.name}", self._seed_bucket, (bucket,)))
+
+        with ThreadPoolExecutor(max_workers=max(len(tasks), 1)) as sources:
+            futures = [
+                sources.submit(self._timed, report, label, fn, *args, report)
+                for label, fn, args in tasks
+            ]
+            for future in futures:
+                future.result()
+        return report
+
+    def _seed_users(self, path: Path, report: SeedReport):
+        self._run(
+            lambda user: self._create_user(user, report, path.suffix == ".csv"),
+            read_records(path),
+        )
+
+    def _create_user(self, user: dict, report: SeedReport, from_csv: bool):
+        if from_csv:
+            user = {
+                key: (
+                    json.loads(value)
+                    if key in ("labels", "prefs", "hashOptions")
+                    else value
+                )
+                for key, value in user.items()
+                if value
+            }
+        user_id = user.get("$id") or user.get("userId") or "unique()"
+        body = {
+            "userId": user_id,
+            "email": user.get("email"),
+            "phone": user.get("phone"),
+            "password": user.get("password"),
+            "name": user.get("name"),
+        }
+        hash_type = user.get("hash")
+        if hash_type in USER_HASHES and user.get("password"):
+            endpoint = f"/users/{hash_type}"
+            options = user.get("hashOptions") or {}
+            for option, param in _HASH_OPTIONS.get(hash_type, {}).items():
+                body[param] = options.get(option)
+        else:
+            endpoint = "/users"
+        try:
+            created = self.context.request(
+                "POST", endpoint, json={k: v for k, v in body.items() if v is not None}
+            )
+        except LabRequestError as e:
+            self._record(report, e, f"user {user_id}")
+            return
+
+        user_path = f"/users/{created['$id']}"
+        follow_ups = []
+        if user.get("labels"):
+            follow_ups.append(("PUT", "labels", {"labels": user["labels"]}))
+        if user.get("prefs"):
+            follow_ups.append(("PATCH", "prefs", {"prefs": user["prefs"]}))
+        if str(user.get("emailVerification")).lower() == "true":
+            follow_ups.append(("PATCH", "verification", {"emailVerification": True}))
+        try:
+            for method, segment, payload in follow_ups:
+                self.context.request(method, f"{user_path}/{segment}", json=payload)
+        except LabRequestError as e:
+            self._record(report, e, f"user {user_id}")
+            return
+        with self._lock:
+            report.users += 1
+
+    def _seed_collection(
+        self, database_id: str, collection_id: str, path: Path, report: SeedReport
+    ):
+        collection_path = f"/databases/{database_id}/collections/{collection_id}"
+        records = read_records(path)
+        if path.suffix == ".csv":
+            remote = self.context.request("GET", collection_path)
+            attributes = {a["key"]: a for a in remote.get("attributes", [])}
+            records = (coerce_csv_record(record, attributes) for record in records)
+        self._run(
+            lambda batch: self._write_documents(
+                f"{database_id}/{collection_id}",
+                f"{collection_path}/documents",
+                batch,
+                report,
+            ),
+            _batched(records, self.batch_size if self.bulk else 1),
+        )
+
+    def _write_documents(
+        self, label: str, path: str, batch: list[dict], report: SeedReport
+    ):
+        """Write a batch of documents in one request, or one by one if it fails."""
+        documents = [
+            {k: v for k, v in record.items() if k not in SYSTEM_FIELDS}
+            for record in batch
+        ]
+        if self.bulk and len(documents) > 1:
+            try:
+                self.context.request("POST", path, json={"documents": documents})
+                with self._lock:
+                    report.documents[label] += len(documents)
+                return
+            except LabRequestError:
+                # A single bad or existing document fails the batch; retry each
+                pass
+        for document in documents:
+            data = {k: v for k, v in document.items() if not k.startswith("$")}
+            body = {"documentId": document.get("$id", "unique()"), "data": data}
+            if "$permissions" in document:
+                body["permissions"] = document["$permissions"]
+            try:
+                self.context.request("POST", path, json=body)
+            except LabRequestError as e:
+                self._record(report, e, f"document {label}/{body['documentId']}")
+                continue
+            with self._lock:
+                report.documents[label] += 1
+
+    def _seed_bucket(self, bucket: Path, report: SeedReport):
+        def uploads() -> Iterator[tuple[str, Path]]:
+            for entry in sorted(bucket.iterdir()):
+                if entry.is_file():
+                    yield "unique()", entry
+                elif entry.is_dir():
+                    # A directory named after the file ID keeps the ID on import
+                    for path in sorted(p for p in entry.iterdir() if p.is_file()):
+                        yield entry.name, path
+
+        self._run(
+            lambda upload: self._upload_file(bucket.name, *upload, report), uploads()
+        )
+
+    def _upload_file(
+        self, bucket_id: str, file_id: str, path: Path, report: SeedReport
+    ):
+        """Upload a file, in chunks if it is larger than `UPLOAD_CHUNK_SIZE`."""
+        size = path.stat().st_size
+        headers = {}
+        try:
+            with open(path, "rb") as f:
+                for start in range(0, max(size, 1), UPLOAD_CHUNK_SIZE):
+                    chunk = f.read(UPLOAD_CHUNK_SIZE)
+                    if size > UPLOAD_CHUNK_SIZE:
+                        end = start + len(chunk) - 1
+                        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+                    created = self.context.request(
+                        "POST",
+                        f"/storage/buckets/{bucket_id}/files",
+                        data={"fileId": file_id},
+                        files={"file": (path.name, chunk)},
+                        headers=headers,
+                    )
+                    # Later chunks go to the file the first one created
+                    file_id = created.get("$id", file_id)
+                    headers["X-Appwrite-ID"] = file_id
+        except LabRequestError as e:
+            self._record(report, e, f"file {bucket_id}/{path.name}")
+            return
+        with self._lock:
+            report.files += 1
+
+    def _run(self, fn: Callable, items: Iterable):
+        run_bounded(self._workers, fn, items, self._pending)
+
+    def _record(self, report: SeedReport, error: LabRequestError, label: str):
+        with self._lock:
+            if len(error.args) > 1 and error.args[1] == 409:
+                report.skipped += 1
+            else:
+                report.errors.append(f"{label}: {error.args[0]}")
+
+    def _timed(self, report: SeedReport, label: str, fn: Callable, *args):
+        start = time.monotonic()
+        try:
+            fn(*args)
+        except (LabRequestError, OSError, ValueError) as e:
+            with self._lock:
+                report.errors.append(f"{label}: {e}")
+        finally:
+            elapsed = round(time.monotonic() - start, 3)
+            with self._lock:
+                report.timings[label] = elapsed
+
+    def close(self):
+        self._workers.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
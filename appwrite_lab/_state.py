@@ -1,8 +1,17 @@
+import contextlib
 import json
 import os
+import threading
+from typing import Iterator
 
+from ._trace import span
 from .utils import get_state_path
 
+try:
+    import fcntl
+except ImportError:  # Windows: only the threads of one process are serialized
+    fcntl = None
+
 
 class StateError(Exception): ...
 
@@ -12,33 +21,105 @@ class State:
         """
         Initialize the state manager
 
+        The state file can be shared by many processes (parallel test workers,
+        several `awlab` commands): changes are made under an advisory lock on
+        the latest contents of the file and written atomically, and reads pick
+        up what other processes wrote.
+
         Args:
             path: The path to the state file.
         """
         if not path:
             path = get_state_path()
 
-        self.path: str = path
+        self.path: str = str(path)
         self.data: dict[str, any] = {}
+        self._lock = threading.RLock()
+        # Identifies the version of the file `data` was read from
+        self._stamp: tuple | None = None
         if not os.path.exists(self.path):
             try:
-                with open(self.path, "w") as f:
-                    f.write("{}")
+                with self._locked():
+                    if not os.path.exists(self.path):
+                        self._write({})
             except Exception as e:
                 raise StateError(f"Failed to create state file: {e}")
-        else:
+        self._reload()
+
+    def _file_stamp(self) -> tuple | None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        # Atomic writes replace the file, so the inode usually changes as well
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _reload(self, force: bool = False):
+        """Read the file again if it changed since it was last read."""
+        stamp = self._file_stamp()
+        if not force and stamp is not None and stamp == self._stamp:
+            return
+        try:
+            with open(self.path, "r") as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            self.data = {}
+        except Exception as e:
+            raise StateError(f"Failed to load state file: {e}")
+        self._stamp = stamp
+
+    def _write(self, data: dict):
+        """Replace the file with `data`, so readers never see a partial file."""
+        temp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp, "w") as f:
+                json.dump(data, f)
+            os.replace(temp, self.path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temp)
+        self._stamp = self._file_stamp()
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock, open(f"{self.path}.lock", "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[dict]:
+        """
+        Change the state as one step, safe against other threads and processes.
+
+        Holds the lock while the latest state is changed and written, so
+        concurrent changes to other keys are kept.
+
+        Yields:
+            The latest state, to change in place. It is saved when the block
+            exits without an exception.
+        """
+        with span("state_write"), self._locked():
+            # A recycled inode can hide a change from the stamp; never write
+            # on top of anything but the file as it is now
+            self._reload(force=True)
             try:
-                with open(self.path, "r") as f:
-                    self.data = json.load(f)
-            except Exception as e:
-                raise StateError(f"Failed to load state file: {e}")
+                yield self.data
+            except BaseException:
+                # Discard the partial change; the next read loads the file
+                self._stamp = None
+                raise
+            self._write(self.data)
 
     def save(self):
         """
         Save the state to the file.
+
+        This overwrites changes other processes made since the state was
+        read; prefer `set`, `set_item` and `pop_item`.
         """
-        with open(self.path, "w") as f:
-            json.dump(self.data, f)
+        with span("state_write"), self._locked():
+            self._write(self.data)
 
     def get(self, key: str, default: any = None):
         """
@@ -50,11 +131,43 @@ class State:
         Returns:
             The value for the key.
         """
-        return self.data.get(key, default)
+        with self._lock:
+            self._reload()
+            return self.data.get(key, default)
 
     def set(self, key: str, value: any):
         """
         Set a value in the state.
         """
-        self.data[key] = value
-        self.save()
+        with self.transaction() as data:
+            data[key] = value
+
+    def set_item(self, key: str, item_key: str, value: any):
+        """
+        Set a single item of a mapping in the state.
+
+        Safe to call from several threads and processes, e.g. when labs are
+        deployed concurrently: only this item is changed.
+
+        Args:
+            key: The key of the mapping (e.g. `labs`).
+            item_key: The key of the item within the mapping.
+            value: The value to set.
+        """
+        with self.transaction() as data:
+            data.setdefault(key, {})[item_key] = value
+
+    def pop_item(self, key: str, item_key: str, default: any = None):
+        """
+        Remove a single item of a mapping in the state.
+
+        Args:
+            key: The key of the mapping (e.g. `labs`).
+            item_key: The key of the item within the mapping.
+            default: The value to return if the item does not exist.
+
+        Returns:
+            The removed value.
+        """
+        with self.transaction() as data:
+            return data.get(key, {}).pop(item_key, default)
@@ -0,0 +1,158 @@
+import hashlib
+import json
+from pathlib import Path
+
+from .models import SyncType
+
+# appwrite.json keys holding the resources each sync type pushes
+RESOURCE_KEYS = {
+    SyncType.CONFIG: "settings",
+    SyncType.COLLECTIONS: "collections",
+    SyncType.BUCKETS: "buckets",
+    SyncType.FUNCTIONS: "functions",
+    SyncType.TEAMS: "teams",
+    SyncType.TOPICS: "topics",
+}
+
+# Databases are pushed along with collections, under this ID prefix
+DATABASE_PREFIX = "databases/"
+
+
+def _digest(definition: dict, code_dir: Path | None = None) -> str:
+    """Hash a resource definition, and the code it points to if any."""
+    h = hashlib.sha256(
+        json.dumps(definition, sort_keys=True, separators=(",", ":")).encode()
+    )
+    if code_dir and code_dir.is_dir():
+        for path in sorted(code_dir.rglob("*")):
+            if path.is_file():
+                h.update(str(path.relative_to(code_dir)).encode())
+                h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def fingerprint_config(
+    config: dict, base_dir: Path | None = None
+) -> dict[str, dict[str, str]]:
+    """
+    Fingerprint every resource of an appwrite.json config.
+
+    Args:
+        config: The loaded appwrite.json config.
+        base_dir: The directory of the config, to also hash the code of functions.
+
+    Returns:
+        The fingerprint of each resource by sync type, then resource ID.
+    """
+    fingerprints = {}
+    if "settings" in config:
+        fingerprints[SyncType.CONFIG] = {"settings": _digest(config["settings"])}
+
+    collections = {
+        f"{DATABASE_PREFIX}{database['$id']}": _digest(database)
+        for database in config.get("databases", [])
+    }
+    collections.update(
+        {
+            collection["$id"]: _digest(collection)
+            for collection in config.get("collections", [])
+        }
+    )
+    if collections:
+        fingerprints[SyncType.COLLECTIONS] = collections
+
+    if functions := config.get("functions"):
+        fingerprints[SyncType.FUNCTIONS] = {
+            function["$id"]: _digest(
+                function,
+                (
+                    base_dir / function["path"]
+                    if base_dir and "path" in function
+                    else None
+                ),
+            )
+            for function in functions
+        }
+
+    for sync_type in (SyncType.BUCKETS, SyncType.TEAMS, SyncType.TOPICS):
+        if resources := config.get(RESOURCE_KEYS[sync_type]):
+            fingerprints[sync_type] = {
+                resource["$id"]: _digest(resource) for resource in resources
+            }
+    return fingerprints
+
+
+def changed_resources(
+    old: dict[str, dict[str, str]], new: dict[str, dict[str, str]]
+) -> dict[str, list[str]]:
+    """
+    Find the resources that are new or whose definition changed.
+
+    Resources that were removed from the config are not reported, since a
+    push never deletes them.
+
+    Args:
+        old: The fingerprints of the last sync.
+        new: The fingerprints of the config to sync.
+
+    Returns:
+        The IDs of the changed resources by sync type, for types with changes only.
+    """
+    changes = {}
+    for sync_type, resources in new.items():
+        synced = old.get(sync_type, {})
+        if ids := [id for id, digest in resources.items() if synced.get(id) != digest]:
+            changes[sync_type] = ids
+    return changes
+
+
+def filter_config(config: dict, changes: dict[str, list[str]]) -> dict:
+    """
+    Keep only the changed resources of a config, so a push skips the others.
+
+    Collections keep the databases they belong to.
+
+    Args:
+        config: The loaded appwrite.json config.
+        changes: The IDs of the changed resources by sync type.
+
+    Returns:
+        The config with the project keys and the changed resources only.
+    """
+    filtered = {
+        key: value
+        for key, value in config.items()
+        if key not in RESOURCE_KEYS.values() and key != "databases"
+    }
+    if SyncType.CONFIG in changes:
+        filtered["settings"] = config["settings"]
+
+    if ids := set(changes.get(SyncType.COLLECTIONS, [])):
+        filtered["collections"] = [
+            collection
+            for collection in config.get("collections", [])
+            if collection["$id"] in ids
+        ]
+        database_ids = {
+            id.removeprefix(DATABASE_PREFIX)
+            for id in ids
+            if id.startswith(DATABASE_PREFIX)
+        } | {collection["databaseId"] for collection in filtered["collections"]}
+        filtered["databases"] = [
+            database
+            for database in config.get("databases", [])
+            if database["$id"] in database_ids
+        ]
+
+    for sync_type in (
+        SyncType.FUNCTIONS,
+        SyncType.BUCKETS,
+        SyncType.TEAMS,
+        SyncType.TOPICS,
+    ):
+        if ids := set(changes.get(sync_type, [])):
+            key = RESOURCE_KEYS[sync_type]
+            filtered[key] = [
+                resource for resource in config.get(key, []) if resource["$id"] in ids
+            ]
+    return filtered
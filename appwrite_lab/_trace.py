@@ -0,0 +1,188 @@
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .config import TRACE_FILE
+
+_ids = itertools.count(1)
+# The span the current code runs in, per thread and context
+_current: ContextVar[dict | None] = ContextVar("appwrite_lab_span", default=None)
+_writer: "_TraceWriter | None" = None
+
+
+class _TraceWriter:
+    def __init__(self, path: Path):
+        """
+        Append finished spans to a trace file as they end.
+
+        Files ending in `.jsonl` get one span per line. Any other file gets
+        Chrome trace events (as loaded by `chrome://tracing` and Perfetto), in
+        the JSON array format whose closing bracket is optional, so the file
+        is readable even if the process dies mid-trace.
+
+        Args:
+            path: The trace file, created if missing.
+        """
+        self.path = path
+        self.chrome = path.suffix != ".jsonl"
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.chrome and (not path.exists() or path.stat().st_size == 0):
+            path.write_text("[\n")
+
+    def write(self, span: dict):
+        if self.chrome:
+            event = {
+                "name": span["name"],
+                "cat": "appwrite-lab",
+                "ph": "X",
+                "ts": span["start_ns"] // 1000,
+                "dur": span["duration_ns"] // 1000,
+                "pid": os.getpid(),
+                "tid": span["thread"],
+                "args": span["attrs"],
+            }
+            line = json.dumps(event, default=str) + ",\n"
+        else:
+            record = {
+                "name": span["name"],
+                "id": span["id"],
+                "parent": span["parent"],
+                "start": span["start_ns"] / 1e9,
+                "duration_ms": round(span["duration_ns"] / 1e6, 3),
+                "thread": span["thread"],
+                "attrs": span["attrs"],
+            }
+            line = json.dumps(record, default=str) + "\n"
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+
+
+def enable_tracing(path: str | Path | None):
+    """
+    Write timing spans to a trace file, or stop tracing if no path is given.
+
+    Args:
+        path: The trace file, `.jsonl` for JSON lines, otherwise Chrome trace events.
+    """
+    global _writer
+    _writer = _TraceWriter(Path(path)) if path else None
+
+
+def tracing_enabled() -> bool:
+    return _writer is not None
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[dict]:
+    """
+    Time a block as a span, nested in the span it runs in.
+
+    Does nothing when tracing is disabled.
+
+    Args:
+        name: The name of the span, e.g. `compose_up`.
+        **attrs: Attributes recorded with the span.
+
+    Yields:
+        The attributes of the span, which the block can add to.
+    """
+    if _writer is None:
+        yield attrs
+        return
+    parent = _current.get()
+    current = {
+        "name": name,
+        "id": next(_ids),
+        "parent": parent["id"] if parent else None,
+        "thread": threading.get_ident(),
+        "attrs": attrs,
+        "start_ns": time.time_ns(),
+    }
+    token = _current.set(current)
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = repr(e)
+        raise
+    finally:
+        _current.reset(token)
+        current["duration_ns"] = time.time_ns() - current["start_ns"]
+        _writer.write(current)
+
+
+def annotate(**attrs):
+    """Add attributes to the current span, if there is one."""
+    if current := _current.get():
+        current["attrs"].update(attrs)
+
+
+def emit(name: str, start_ns: int, duration_ns: int, **attrs):
+    """
+    Record a span measured elsewhere, as a child of the current span.
+
+    Args:
+        name: The name of the span.
+        start_ns: When it started, in nanoseconds since the epoch.
+        duration_ns: How long it took in nanoseconds.
+        **attrs: Attributes recorded with the span.
+    """
+    if _writer is None:
+        return
+    parent = _current.get()
+    _writer.write(
+        {
+            "name": name,
+            "id": next(_ids),
+            "parent": parent["id"] if parent else None,
+            "thread": threading.get_ident(),
+            "attrs": attrs,
+            "start_ns": start_ns,
+            "duration_ns": duration_ns,
+        }
+    )
+
+
+def traced(fn: Callable) -> Callable:
+    """
+    Time every call of a function as a span named after it.
+
+    A returned `Response` with `error` set is recorded as the span's error.
+    Coroutine functions are timed until their result is awaited.
+    """
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            if _writer is None:
+                return await fn(*args, **kwargs)
+            with span(fn.__name__) as attrs:
+                result = await fn(*args, **kwargs)
+                if getattr(result, "error", False) is True:
+                    attrs["error"] = result.message
+                return result
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _writer is None:
+            return fn(*args, **kwargs)
+        with span(fn.__name__) as attrs:
+            result = fn(*args, **kwargs)
+            if getattr(result, "error", False) is True:
+                attrs["error"] = result.message
+            return result
+
+    return wrapper
+
+
+enable_tracing(TRACE_FILE)
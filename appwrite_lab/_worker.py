@@ -0,0 +1,181 @@
+import functools
+import hashlib
+import json
+import os
+import shutil
+import socket
+import subprocess
+import threading
+from pathlib import Path
+
+from ._readiness import wait_until_ready
+from .config import APPWRITE_PLAYWRIGHT_IMAGE, SESSIONS_MOUNT
+from .utils import file_lock, get_state_path, get_sessions_path
+
+WORKER_NAME = "appwrite-lab-automation-worker"
+AUTOMATIONS_DIR = Path(__file__).parent / "automations"
+
+# Serializes worker starts between the threads of this process
+_start_lock = threading.Lock()
+
+
+class AutomationWorkerError(Exception): ...
+
+
+@functools.cache
+def code_version(path: Path = AUTOMATIONS_DIR) -> str:
+    """Hash of the automation code, to tell when a worker runs an older copy."""
+    digest = hashlib.sha256()
+    for file in sorted(path.rglob("*")):
+        if file.is_file() and "__pycache__" not in file.parts:
+            digest.update(str(file.relative_to(path)).encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class AutomationWorker:
+    def __init__(self, util: str, name: str = WORKER_NAME):
+        """
+        Long-lived automation container shared by every lab on the host.
+
+        The worker keeps a browser warm and runs automation jobs sent over a
+        Unix socket, so container and browser startup are paid once instead
+        of per automation.
+
+        Args:
+            util: The path of the container CLI (docker or podman).
+            name: The name of the worker container.
+        """
+        self.util = util
+        self.name = name
+        self.work_dir = get_state_path().parent / "worker"
+        self.socket_path = self.work_dir / "worker.sock"
+        self.version_path = self.work_dir / "version"
+
+    def is_running(self) -> bool:
+        """Whether the worker container is running."""
+        result = self._run("ps", "--filter", f"name=^{self.name}$", "--format", "json")
+        return bool(result.stdout.strip())
+
+    def start(self, timeout: float = 60):
+        """
+        Start the worker container unless it is already running the current
+        automation code.
+
+        Threads and processes starting the worker at once take turns, so a
+        running worker is never removed under another caller.
+
+        Args:
+            timeout: Seconds to wait for the worker to accept jobs.
+        """
+        lock_path = self.work_dir.with_name(f"{self.work_dir.name}.lock")
+        with _start_lock, file_lock(lock_path):
+            if self.is_running() and self._can_connect() and self._is_current():
+                return
+            # Stop the outdated or broken worker before its files are replaced
+            self.stop()
+            self._start(timeout)
+
+    def _start(self, timeout: float):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self.work_dir.mkdir(parents=True)
+        shutil.copytree(AUTOMATIONS_DIR, self.work_dir / "automations")
+        self.version_path.write_text(code_version())
+        container_work_dir = "/work/worker"
+        get_sessions_path().mkdir(parents=True, exist_ok=True)
+        self._run(
+            "run",
+            "-d",
+            "--rm",
+            "--name",
+            self.name,
+            "--network",
+            "host",
+            "-u",
+            f"{os.getuid()}:{os.getgid()}",
+            "-v",
+            f"{self.work_dir}:{container_work_dir}:Z",
+            "-v",
+            f"{get_sessions_path()}:{SESSIONS_MOUNT}:z",
+            "-w",
+            container_work_dir,
+            "-e",
+            f"HOME={container_work_dir}",
+            APPWRITE_PLAYWRIGHT_IMAGE,
+            "python",
+            "-m",
+            "automations.worker",
+            "--socket",
+            f"{container_work_dir}/{self.socket_path.name}",
+        )
+        report = wait_until_ready({"worker": self._can_connect}, timeout=timeout)
+        if not report.is_ready:
+            self.stop()
+            raise AutomationWorkerError(
+                f"Automation worker did not start within {timeout} seconds."
+            )
+
+    def stop(self):
+        """Stop the worker container if it is running."""
+        subprocess.run(
+            [self.util, "rm", "-f", self.name],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def run(
+        self,
+        automation: str,
+        env: dict[str, str],
+        files: dict[str, str] = {},
+        timeout: float = 300,
+    ) -> dict:
+        """
+        Run an automation on the worker, starting it if needed.
+
+        Args:
+            automation: The name of the automation script.
+            env: The environment variables of the automation.
+            files: Files to place in the working directory of the job, by name.
+            timeout: Seconds to wait for the job to finish.
+
+        Returns:
+            The job result, with `ok` and either `data` or `error`.
+        """
+        self.start()
+        job = {"automation": automation, "env": env, "files": files}
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(str(self.socket_path))
+                sock.sendall(json.dumps(job).encode() + b"\n")
+                data = b""
+                while not data.endswith(b"\n"):
+                    if not (chunk := sock.recv(65536)):
+                        break
+                    data += chunk
+            return json.loads(data)
+        except (OSError, ValueError) as e:
+            raise AutomationWorkerError(f"Automation worker failed: {e}")
+
+    def _is_current(self) -> bool:
+        try:
+            return self.version_path.read_text() == code_version()
+        except OSError:
+            return False
+
+    def _can_connect(self) -> bool:
+        if not self.socket_path.exists():
+            return False
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(self.socket_path))
+                return True
+            except OSError:
+                return False
+
+    def _run(self, *args: str) -> subprocess.CompletedProcess:
+        result = subprocess.run([self.util, *args], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise AutomationWorkerError(result.stderr.strip())
+        return result
@@ -0,0 +1,134 @@
+import asyncio
+from typing import AsyncIterator
+
+from ._async_orchestrator import AsyncServiceOrchestrator
+from ._orchestrator import Response, get_lab_status
+from .automations.models import AppwriteLabCreation, Expiration
+from .labs import Labs
+from .models import Lab
+
+
+class AsyncLabs:
+    def __init__(self, labs: Labs | None = None):
+        """
+        Asyncio counterpart of `Labs`, so many labs can be deployed, queried
+        and torn down together from one event loop.
+
+        Args:
+            labs: The labs to share the state and orchestrator of, new ones if not set.
+        """
+        self.labs = labs or Labs()
+        self.state = self.labs.state
+        self.orchestrator = AsyncServiceOrchestrator(self.labs.orchestrator)
+
+    async def new(
+        self,
+        name: str,
+        version: str,
+        port: int | None = None,
+        auth: AppwriteLabCreation | None = None,
+        just_deploy: bool = False,
+        from_golden: bool = False,
+    ) -> Response:
+        """
+        Deploy a new Appwrite lab.
+
+        Args:
+            name: The name of the lab.
+            version: The version of the lab.
+            port: The port of the lab. Unset for an auto-assigned port.
+            auth: The authentication credentials.
+            just_deploy: Deploy the lab without creating an API key or project.
+            from_golden: Start from the golden image of the version (see `Labs.bake_golden`).
+        """
+        return await self.orchestrator.deploy_appwrite_lab(
+            name,
+            version,
+            port,
+            auth,
+            just_deploy=just_deploy,
+            from_golden=from_golden,
+        )
+
+    async def new_many(
+        self, specs: list[dict], max_parallel: int = 4
+    ) -> AsyncIterator[tuple[str, Response]]:
+        """
+        Deploy many Appwrite labs concurrently, as in `Labs.new_many`.
+
+        Args:
+            specs: The keyword arguments of `new` for each lab.
+            max_parallel: The maximum number of labs to deploy at once.
+
+        Yields:
+            The name of the lab and the response of its deployment, in
+            completion order.
+        """
+        slots = asyncio.Semaphore(max_parallel)
+
+        async def deploy(spec: dict) -> tuple[str, Response]:
+            name = spec["name"]
+            async with slots:
+                try:
+                    return name, await self.new(**spec)
+                except Exception as e:
+                    return name, Response(
+                        error=True, message=f"Failed to deploy lab '{name}': {e}"
+                    )
+
+        for done in asyncio.as_completed([deploy(spec) for spec in specs]):
+            yield await done
+
+    def get_lab(self, name: str) -> Lab | None:
+        """
+        Get a lab by name.
+
+        Args:
+            name: The name of the lab.
+        """
+        return self.labs.get_lab(name)
+
+    async def status(self, name: str) -> str:
+        """
+        Sum up the health of the containers of a lab, e.g. `healthy` or `stopped`.
+
+        Args:
+            name: The name of the lab.
+        """
+        return get_lab_status(await self.orchestrator.get_pods_by_project(name))
+
+    async def stop(self, name: str) -> Response:
+        return await self.orchestrator.teardown_service(name)
+
+    async def sync_with_appwrite_config(
+        self,
+        name: str,
+        appwrite_json: str,
+        sync_type: str = "all",
+        expiration: Expiration = Expiration.THIRTY_DAYS,
+        max_parallel: int = 8,
+        allow_recreate: bool = False,
+    ) -> Response:
+        """
+        Sync a lab with an appwrite.json config, as in `Labs.sync_with_appwrite_config`.
+
+        The sync runs in a thread, leaving the loop free.
+        """
+        return await asyncio.to_thread(
+            self.labs.sync_with_appwrite_config,
+            name,
+            appwrite_json,
+            sync_type,
+            expiration,
+            max_parallel,
+            allow_recreate,
+        )
+
+    async def aclose(self):
+        await self.orchestrator.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
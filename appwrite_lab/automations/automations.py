@@ -1,22 +1,202 @@
-from appwrite_lab.models import Lab
-from appwrite.client import Client
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import httpx
+
+from appwrite_lab.models import Lab, Project
+
+# Statuses worth retrying: rate limits and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# The ID that has the server pick one, so each request creates a new resource
+UNIQUE_ID = "unique()"
+
+
+class LabRequestError(Exception): ...
+
+
+def is_retry_safe(method: str, kwargs: dict) -> bool:
+    """
+    Whether a request may be sent again after failing with a transport error or 5xx.
+
+    Such a request may have been carried out anyway. Only a POST that leaves
+    an ID to the server would then create a duplicate, so every other
+    request is safe.
+
+    Args:
+        method: The HTTP method.
+        kwargs: The arguments of the request, as passed to `LabContext.request`.
+    """
+    if method != "POST":
+        return True
+    body = kwargs.get("json") or kwargs.get("data") or {}
+    if not isinstance(body, dict):
+        return True
+    documents = body.get("documents")
+    if isinstance(documents, list) and any("$id" not in d for d in documents):
+        return False
+    return UNIQUE_ID not in body.values()
 
 
 class LabContext:
-    def __init__(self, lab: Lab):
+    def __init__(
+        self,
+        lab: Lab,
+        project: Project,
+        max_parallel: int = 16,
+        timeout: float = 30,
+        retries: int = 5,
+        backoff: float = 0.5,
+    ):
+        """
+        A pooled server API client for a project of a lab.
+
+        Connections are kept alive and shared by every thread using the
+        context, and at most `max_parallel` requests are in flight at once.
+        Rate limited and failed requests are retried with exponential backoff,
+        except that a POST creating a `unique()` ID is only retried when rate
+        limited, as it may have gone through before failing.
+
+        Args:
+            lab: The lab to talk to.
+            project: The project to act on, with its API key.
+            max_parallel: The maximum number of requests in flight.
+            timeout: The timeout of each request in seconds.
+            retries: How many times a request is retried on 429, 5xx and
+                transport errors.
+            backoff: The seconds to wait before the first retry, doubled after each.
+        """
+        if not project.api_key:
+            raise LabRequestError(
+                f"Project {project.project_name} of lab {lab.name} has no API key."
+            )
         self.lab = lab
-        self.client = (
-            Client()
-            .set_endpoint(lab.url)
-            .set_project(lab.project_id)
-            .set_key(lab.api_key)
+        self.project = project
+        self.max_parallel = max_parallel
+        self.retries = retries
+        self.backoff = backoff
+        self.client = httpx.Client(
+            base_url=f"{lab.url}/v1",
+            headers={
+                "X-Appwrite-Project": project.project_id,
+                "X-Appwrite-Key": project.api_key,
+            },
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_parallel, max_keepalive_connections=max_parallel
+            ),
         )
+        self._slots = threading.BoundedSemaphore(max_parallel)
+
+    def request(self, method: str, path: str, **kwargs) -> dict:
+        """
+        Make a request to the server API.
+
+        Args:
+            method: The HTTP method.
+            path: The path under `/v1`.
+            **kwargs: Passed on to `httpx.Client.request`.
+
+        Returns:
+            The JSON body of the response, or an empty dict if there is none.
+
+        Raises:
+            LabRequestError: With the message and status of the last failed
+                attempt, status None if the server could not be reached.
+        """
+        response = self._send(
+            method,
+            path,
+            lambda: self.client.request(method, path, **kwargs),
+            retry_errors=is_retry_safe(method, kwargs),
+        )
+        return response.json() if response.content else {}
+
+    def download(self, path: str, dest: Path, **kwargs):
+        """
+        Stream the body of a GET request to a file, without holding it in memory.
+
+        Args:
+            path: The path under `/v1`.
+            dest: The file to write.
+            **kwargs: Passed on to `httpx.Client.stream`.
+
+        Raises:
+            LabRequestError: As in `request`.
+        """
+
+        def send() -> httpx.Response:
+            with self.client.stream("GET", path, **kwargs) as response:
+                if response.is_success:
+                    with open(dest, "wb") as f:
+                        for chunk in response.iter_bytes():
+                            f.write(chunk)
+                else:
+                    response.read()
+            return response
+
+        self._send("GET", path, send)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        send: Callable[[], httpx.Response],
+        retry_errors: bool = True,
+    ) -> httpx.Response:
+        """
+        Call `send` in a slot until it succeeds, fails for good or runs out of retries.
+
+        A 429 is always retried, transport errors and 5xx only if `retry_errors`.
+        """
+        for attempt in range(self.retries + 1):
+            response, error = None, None
+            with self._slots:
+                try:
+                    response = send()
+                except httpx.TransportError as e:
+                    error = e
+            if error:
+                retry = retry_errors
+            else:
+                retry = response.status_code == 429 or (
+                    retry_errors and response.status_code in RETRY_STATUSES
+                )
+            if not retry or attempt == self.retries:
+                break
+            # Sleep without holding a slot, so other requests keep going
+            time.sleep(self._delay(attempt, response))
+
+        if error:
+            raise LabRequestError(f"{method} {path} failed: {error}", None)
+        if response.is_error:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise LabRequestError(
+                f"{method} {path} failed: {message}", response.status_code
+            )
+        return response
+
+    def _delay(self, attempt: int, response: httpx.Response | None) -> float:
+        """Seconds to wait before a retry, honoring the server's `Retry-After`."""
+        if response is not None:
+            try:
+                return float(response.headers["Retry-After"])
+            except (KeyError, ValueError):
+                pass
+        return self.backoff * 2**attempt
+
+    def close(self):
+        self.client.close()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        self.close()
 
 
 class AppwriteAutomation:
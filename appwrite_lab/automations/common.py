@@ -1,5 +1,24 @@
-from .utils import run_cmd, env_dict_to_str
+from .utils import (
+    run_cmd,
+    env_dict_to_str,
+    get_session_dir,
+    PlaywrightAutomationError,
+)
 from dataclasses import dataclass
+from pathlib import Path
+import shutil
+
+# Appwrite CLI preferences (endpoint and session), cached in the session directory
+CLI_PREFS_FILE = "cli_prefs.json"
+
+# CLI logins shared by the steps of an automation plan, unset outside of one
+_plan_logins: set[tuple[str, str]] | None = None
+
+
+def share_cli_logins(enabled: bool):
+    """Reuse CLI logins across the steps of a plan until disabled again."""
+    global _plan_logins
+    _plan_logins = set() if enabled else None
 
 
 @dataclass
@@ -39,6 +58,44 @@ class AppwriteCLI:
         ]
         return CommandExecutor(cmd, None)
 
+    def get_account(self) -> CommandExecutor:
+        """Get the account of the logged in user, failing without a valid session."""
+        return CommandExecutor(["appwrite", "account", "get"])
+
+    def ensure_login(self, url: str, email: str, password: str):
+        """
+        Login to Appwrite, unless the running plan already logged in as the user
+        or the cached CLI session of the user is still valid.
+
+        Args:
+            url: The URL of the Appwrite instance.
+            email: The email of the user.
+            password: The password of the user.
+
+        Raises:
+            PlaywrightAutomationError: If the login fails.
+        """
+        if _plan_logins is not None and (url, email) in _plan_logins:
+            return
+        prefs = Path.home() / ".appwrite" / "prefs.json"
+        session_dir = get_session_dir()
+        cached = session_dir / CLI_PREFS_FILE if session_dir else None
+        restored = False
+        if cached and cached.exists():
+            prefs.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(cached, prefs)
+            restored = self.get_account().run().returncode == 0
+        if not restored:
+            login_res = self.login(url, email, password).run()
+            if login_res.returncode != 0:
+                raise PlaywrightAutomationError(
+                    f"Failed to login to Appwrite: {login_res.stderr}"
+                )
+            if cached and prefs.exists():
+                shutil.copyfile(prefs, cached)
+        if _plan_logins is not None:
+            _plan_logins.add((url, email))
+
     def get_project(self, project_id: str) -> CommandExecutor:
         """
         Get a project from Appwrite.
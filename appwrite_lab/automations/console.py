@@ -0,0 +1,470 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+import httpx
+
+from appwrite_lab.models import Automation, Lab, Project
+from appwrite_lab.utils import get_session_dir
+from .models import (
+    BaseVarModel,
+    AppwriteAPIKeyCreation,
+    AppwriteProjectCreation,
+)
+
+
+class ConsoleAPIError(Exception):
+    def __init__(
+        self, message: str, status: int | None = None, fallback_safe: bool = True
+    ):
+        """
+        A console request or automation failed.
+
+        Args:
+            message: What failed.
+            status: The HTTP status of the failed request, if the server answered.
+            fallback_safe: Whether the automation can be run again another way,
+                i.e. it failed before it changed anything on the lab.
+        """
+        super().__init__(message)
+        self.status = status
+        self.fallback_safe = fallback_safe
+
+
+# Every scope an API key can be granted, as selected by "Select all" in the console
+API_KEY_SCOPES = [
+    "sessions.write",
+    "users.read",
+    "users.write",
+    "teams.read",
+    "teams.write",
+    "databases.read",
+    "databases.write",
+    "collections.read",
+    "collections.write",
+    "attributes.read",
+    "attributes.write",
+    "indexes.read",
+    "indexes.write",
+    "documents.read",
+    "documents.write",
+    "files.read",
+    "files.write",
+    "buckets.read",
+    "buckets.write",
+    "functions.read",
+    "functions.write",
+    "sites.read",
+    "sites.write",
+    "log.read",
+    "log.write",
+    "execution.read",
+    "execution.write",
+    "locale.read",
+    "avatars.read",
+    "health.read",
+    "providers.read",
+    "providers.write",
+    "messages.read",
+    "messages.write",
+    "topics.read",
+    "topics.write",
+    "subscribers.read",
+    "subscribers.write",
+    "targets.read",
+    "targets.write",
+    "rules.read",
+    "rules.write",
+    "migrations.read",
+    "migrations.write",
+    "vcs.read",
+    "vcs.write",
+    "assistant.read",
+    "tokens.read",
+    "tokens.write",
+]
+
+
+class ConsoleClient:
+    def __init__(self, url: str, timeout: float = 30, session_file: Path | None = None):
+        """
+        Client for the Appwrite console REST API.
+
+        Performs the same steps as the console UI through plain HTTP calls,
+        over a single pooled connection.
+
+        Args:
+            url: The URL of the Appwrite instance.
+            timeout: The timeout of each request in seconds.
+            session_file: File to cache the console session in, for `ensure_login`.
+        """
+        self.client = httpx.Client(
+            base_url=f"{url}/v1",
+            headers={"X-Appwrite-Project": "console"},
+            timeout=timeout,
+        )
+        self.session_file = session_file
+        self.logged_in = False
+        # Requests that changed the lab, so a failure after one is not retried
+        self.writes = 0
+
+    @classmethod
+    def for_lab(cls, lab: Lab, timeout: float = 30) -> "ConsoleClient":
+        """
+        Create a client that caches the session of the lab's admin user.
+
+        Args:
+            lab: The lab to connect to.
+            timeout: The timeout of each request in seconds.
+        """
+        session_file = get_session_dir(lab.name, lab.admin_email) / "console.json"
+        return cls(lab.url, timeout=timeout, session_file=session_file)
+
+    def create_account(self, email: str, password: str, name: str = "Test User"):
+        """
+        Register a console user.
+
+        Args:
+            email: The email of the user.
+            password: The password of the user.
+            name: The display name of the user.
+        """
+        self._request(
+            "POST",
+            "/account",
+            {"userId": "unique()", "email": email, "password": password, "name": name},
+        )
+
+    def login(self, email: str, password: str):
+        """
+        Create a console session.
+
+        Args:
+            email: The email of the admin user.
+            password: The password of the admin user.
+        """
+        response = self._request(
+            "POST", "/account/sessions/email", {"email": email, "password": password}
+        )
+        # Cookies are not stored for `localhost`, so use the fallback header
+        if fallback := response.headers.get("X-Fallback-Cookies"):
+            self.client.headers["X-Fallback-Cookies"] = fallback
+        self.logged_in = True
+        if self.session_file:
+            self.session_file.parent.mkdir(parents=True, exist_ok=True)
+            self.session_file.write_text(
+                json.dumps({"fallback": fallback, "cookies": dict(self.client.cookies)})
+            )
+
+    def ensure_login(self, email: str, password: str):
+        """
+        Reuse the cached session if the server still accepts it, otherwise login.
+
+        Args:
+            email: The email of the admin user.
+            password: The password of the admin user.
+        """
+        if self.session_file and self.session_file.exists():
+            session = json.loads(self.session_file.read_text())
+            if session["fallback"]:
+                self.client.headers["X-Fallback-Cookies"] = session["fallback"]
+            self.client.cookies.update(session["cookies"])
+            try:
+                self._request("GET", "/account")
+                self.logged_in = True
+                return
+            except ConsoleAPIError:
+                self.client.headers.pop("X-Fallback-Cookies", None)
+                self.client.cookies.clear()
+        self.login(email, password)
+
+    def update_email(self, email: str, password: str):
+        """
+        Change the email of the logged in user.
+
+        Args:
+            email: The new email.
+            password: The current password of the user.
+        """
+        self._request("PATCH", "/account/email", {"email": email, "password": password})
+
+    def update_password(self, password: str, old_password: str):
+        """
+        Change the password of the logged in user.
+
+        Args:
+            password: The new password.
+            old_password: The current password.
+        """
+        self._request(
+            "PATCH",
+            "/account/password",
+            {"password": password, "oldPassword": old_password},
+        )
+
+    def block_account(self):
+        """Block the logged in user, ending its sessions for good."""
+        self._request("PATCH", "/account/status")
+
+    def create_team(self, name: str = "Personal projects") -> str:
+        """
+        Create an organization (team) that can own projects.
+
+        Args:
+            name: The name of the organization.
+
+        Returns:
+            The ID of the team.
+        """
+        return self._request(
+            "POST", "/teams", {"teamId": "unique()", "name": name}
+        ).json()["$id"]
+
+    def get_default_team(self) -> str:
+        """Get the ID of the first organization of the user, creating one if needed."""
+        teams = self._request("GET", "/teams").json()["teams"]
+        return teams[0]["$id"] if teams else self.create_team()
+
+    def delete_team(self, team_id: str):
+        """
+        Delete an organization (team).
+
+        Args:
+            team_id: The ID of the team.
+        """
+        self._request("DELETE", f"/teams/{team_id}")
+
+    def find_project(self, project_name: str) -> dict:
+        """
+        Find a project by its name.
+
+        Args:
+            project_name: The name of the project.
+        """
+        projects = self._request(
+            "GET", "/projects", params={"search": project_name}
+        ).json()["projects"]
+        for project in projects:
+            if project["name"] == project_name:
+                return project
+        raise ConsoleAPIError(f"Project '{project_name}' not found.")
+
+    def get_project(self, project_id: str) -> dict:
+        """
+        Get a project.
+
+        Args:
+            project_id: The ID of the project.
+        """
+        return self._request("GET", f"/projects/{project_id}").json()
+
+    def create_project(self, project_id: str, project_name: str, team_id: str) -> dict:
+        """
+        Create a project.
+
+        Args:
+            project_id: The ID of the project.
+            project_name: The name of the project.
+            team_id: The ID of the team that owns the project.
+        """
+        return self._request(
+            "POST",
+            "/projects",
+            {"projectId": project_id, "name": project_name, "teamId": team_id},
+        ).json()
+
+    def delete_project(self, project_id: str):
+        """
+        Delete a project.
+
+        Args:
+            project_id: The ID of the project.
+        """
+        self._request("DELETE", f"/projects/{project_id}")
+
+    def create_api_key(
+        self,
+        project_id: str,
+        key_name: str,
+        expire: str | None = None,
+        scopes: list[str] = API_KEY_SCOPES,
+    ) -> str:
+        """
+        Create an API key for a project.
+
+        Args:
+            project_id: The ID of the project.
+            key_name: The name of the API key.
+            expire: The expiration date of the key in ISO 8601. Unset for never.
+            scopes: The scopes to grant. Defaults to all scopes.
+
+        Returns:
+            The secret of the API key.
+        """
+        return self._request(
+            "POST",
+            f"/projects/{project_id}/keys",
+            {"name": key_name, "scopes": scopes, "expire": expire},
+        ).json()["secret"]
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        json: dict | None = None,
+        params: dict | None = None,
+    ):
+        """
+        Send a request and raise a ConsoleAPIError if it fails.
+
+        Args:
+            method: The HTTP method.
+            path: The path relative to `/v1`.
+            json: The JSON body of the request.
+            params: The query parameters of the request.
+        """
+        try:
+            response = self.client.request(method, path, json=json, params=params)
+        except httpx.HTTPError as e:
+            raise ConsoleAPIError(f"{method} {path} failed: {e}")
+        if response.is_error:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise ConsoleAPIError(
+                f"{method} {path} failed: {message}", status=response.status_code
+            )
+        if method != "GET" and not path.startswith("/account/sessions"):
+            self.writes += 1
+        return response
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Automations that can run over the console REST API instead of Playwright
+CONSOLE_AUTOMATIONS = (
+    Automation.CREATE_USER_AND_API_KEY,
+    Automation.CREATE_PROJECT,
+    Automation.CREATE_API_KEY,
+)
+
+_EXPIRATION_DAYS = {"7 Days": 7, "30 days": 30, "90 days": 90, "Year": 365}
+
+
+def expiration_to_date(key_expiry: str) -> str | None:
+    """
+    Convert a console expiration choice to the date the API expects.
+
+    Args:
+        key_expiry: The expiration as shown in the console (e.g. `30 days`).
+
+    Returns:
+        The expiration date in ISO 8601, or None for keys that never expire.
+    """
+    days = _EXPIRATION_DAYS.get(str(key_expiry))
+    if days is None:
+        return None
+    return (datetime.now(timezone.utc) + timedelta(days=days)).isoformat()
+
+
+def run_console_automation(
+    lab: Lab,
+    automation: Automation,
+    project: Project,
+    model: BaseVarModel,
+    console: ConsoleClient | None = None,
+) -> str | None:
+    """
+    Run an automation through the console REST API.
+
+    Args:
+        lab: The lab to run the automation on.
+        automation: The automation to run, one of `CONSOLE_AUTOMATIONS`.
+        project: The project the automation is for.
+        model: The model args of the automation.
+        console: A client to reuse, with its login, across automations.
+
+    Returns:
+        The API key for automations that create one, otherwise None.
+    """
+    if console is None:
+        with ConsoleClient.for_lab(lab) as console:
+            return run_console_automation(lab, automation, project, model, console)
+
+    writes = console.writes
+    try:
+        return _run_console_automation(lab, automation, project, model, console)
+    except ConsoleAPIError as e:
+        # Another engine would repeat what this run already did
+        if console.writes > writes:
+            e.fallback_safe = False
+        raise
+
+
+def _run_console_automation(
+    lab: Lab,
+    automation: Automation,
+    project: Project,
+    model: BaseVarModel,
+    console: ConsoleClient,
+) -> str | None:
+    if automation == Automation.CREATE_USER_AND_API_KEY:
+        model: AppwriteAPIKeyCreation
+        # Steps done by an earlier, interrupted run are skipped
+        _skip_conflict(console.create_account, lab.admin_email, lab.admin_password)
+        console.login(lab.admin_email, lab.admin_password)
+        team_id = console.get_default_team()
+        _skip_conflict(
+            console.create_project, project.project_id, project.project_name, team_id
+        )
+        return console.create_api_key(
+            project.project_id,
+            model.key_name,
+            expire=expiration_to_date(model.key_expiry),
+        )
+
+    if not console.logged_in:
+        console.ensure_login(lab.admin_email, lab.admin_password)
+    if automation == Automation.CREATE_PROJECT:
+        model: AppwriteProjectCreation
+        try:
+            console.get_project(model.project_id)
+        except ConsoleAPIError as e:
+            if e.status != 404:
+                raise
+            console.create_project(
+                model.project_id, model.project_name, console.get_default_team()
+            )
+            return None
+        raise ConsoleAPIError(
+            f"Project '{model.project_name}' with ID: '{model.project_id}' already exists",
+            status=409,
+            fallback_safe=False,
+        )
+
+    if automation == Automation.CREATE_API_KEY:
+        model: AppwriteAPIKeyCreation
+        project_id = console.find_project(model.project_name)["$id"]
+        return console.create_api_key(
+            project_id, model.key_name, expire=expiration_to_date(model.key_expiry)
+        )
+
+    raise ConsoleAPIError(f"Automation {automation} is not supported over HTTP.")
+
+
+def _skip_conflict(create: Callable, *args):
+    """Create a resource, taking a conflict as the resource already existing."""
+    try:
+        create(*args)
+    except ConsoleAPIError as e:
+        if e.status != 409:
+            raise
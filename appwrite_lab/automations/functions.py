@@ -1,26 +1,77 @@
 from playwright.async_api import Playwright, Page, BrowserContext, Browser
 
+from .utils import get_session_dir
+
+# Cookies and local storage of the console, cached in the session directory
+STORAGE_STATE_FILE = "storage_state.json"
+
 
 async def wait_until_loaded(page: Page):
     """Wait until the page is loaded."""
     await page.wait_for_selector('img[alt="Appwrite Logo"]')
 
 
+# Browser kept warm by a long-lived worker, shared by every automation it runs
+_shared_browser: Browser | None = None
+
+
+def set_shared_browser(browser: Browser | None):
+    """Share an already launched browser with all subsequent automations."""
+    global _shared_browser
+    _shared_browser = browser
+
+
+# Browser context shared by the steps of an automation plan, with its console logins
+_shared_context: BrowserContext | None = None
+_console_logins: set[tuple[str, str]] = set()
+
+
+def set_shared_context(context: BrowserContext | None):
+    """Share a browser context, and the console login made in it, with the steps of a plan."""
+    global _shared_context
+    _shared_context = context
+    _console_logins.clear()
+
+
 async def create_browser_context(playwright: Playwright, headless: bool = True):
     """Create a browser context for automation."""
-    browser = await playwright.chromium.launch(headless=headless)
-    context = await browser.new_context()
+    if _shared_context:
+        return _shared_context.browser, _shared_context
+    browser = _shared_browser or await playwright.chromium.launch(headless=headless)
+    session_dir = get_session_dir()
+    storage_state = session_dir / STORAGE_STATE_FILE if session_dir else None
+    context = await browser.new_context(
+        storage_state=(
+            storage_state if storage_state and storage_state.exists() else None
+        )
+    )
     return browser, context
 
 
 async def login_to_console(page: Page, url: str, admin_email: str, admin_password: str):
-    """Login to the Appwrite console."""
+    """Login to the Appwrite console, unless the cached session is still valid."""
     await page.goto(f"{url}/console/")
+    if page.context is _shared_context:
+        if (url, admin_email) in _console_logins:
+            return
+        _console_logins.add((url, admin_email))
+    if await has_console_session(page, url):
+        return
     await page.get_by_role("textbox", name="Email").fill(admin_email)
     await page.get_by_role("textbox", name="Password").fill(admin_password)
     await page.get_by_role("button", name="Sign in").click()
 
 
+async def has_console_session(page: Page, url: str) -> bool:
+    """Whether the browser context holds a console session the server accepts."""
+    headers = {"X-Appwrite-Project": "console"}
+    # Cookies cannot be set for `localhost`, so the console keeps them in local storage
+    if fallback := await page.evaluate("() => localStorage.getItem('cookieFallback')"):
+        headers["X-Fallback-Cookies"] = fallback
+    response = await page.request.get(f"{url}/v1/account", headers=headers)
+    return response.ok
+
+
 async def select_project_after_login(page: Page, project_name: str):
     """Select a project after the login screen."""
     await page.get_by_role("link", name=f"No apps {project_name}").click()
@@ -70,5 +121,10 @@ async def create_api_key_ui(
 
 async def cleanup_browser(context: BrowserContext, browser: Browser):
     """Clean up browser resources."""
+    if context is _shared_context:
+        return
+    if session_dir := get_session_dir():
+        await context.storage_state(path=session_dir / STORAGE_STATE_FILE)
     await context.close()
-    await browser.close()
+    if browser is not _shared_browser:
+        await browser.close()
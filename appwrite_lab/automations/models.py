@@ -69,6 +69,11 @@ class AppwriteAPIKeyCreation(BaseVarModel):
     key_expiry: Expiration
 
 
+@dataclass
+class AppwriteRunPlan(BaseVarModel):
+    plan: str
+
+
 @dataclass
 class AppwriteLabCreation(BaseVarModel):
     admin_email: str | None = None
@@ -50,4 +50,5 @@ async def main():
         return await create_api_key(playwright)
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -19,20 +19,9 @@ async def create_project(playwright: Playwright) -> bool:
 
     project_name = vars.project_name
     project_id = vars.project_id
-    login_exc = acli.login(
-        f"{auth.url}/v1",
-        auth.admin_email,
-        auth.admin_password,
-    )
-    get_project_exc = acli.get_project(project_id)
-
-    login_res = login_exc.run()
-    if login_res.returncode != 0:
-        raise PlaywrightAutomationError(
-            f"Failed to login to Appwrite: {login_res.stderr}"
-        )
+    acli.ensure_login(f"{auth.url}/v1", auth.admin_email, auth.admin_password)
 
-    proj_res = get_project_exc.run()
+    proj_res = acli.get_project(project_id).run()
     if proj_res.returncode == 0:
         raise PlaywrightAutomationError(
             f"Project '{project_name}' with ID: '{project_id}' already exists"
@@ -60,4 +49,5 @@ async def main():
         return await create_project(playwright)
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
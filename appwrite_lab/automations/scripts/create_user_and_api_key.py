@@ -54,4 +54,5 @@ async def main():
         return await create_user_and_api_key(playwright)
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
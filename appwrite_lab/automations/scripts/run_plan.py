@@ -0,0 +1,67 @@
+import asyncio
+import importlib
+import json
+import os
+from pathlib import Path
+from playwright.async_api import Playwright, async_playwright
+from ..common import share_cli_logins
+from ..functions import create_browser_context, set_shared_context, cleanup_browser
+from ..utils import resultify
+from ..models import AppwriteRunPlan
+
+
+async def run_plan(playwright: Playwright):
+    """
+    Run the steps of an automation plan in one process.
+
+    The steps share a browser context, so the console login of the first step
+    is reused by the others, and a single Appwrite CLI login. Each step sees
+    its own variables on top of the lab's. The result of every step is
+    written as a JSON list, in order.
+
+    Args:
+        playwright: Playwright instance.
+    """
+    plan = json.loads(AppwriteRunPlan.from_env().plan)
+    work_dir = os.getenv("HOME")
+    result_file = Path(work_dir) / "result.txt"
+
+    browser, context = await create_browser_context(playwright, headless=True)
+    set_shared_context(context)
+    share_cli_logins(True)
+    results = []
+    try:
+        for step in plan:
+            automation = step["automation"]
+            environ = os.environ.copy()
+            os.environ.update(step["env"])
+            result_file.unlink(missing_ok=True)
+            try:
+                module = importlib.import_module(f".{automation}", __package__)
+                await getattr(module, automation)(playwright)
+                results.append(
+                    result_file.read_text() if result_file.exists() else None
+                )
+            except Exception as e:
+                if step.get("required", True):
+                    raise
+                print(f"Optional step {automation} failed: {e}")
+                results.append(None)
+            finally:
+                os.environ.clear()
+                os.environ.update(environ)
+    finally:
+        set_shared_context(None)
+        share_cli_logins(False)
+        await cleanup_browser(context, browser)
+
+    resultify(work_dir, json.dumps(results))
+
+
+async def main():
+    async with async_playwright() as playwright:
+        return await run_plan(playwright)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,16 +16,7 @@ async def sync_project(playwright: Playwright) -> bool:
     auth = AppwriteWebAuth.from_env()
     sync = AppwriteSyncProject.from_env()
     resource = sync.resource
-    login_exc = acli.login(
-        f"{auth.url}/v1",
-        auth.admin_email,
-        auth.admin_password,
-    )
-    login_res = login_exc.run()
-    if login_res.returncode != 0:
-        raise PlaywrightAutomationError(
-            f"Failed to login to Appwrite: {login_res.stderr}"
-        )
+    acli.ensure_login(f"{auth.url}/v1", auth.admin_email, auth.admin_password)
 
     sync_res = acli.sync_project(resource).run()
     if sync_res.returncode != 0:
@@ -38,4 +29,5 @@ async def main():
         return await sync_project(playwright)
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
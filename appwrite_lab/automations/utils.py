@@ -25,6 +25,22 @@ def run_cmd(
     return result
 
 
+def get_session_dir() -> Path | None:
+    """
+    Get the directory caching the console and CLI sessions of the admin user.
+
+    Returns:
+        The directory, or None when sessions are not cached.
+    """
+    if not (session_dir := os.getenv("APPWRITE_SESSION_DIR")):
+        return None
+    try:
+        Path(session_dir).mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return Path(session_dir)
+
+
 def env_dict_to_str(envs: dict[str, str]) -> str:
     """
     Convert a dictionary of environment variables to a string.
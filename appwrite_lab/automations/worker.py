@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from playwright.async_api import Playwright, async_playwright
+
+from . import functions
+
+
+async def run_job(playwright: Playwright, job: dict) -> dict:
+    """
+    Run one automation job in its own working directory.
+
+    Jobs run one at a time, since automations read their arguments from the
+    environment and write their result to `$HOME/result.txt`.
+
+    Args:
+        playwright: The Playwright instance shared by all jobs.
+        job: The job, with `automation`, `env` and optional `files` keys.
+    """
+    automation = job["automation"]
+    work_dir = tempfile.mkdtemp(prefix=f"{automation}-")
+    for name, content in job.get("files", {}).items():
+        Path(work_dir, name).write_text(content)
+
+    environ, cwd = os.environ.copy(), os.getcwd()
+    os.environ.update({**job["env"], "HOME": work_dir})
+    os.chdir(work_dir)
+    try:
+        module = importlib.import_module(f"automations.scripts.{automation}")
+        await getattr(module, automation)(playwright)
+        result_file = Path(work_dir) / "result.txt"
+        data = result_file.read_text() if result_file.exists() else None
+        return {"ok": True, "data": data}
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(environ)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+async def serve(socket_path: str):
+    """
+    Serve automation jobs on a Unix socket with a warm browser.
+
+    Each connection sends one JSON job per line and receives one JSON result
+    per line.
+
+    Args:
+        socket_path: The path of the Unix socket to listen on.
+    """
+    lock = asyncio.Lock()
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        functions.set_shared_browser(browser)
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            while line := await reader.readline():
+                async with lock:
+                    result = await run_job(playwright, json.loads(line))
+                writer.write(json.dumps(result).encode() + b"\n")
+                await writer.drain()
+            writer.close()
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Appwrite lab automation worker.")
+    parser.add_argument("--socket", required=True, help="Unix socket to listen on.")
+    asyncio.run(serve(parser.parse_args().socket))
+
+
+if __name__ == "__main__":
+    main()
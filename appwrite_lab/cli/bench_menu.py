@@ -0,0 +1,60 @@
+import typer
+from pathlib import Path
+from appwrite_lab.utils import console
+from appwrite_lab import get_global_labs
+
+
+def bench(
+    name: str = typer.Argument(..., help="The name of the lab to benchmark."),
+    mix: list[str] = typer.Option(
+        None,
+        help="A scenario and its weight, as `documents.list=4`. Repeat for a mix.",
+    ),
+    duration: float = typer.Option(10.0, help="The seconds to run for."),
+    requests: int = typer.Option(
+        None, help="Stop after this many requests instead of a duration."
+    ),
+    concurrency: int = typer.Option(16, help="The number of requests in flight."),
+    project: str = typer.Option("default", help="The name of the project to use."),
+    function_id: str = typer.Option(
+        None, help="The function `functions.execute` runs."
+    ),
+    output: Path = typer.Option(None, help="Write the JSON report to this file."),
+):
+    """
+    Benchmark a lab with a mix of requests, reporting latency percentiles as JSON.
+
+    Args:
+        name: The name of the lab to benchmark.
+        mix: The scenarios and their weights.
+        duration: The seconds to run for.
+        requests: Stop after this many requests instead of a duration.
+        concurrency: The number of requests in flight.
+        project: The name of the project to use.
+        function_id: The function `functions.execute` runs.
+        output: Write the JSON report to this file.
+    """
+    from appwrite_lab.tools.bench import run_bench
+
+    lab = get_global_labs().get_lab(name)
+    if not lab:
+        console.print(f"Lab {name} not found", style="red")
+        raise typer.Exit(1)
+    weights = {}
+    for item in mix or []:
+        scenario, _, weight = item.partition("=")
+        weights[scenario] = float(weight or 1)
+
+    with console.status(f"Benchmarking lab '{name}'...", spinner="dots"):
+        report = run_bench(
+            lab,
+            mix=weights or None,
+            duration=duration,
+            requests=requests,
+            concurrency=concurrency,
+            project=project,
+            function_id=function_id,
+        )
+    if output:
+        output.write_text(report.to_json())
+    console.print_json(report.to_json())
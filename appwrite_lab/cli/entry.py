@@ -1,26 +1,46 @@
 import typer
+from pathlib import Path
 from appwrite_lab.utils import set_cli_true
-from appwrite_lab import get_global_labs
+from appwrite_lab._trace import enable_tracing
 
 from .new_menu import new_menu
 from .list_menu import list_menu
 from .stop_menu import stop
 from .sync_menu import sync_lab
+from .snapshot_menu import snapshot, restore
+from .seed_menu import seed, export
+from .bench_menu import bench
 
 set_cli_true()
 
-# Initialize the labs
-labs = get_global_labs()
-state = labs.state
+# The labs are built by the commands that need them (`get_global_labs`), so
+# `--help` and commands that do not touch a lab skip the state and backend
+app = typer.Typer(name="appwrite-lab", rich_markup_mode="rich")
 
 
-app = typer.Typer(
-    name="appwrite-lab", rich_markup_mode=typer.rich_utils.MARKUP_MODE_RICH
-)
+@app.callback()
+def main(
+    trace: Path = typer.Option(
+        None,
+        envvar="APPWRITE_LAB_TRACE",
+        help="Write per-phase timing spans to this file "
+        "(.jsonl for JSON lines, otherwise Chrome trace events).",
+    ),
+):
+    """
+    Zero-click Appwrite test environments.
+    """
+    if trace:
+        enable_tracing(trace)
 
 
 app.add_typer(list_menu, name="list")
 app.add_typer(new_menu, name="new")
 app.command()(stop)
 app.command(name="sync")(sync_lab)
+app.command()(snapshot)
+app.command()(restore)
+app.command()(seed)
+app.command()(export)
+app.command()(bench)
 # app.add_typer(stop_menu, name="stop")
@@ -1,16 +1,14 @@
 from appwrite_lab import get_global_labs
 from appwrite_lab.utils import print_table
-from appwrite_lab._orchestrator import get_template_versions
 import typer
 
-list_menu = typer.Typer(name="list", rich_markup_mode=typer.rich_utils.MARKUP_MODE_RICH)
-
-labs = get_global_labs()
+list_menu = typer.Typer(name="list", rich_markup_mode="rich")
 
 
 @list_menu.command(name="labs", help="List resources.")
 def get_labs():
     """List all ephemeral Appwrite instances."""
+    labs = get_global_labs()
     headers, pods = labs.orchestrator.get_formatted_labs(collapsed=True)
     print_table(pods, headers)
 
@@ -18,5 +16,7 @@ def get_labs():
 @list_menu.command()
 def versions():
     """List all available Appwrite versions."""
+    from appwrite_lab._orchestrator import get_template_versions
+
     versions = get_template_versions()
     print_table([versions], ["Version"])
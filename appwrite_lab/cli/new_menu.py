@@ -13,7 +13,9 @@ def new_lab(
         "1.7.4", help="The version of the lab to create.", show_envvar=False
     ),
     port: int = typer.Option(
-        80, help="The port to use for the Appwrite service.", show_envvar=False
+        None,
+        help="The port to use for the Appwrite service. Unset for auto-assigned.",
+        show_envvar=False,
     ),
     email: str = typer.Option(
         None,
@@ -41,6 +43,22 @@ def new_lab(
         help="Just deploy the lab without creating an API key or project.",
         show_envvar=False,
     ),
+    from_golden: bool = typer.Option(
+        False,
+        is_flag=True,
+        help="Start from the golden image of the version instead of bootstrapping.",
+        show_envvar=False,
+    ),
+    count: int = typer.Option(
+        1,
+        help="The number of labs to create. Labs are named '<name>-1', '<name>-2', ...",
+        show_envvar=False,
+    ),
+    max_parallel: int = typer.Option(
+        4,
+        help="The maximum number of labs to create at once when --count is set.",
+        show_envvar=False,
+    ),
 ):
     """
     Create a new lab.
@@ -49,33 +67,80 @@ def new_lab(
         name: The name of the lab to create.
         version: The version of the lab to create.
         port: The port to use for the Appwrite service. Must not be in use by another service.
+            Unset for auto-assigned.
         email: The email to use for the admin account. Unset for random.
         password: The password to use for the admin account. Unset for random.
         project_id: The project ID to use for the lab. Unset for random.
         project_name: The name of the project to use for the lab. Unset for random.
+        from_golden: Start from the golden image of the version.
+        count: The number of labs to create.
+        max_parallel: The maximum number of labs to create at once.
     """
     labs = get_global_labs()
     extra_str = " with simple deployment" if just_deploy else ""
+    creds = AppwriteLabCreation(
+        admin_email=email,
+        admin_password=password,
+        project_id=project_id,
+        project_name=project_name,
+    )
+    if count > 1:
+        if port:
+            console.print("--port cannot be used with --count.", style="red")
+            raise typer.Exit(code=1)
+        specs = [
+            {
+                "name": f"{name}-{i}",
+                "version": version,
+                "auth": creds,
+                "just_deploy": just_deploy,
+                "from_golden": from_golden,
+            }
+            for i in range(1, count + 1)
+        ]
+        with console.status(
+            f"Creating {count} labs{extra_str}...", spinner="dots"
+        ) as status:
+            done = 0
+            for _, _res in labs.new_many(specs, max_parallel=max_parallel):
+                done += 1
+                status.update(f"Creating {count} labs{extra_str}... {done}/{count}")
+        return
+
     with console.status(
         f"Creating lab '{name}'{extra_str}...", spinner="dots"
     ) as status:
-        creds = AppwriteLabCreation(
-            admin_email=email,
-            admin_password=password,
-            project_id=project_id,
-            project_name=project_name,
-        )
-
         labs.new(
             name=name,
             version=version,
             port=port,
             auth=creds,
             just_deploy=just_deploy,
+            from_golden=from_golden,
         )
         status.update(f"Creating lab '{name}'... done")
 
 
+@new_menu.command(name="golden", help="Bake the golden image of a version")
+def new_golden(
+    version: str = typer.Option(
+        "1.7.4", help="The version to bake the golden image for.", show_envvar=False
+    ),
+):
+    """
+    Bake the golden image of a version.
+
+    Args:
+        version: The version to bake the golden image for.
+    """
+    labs = get_global_labs()
+    with console.status(
+        f"Baking golden image for version {version}...", spinner="dots"
+    ) as status:
+        labs.bake_golden(version)
+        status.update(f"Baking golden image for version {version}... done")
+
+
 @new_menu.command(name="api-key", help="Create a new API key")
 def new_api_key(
     lab_name: str = typer.Argument(
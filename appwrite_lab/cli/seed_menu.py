@@ -0,0 +1,57 @@
+import typer
+from appwrite_lab.utils import console
+from appwrite_lab import get_global_labs
+
+
+def seed(
+    name: str = typer.Argument(..., help="The name of the lab to seed."),
+    source: str = typer.Argument(..., help="The seed source directory."),
+    project: str = typer.Option("default", help="The name of the project to seed."),
+    batch_size: int = typer.Option(
+        100, help="The number of documents written per request."
+    ),
+    max_parallel: int = typer.Option(
+        16, help="The maximum number of requests in flight."
+    ),
+):
+    """
+    Seed a project of a lab with documents, users and files.
+
+    Args:
+        name: The name of the lab to seed.
+        source: The seed source directory.
+        project: The name of the project to seed.
+        batch_size: The number of documents written per request.
+        max_parallel: The maximum number of requests in flight.
+    """
+    labs = get_global_labs()
+    with console.status(f"Seeding lab '{name}'...", spinner="dots"):
+        labs.seed(
+            name=name,
+            project=project,
+            source=source,
+            batch_size=batch_size,
+            max_parallel=max_parallel,
+        )
+
+
+def export(
+    name: str = typer.Argument(..., help="The name of the lab to export."),
+    dest: str = typer.Argument(..., help="The directory to export to."),
+    project: str = typer.Option("default", help="The name of the project to export."),
+    max_parallel: int = typer.Option(
+        16, help="The maximum number of requests in flight."
+    ),
+):
+    """
+    Export the documents, users and files of a lab project, as a seed source.
+
+    Args:
+        name: The name of the lab to export.
+        dest: The directory to export to.
+        project: The name of the project to export.
+        max_parallel: The maximum number of requests in flight.
+    """
+    labs = get_global_labs()
+    with console.status(f"Exporting lab '{name}'...", spinner="dots"):
+        labs.export(name=name, project=project, dest=dest, max_parallel=max_parallel)
@@ -0,0 +1,37 @@
+import typer
+from appwrite_lab.utils import console
+from appwrite_lab import get_global_labs
+
+
+def snapshot(
+    name: str = typer.Argument(..., help="The name of the lab to snapshot."),
+    tag: str = typer.Argument(..., help="The tag to store the snapshot under."),
+):
+    """
+    Snapshot the data of a lab.
+
+    Args:
+        name: The name of the lab to snapshot.
+        tag: The tag to store the snapshot under.
+    """
+    labs = get_global_labs()
+    with console.status(f"Snapshotting lab '{name}'...", spinner="dots") as status:
+        labs.snapshot(name=name, tag=tag)
+        status.update(f"Snapshotting lab '{name}'... done")
+
+
+def restore(
+    name: str = typer.Argument(..., help="The name of the lab to restore."),
+    tag: str = typer.Argument(..., help="The tag of the snapshot to restore."),
+):
+    """
+    Restore a lab to a snapshot.
+
+    Args:
+        name: The name of the lab to restore.
+        tag: The tag of the snapshot to restore.
+    """
+    labs = get_global_labs()
+    with console.status(f"Restoring lab '{name}'...", spinner="dots") as status:
+        labs.restore(name=name, tag=tag)
+        status.update(f"Restoring lab '{name}'... done")
@@ -18,6 +18,13 @@ def sync_lab(
     expiration: Expiration = typer.Option(
         Expiration.THIRTY_DAYS, help="The expiration of the API key."
     ),
+    max_parallel: int = typer.Option(
+        8, help="The maximum number of requests in flight while pushing."
+    ),
+    allow_recreate: bool = typer.Option(
+        False,
+        help="Recreate attributes whose type changed, dropping their data.",
+    ),
 ):
     """
     Sync a resource to the lab.
@@ -26,6 +33,8 @@ def sync_lab(
         name: The name of the lab to sync.
         appwrite_json: The path to the appwrite JSON if not in current dir.
         resource: The resource to sync.
+        max_parallel: The maximum number of requests in flight while pushing.
+        allow_recreate: Recreate attributes whose type changed, dropping their data.
     """
     labs = get_global_labs()
     with console.status(f"Syncing lab '{name}'...", spinner="dots"):
@@ -34,4 +43,6 @@ def sync_lab(
             appwrite_json=appwrite_json,
             sync_type=resource,
             expiration=expiration,
+            max_parallel=max_parallel,
+            allow_recreate=allow_recreate,
         )
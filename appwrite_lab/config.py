@@ -1,3 +1,49 @@
+import os
+
 PLAYWRIGHT_IMAGE = "mcr.microsoft.com/playwright/python:v1.52.0-jammy"
 APPWRITE_CLI_IMAGE = "docker.io/syntaxsdev/appwrite-cli:latest"
 APPWRITE_PLAYWRIGHT_IMAGE = "docker.io/syntaxsdev/appwrite-playwright:latest"
+SNAPSHOT_IMAGE = "docker.io/library/busybox:1.36"
+
+# Where automation containers mount the cached console and CLI sessions
+SESSIONS_MOUNT = "/work/sessions"
+
+# Seconds a freshly deployed lab has to pass its readiness checks
+READINESS_TIMEOUT = 300
+
+# Engine used for automations: `auto` (HTTP, falling back to Playwright), `http` or `playwright`
+AUTOMATION_ENGINE = os.getenv("APPWRITE_LAB_AUTOMATION_ENGINE", "auto")
+
+# Engine used to push appwrite.json resources: `native` (server API from Python) or `cli`
+PUSH_ENGINE = os.getenv("APPWRITE_LAB_PUSH_ENGINE", "native")
+
+# Run Playwright automations on a long-lived worker container instead of one container each
+AUTOMATION_WORKER = os.getenv("APPWRITE_LAB_AUTOMATION_WORKER", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Write per-phase timing spans to this file: `.jsonl` for JSON lines, otherwise Chrome trace events
+TRACE_FILE = os.getenv("APPWRITE_LAB_TRACE")
+
+# Query containers through the Engine API socket instead of the CLI, when the socket is available
+ENGINE_API = os.getenv("APPWRITE_LAB_ENGINE_API", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Answer container status questions from an inventory kept current by engine events
+CONTAINER_CACHE = os.getenv("APPWRITE_LAB_CONTAINER_CACHE", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Cache the discovered backend and binaries in the state directory, instead of probing each run
+DISCOVERY_CACHE = os.getenv("APPWRITE_LAB_DISCOVERY_CACHE", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
@@ -1,7 +1,14 @@
 from appwrite_lab.utils import load_config
 from ._state import State
-from ._orchestrator import ServiceOrchestrator, Response
-from .models import Automation, Lab
+from ._orchestrator import ServiceOrchestrator, Response, get_lab_status
+from ._push import NATIVE_SYNC_TYPES, SchemaPusher, SchemaPushError
+from ._export import Exporter
+from ._seed import Seeder
+from .automations.automations import LabContext, LabRequestError
+from ._sync import RESOURCE_KEYS, fingerprint_config, changed_resources, filter_config
+from ._trace import annotate, span, traced
+from .config import PUSH_ENGINE
+from .models import Automation, AutomationStep, Lab, SyncType
 from appwrite_lab.automations.models import (
     AppwriteLabCreation,
     AppwriteProjectCreation,
@@ -11,9 +18,16 @@ from appwrite_lab.automations.models import (
 )
 from .models import Project
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from dataclasses import asdict
 from pathlib import Path
+from typing import Iterator
 
+import json
 import os
+import tempfile
+import time
 
 
 class Labs:
@@ -25,9 +39,10 @@ class Labs:
         self,
         name: str,
         version: str,
-        port: int,
+        port: int | None = None,
         auth: AppwriteLabCreation | None = None,
         just_deploy: bool = False,
+        from_golden: bool = False,
     ):
         """
         Deploy a new Appwrite lab.
@@ -35,14 +50,62 @@ class Labs:
         Args:
             name: The name of the lab.
             version: The version of the lab.
-            port: The port of the lab.
+            port: The port of the lab. Unset for an auto-assigned port.
             auth: The authentication credentials.
             just_deploy: Deploy the lab without creating an API key or project.
+            from_golden: Start from the golden image of the version (see `bake_golden`).
         """
         return self.orchestrator.deploy_appwrite_lab(
-            name, version, port, auth, just_deploy=just_deploy
+            name,
+            version,
+            port,
+            auth,
+            just_deploy=just_deploy,
+            from_golden=from_golden,
         )
 
+    def bake_golden(self, version: str):
+        """
+        Bake the golden image of an Appwrite version.
+
+        Labs created with `from_golden=True` start from it, skipping the
+        Playwright bootstrap.
+
+        Args:
+            version: The Appwrite version to bake.
+        """
+        return self.orchestrator.bake_golden_lab(version)
+
+    def new_many(
+        self,
+        specs: list[dict],
+        max_parallel: int = 4,
+    ) -> Iterator[tuple[str, Response]]:
+        """
+        Deploy many Appwrite labs concurrently.
+
+        Every lab goes through the same steps as `new` (compose up and
+        credential bootstrap), with at most `max_parallel` labs in flight.
+        Results are yielded as each lab finishes, in completion order.
+
+        Args:
+            specs: The keyword arguments of `new` for each lab.
+            max_parallel: The maximum number of labs to deploy at once.
+
+        Yields:
+            The name of the lab and the response of its deployment.
+        """
+        with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+            futures = {pool.submit(self.new, **spec): spec["name"] for spec in specs}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    yield name, future.result()
+                except Exception as e:
+                    yield name, Response(
+                        error=True, message=f"Failed to deploy lab '{name}': {e}"
+                    )
+
     def get_lab(self, name: str) -> Lab | None:
         """
         Get a lab by name.
@@ -52,13 +115,46 @@ class Labs:
         """
         return self.orchestrator.get_lab(name)
 
+    def status(self, name: str) -> str:
+        """
+        Sum up the health of the containers of a lab, e.g. `healthy` or `stopped`.
+
+        Args:
+            name: The name of the lab.
+        """
+        return get_lab_status(self.orchestrator.get_pods_by_project(name))
+
+    @traced
     def sync_with_appwrite_config(
         self,
         name: str,
         appwrite_json: str,
         sync_type: str = "all",
         expiration: Expiration = Expiration.THIRTY_DAYS,
+        max_parallel: int = 8,
+        allow_recreate: bool = False,
     ):
+        """
+        Sync a lab with an appwrite.json config.
+
+        Every resource of the config is fingerprinted, and only the resources
+        that changed since the last sync of the project are pushed. The
+        fingerprints are kept with the project in the lab state.
+
+        Resource types are pushed concurrently; only real dependencies, such
+        as collections before the relationships between them, are ordered.
+        The response data holds the seconds each resource took.
+
+        Args:
+            name: The name of the lab.
+            appwrite_json: The path to the appwrite.json config.
+            sync_type: The resources to sync, or `all`.
+            expiration: The expiration of the API key created on the first sync.
+            max_parallel: The maximum number of requests in flight while pushing.
+            allow_recreate: Recreate attributes whose type or another immutable
+                property changed, which drops their data. Otherwise the sync
+                fails listing them.
+        """
         lab = self.orchestrator.get_lab(name)
         if not lab:
             return Response(
@@ -89,32 +185,186 @@ class Labs:
                 message=f"Failed to load appwrite config: {e}",
             )
 
-        apc = AppwriteProjectCreation(
-            project_name=proj_name,
-            project_id=proj_id,
-        )
-        addn_args = ["-v", f"{appwrite_json}:/work/appwrite.json"]
-        self.orchestrator.deploy_playwright_automation(
-            lab=lab, automation=Automation.CREATE_PROJECT, model=apc, args=addn_args
-        )
-        self.orchestrator.deploy_playwright_automation(
-            lab=lab,
-            automation=Automation.SYNC_PROJECT,
-            model=AppwriteSyncProject(sync_type),
-            args=addn_args,
-        )
-        key_name = f"{proj_name}-key"
-        key = self.create_api_key(
-            lab=lab, expiration=expiration, project_name=proj_name, key_name=key_name
+        annotate(lab=name, project=proj_name, sync_type=str(sync_type))
+        project = lab.projects.get(proj_name)
+        sync_types = list(RESOURCE_KEYS) if sync_type == SyncType.ALL else [sync_type]
+        with span("fingerprint") as attrs:
+            fingerprints = {
+                resource: digests
+                for resource, digests in fingerprint_config(
+                    ajson, Path(appwrite_json).parent
+                ).items()
+                if resource in sync_types
+            }
+            changes = changed_resources(
+                project.fingerprints if project else {}, fingerprints
+            )
+            attrs["changed"] = {resource: len(ids) for resource, ids in changes.items()}
+        if project and project.api_key and not changes:
+            return Response(message=f"Lab {name} is already in sync with {proj_name}.")
+
+        # Schema resources are pushed natively once the project and its key exist
+        native = {
+            resource: ids
+            for resource, ids in changes.items()
+            if PUSH_ENGINE == "native" and resource in NATIVE_SYNC_TYPES
+        }
+        cli = {
+            resource: ids for resource, ids in changes.items() if resource not in native
+        }
+
+        # The project and its key come first, since every push needs them
+        bootstrap = []
+        if not project:
+            apc = AppwriteProjectCreation(project_name=proj_name, project_id=proj_id)
+            bootstrap.append(
+                AutomationStep(Automation.CREATE_PROJECT, apc, required=False)
+            )
+            project = Project(project_id=proj_id, project_name=proj_name)
+        if not project.api_key:
+            api_key = AppwriteAPIKeyCreation(
+                project_name=proj_name,
+                key_name=f"{proj_name}-key",
+                key_expiry=str(expiration.value),
+            )
+            bootstrap.append(AutomationStep(Automation.CREATE_API_KEY, api_key))
+        if bootstrap:
+            res = self.orchestrator.run_automation_plan(lab=lab, steps=bootstrap)
+            if res.error:
+                return Response(
+                    error=True,
+                    message=f"Failed to sync lab {name}: {res.data}",
+                )
+            if not project.api_key:
+                project.api_key = res.data[-1]
+        # Resources without changes are already in sync
+        unchanged = [resource for resource in fingerprints if resource not in changes]
+        self._save_fingerprints(lab, project, fingerprints, unchanged)
+
+        # The CLI and native pushes touch different resources, so they run side by side
+        pushes = []
+        if cli:
+            pushes.append((cli, self._push_with_cli, lab, ajson, cli))
+        if native:
+            pushes.append(
+                (
+                    native,
+                    self._push_natively,
+                    lab,
+                    project,
+                    ajson,
+                    native,
+                    max_parallel,
+                    allow_recreate,
+                )
+            )
+        timings, errors, synced = {}, [], []
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = {
+                # Copy the context so the pushes nest under this sync's span
+                pool.submit(copy_context().run, fn, *args): resources
+                for resources, fn, *args in pushes
+            }
+            for future in as_completed(futures):
+                try:
+                    timings.update(future.result())
+                    synced.extend(futures[future])
+                except SchemaPushError as e:
+                    errors.append(str(e))
+        self._save_fingerprints(lab, project, fingerprints, synced)
+        if errors:
+            return Response(
+                error=True,
+                message=f"Failed to sync lab {name}: {'; '.join(errors)}",
+                data={"timings": timings},
+            )
+
+        summary = ", ".join(
+            f"{len(ids)} {resource}" for resource, ids in changes.items()
         )
-        lab.projects[proj_name] = Project(
-            project_id=proj_id,
-            project_name=proj_name,
-            api_key=key.data,
+        return Response(
+            message=f"Lab {name} synced with {proj_name} ({summary or 'no changes'}).",
+            data={"timings": timings},
         )
-        labs = self.state.get("labs")
-        labs[name] = lab.to_dict()
-        self.state.set("labs", labs)
+
+    @traced
+    def _push_with_cli(
+        self, lab: Lab, config: dict, changes: dict[str, list[str]]
+    ) -> dict[str, float]:
+        """
+        Push changed resources with the Appwrite CLI, in one automation plan.
+
+        Returns:
+            The seconds the plan took, under `cli`.
+
+        Raises:
+            SchemaPushError: If the push fails.
+        """
+        start = time.monotonic()
+        steps = [
+            AutomationStep(Automation.SYNC_PROJECT, AppwriteSyncProject(resource))
+            for resource in changes
+        ]
+        # Push a config holding only the changed resources
+        with tempfile.TemporaryDirectory() as temp_dir:
+            partial_json = Path(temp_dir) / "appwrite.json"
+            partial_json.write_text(json.dumps(filter_config(config, changes)))
+            res = self.orchestrator.run_automation_plan(
+                lab=lab, steps=steps, files={"appwrite.json": partial_json}
+            )
+        if res.error:
+            raise SchemaPushError(f"Appwrite CLI push failed: {res.data}")
+        return {"cli": round(time.monotonic() - start, 3)}
+
+    @traced
+    def _push_natively(
+        self,
+        lab: Lab,
+        project: Project,
+        config: dict,
+        changes: dict[str, list[str]],
+        max_parallel: int,
+        allow_recreate: bool = False,
+    ) -> dict[str, float]:
+        """
+        Push changed resources through the server API.
+
+        Returns:
+            The seconds each resource type and collection took.
+
+        Raises:
+            SchemaPushError: If the push fails, or attributes need a recreate
+                that is not allowed.
+        """
+        with SchemaPusher(
+            lab.url,
+            project.project_id,
+            project.api_key,
+            max_parallel=max_parallel,
+            allow_recreate=allow_recreate,
+        ) as pusher:
+            report = pusher.push(filter_config(config, changes), resources=changes)
+        if report.recreate_skipped:
+            raise SchemaPushError(
+                "Recreating these attributes would drop their data, sync with "
+                f"allow_recreate to recreate them: {', '.join(report.recreate_skipped)}"
+            )
+        return report.timings
+
+    def _save_fingerprints(
+        self,
+        lab: Lab,
+        project: Project,
+        fingerprints: dict[str, dict[str, str]],
+        resources: list[str],
+    ):
+        """Record the fingerprints of synced resource types in the lab state."""
+        project.fingerprints = {
+            **project.fingerprints,
+            **{resource: fingerprints[resource] for resource in resources},
+        }
+        lab.projects[project.project_name] = project
+        self.state.set_item("labs", lab.name, lab.to_dict())
 
     def create_api_key(
         self,
@@ -158,6 +408,135 @@ class Labs:
     def stop(self, name: str):
         return self.orchestrator.teardown_service(name)
 
+    def snapshot(self, name: str, tag: str) -> Response:
+        """
+        Snapshot the data of a lab so it can be restored later.
+
+        Args:
+            name: The name of the lab.
+            tag: The tag to store the snapshot under.
+        """
+        return self.orchestrator.snapshot_lab(name, tag)
+
+    def restore(self, name: str, tag: str) -> Response:
+        """
+        Roll a lab back to a snapshot taken with `snapshot`.
+
+        Args:
+            name: The name of the lab.
+            tag: The tag of the snapshot.
+        """
+        return self.orchestrator.restore_lab(name, tag)
+
+    def seed(
+        self,
+        name: str,
+        project: str,
+        source: str | Path,
+        batch_size: int = 100,
+        max_parallel: int = 16,
+    ) -> Response:
+        """
+        Seed a project of a lab with fixture data.
+
+        Documents are streamed from JSON, NDJSON or CSV files into their
+        collections, users into Auth and files into their buckets (see
+        `Seeder` for the layout of the source directory). The collections and
+        buckets must already exist, e.g. from `sync_with_appwrite_config`.
+
+        Args:
+            name: The name of the lab.
+            project: The name of the project to seed.
+            source: The seed source directory.
+            batch_size: The number of documents written per request.
+            max_parallel: The maximum number of requests in flight.
+        """
+        lab = self.orchestrator.get_lab(name)
+        if not lab:
+            return Response(error=True, message=f"Lab {name} not found")
+        proj = lab.projects.get(project)
+        if not proj:
+            return Response(
+                error=True, message=f"Project {project} not found in lab {name}"
+            )
+        source = Path(source)
+        if not source.is_dir():
+            return Response(error=True, message=f"Seed source {source} not found.")
+
+        try:
+            with (
+                LabContext(lab, proj, max_parallel=max_parallel) as context,
+                Seeder(context, batch_size=batch_size) as seeder,
+            ):
+                report = seeder.seed(source)
+        except LabRequestError as e:
+            return Response(error=True, message=f"Failed to seed lab {name}: {e}")
+
+        documents = sum(report.documents.values())
+        summary = (
+            f"{documents} documents, {report.users} users, {report.files} files"
+            f" ({report.skipped} already existed)"
+        )
+        if report.errors:
+            return Response(
+                error=True,
+                message=f"Seeded lab {name} with {summary}, "
+                f"{len(report.errors)} failed: {report.errors[0]}",
+                data=asdict(report),
+            )
+        return Response(
+            message=f"Seeded lab {name} with {summary}.",
+            data=asdict(report),
+        )
+
+    def export(
+        self, name: str, project: str, dest: str | Path, max_parallel: int = 16
+    ) -> Response:
+        """
+        Export the data of a project of a lab to a directory.
+
+        Users, the documents of every collection and the files of every
+        bucket are streamed to disk, in the layout `seed` reads, so an export
+        can seed another lab (see `Exporter`).
+
+        Args:
+            name: The name of the lab.
+            project: The name of the project to export.
+            dest: The directory to write to.
+            max_parallel: The maximum number of requests in flight.
+        """
+        lab = self.orchestrator.get_lab(name)
+        if not lab:
+            return Response(error=True, message=f"Lab {name} not found")
+        proj = lab.projects.get(project)
+        if not proj:
+            return Response(
+                error=True, message=f"Project {project} not found in lab {name}"
+            )
+
+        try:
+            with (
+                LabContext(lab, proj, max_parallel=max_parallel) as context,
+                Exporter(context) as exporter,
+            ):
+                report = exporter.export(Path(dest))
+        except (LabRequestError, OSError) as e:
+            return Response(error=True, message=f"Failed to export lab {name}: {e}")
+
+        documents = sum(report.documents.values())
+        summary = f"{documents} documents, {report.users} users, {report.files} files"
+        if report.errors:
+            return Response(
+                error=True,
+                message=f"Exported {summary} of lab {name} to {dest}, "
+                f"{len(report.errors)} failed: {report.errors[0]}",
+                data=asdict(report),
+            )
+        return Response(
+            message=f"Exported {summary} of lab {name} to {dest}.",
+            data=asdict(report),
+        )
+
     def create_project(
         self,
         project_name: str,
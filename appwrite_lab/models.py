@@ -3,6 +3,8 @@ from enum import StrEnum
 import random
 import string
 
+from appwrite_lab.automations.models import BaseVarModel
+
 
 class Automation(StrEnum):
     CREATE_USER_AND_API_KEY = "create_user_and_api_key"
@@ -10,6 +12,7 @@ class Automation(StrEnum):
     SYNC_PROJECT = "sync_project"
     # CREATE_USER = "create_user"
     CREATE_PROJECT = "create_project"
+    RUN_PLAN = "run_plan"
     # CREATE_DATABASE = "create_database"
     # CREATE_COLLECTION = "create_collection"
     # CREATE_DOCUMENT = "create_document"
@@ -17,6 +20,21 @@ class Automation(StrEnum):
     # CREATE_ROLE = "create_role"
 
 
+class AutomationEngine(StrEnum):
+    AUTO = "auto"
+    HTTP = "http"
+    PLAYWRIGHT = "playwright"
+
+
+@dataclass
+class AutomationStep:
+    """One step of an automation plan (see `ServiceOrchestrator.run_automation_plan`)."""
+
+    automation: Automation
+    model: BaseVarModel | None = None
+    required: bool = True
+
+
 class SyncType(StrEnum):
     ALL = "all"
     CONFIG = "settings"
@@ -38,6 +56,8 @@ class Project(_BaseClass):
     project_id: str
     project_name: str
     api_key: str | None = None
+    # Fingerprints of the synced appwrite.json resources, by sync type then ID
+    fingerprints: dict[str, dict[str, str]] = field(default_factory=dict)
 
 
 @dataclass
@@ -53,6 +73,9 @@ class Lab(_BaseClass):
     _file: str = field(default="")
     sms_shim_url: str = field(default="")
     mailpit_url: str = field(default="")
+    network: str = field(default="")
+    ports: dict[str, int] = field(default_factory=dict)
+    readiness: dict[str, float] = field(default_factory=dict)
 
     def generate_missing_config(self):
         """Generate missing data config with random values."""
@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ._orchestrator import Response
+from .labs import Labs
+from .models import Lab
+
+
+class LabPoolError(Exception): ...
+
+
+class LabPool:
+    SNAPSHOT_TAG = "pool-clean"
+
+    def __init__(
+        self,
+        labs: Labs,
+        size: int = 2,
+        prefix: str = "pool",
+        version: str = "1.7.4",
+        max_parallel: int = 4,
+    ):
+        """
+        Pool of warm, credential-bootstrapped labs that can be leased.
+
+        Pool labs are named `<prefix>-1` .. `<prefix>-<size>` and are left
+        running when the pool is closed, so the next pool with the same prefix
+        reuses them instead of provisioning from scratch. A pool is meant to be
+        used by one process at a time.
+
+        Every pool lab is snapshotted once it is provisioned, and released labs
+        are restored to that snapshot instead of being redeployed.
+
+        Args:
+            labs: The labs service used to provision and reset labs.
+            size: The number of labs to keep in the pool.
+            prefix: The name prefix of the pool labs.
+            version: The Appwrite version of the pool labs.
+            max_parallel: The maximum number of labs provisioned or reset at once.
+        """
+        self.labs = labs
+        self.size = size
+        self.prefix = prefix
+        self.version = version
+        self.max_parallel = max_parallel
+        self._available: deque[str] = deque()
+        self._leased: set[str] = set()
+        # Labs that are available, leased or being reset, i.e. can be leased again
+        self._members: set[str] = set()
+        self._changed = threading.Condition()
+        # Labs that failed to reset and left the pool, with the reason
+        self.lost: dict[str, str] = {}
+        self._resets = ThreadPoolExecutor(max_workers=max_parallel)
+
+    @property
+    def names(self) -> list[str]:
+        """The names of all labs in the pool."""
+        return [f"{self.prefix}-{i}" for i in range(1, self.size + 1)]
+
+    def fill(self) -> list[Response]:
+        """
+        Provision the pool labs that do not exist yet; existing ones are reused.
+
+        Returns:
+            The responses of the labs that failed to provision.
+        """
+        missing = [name for name in self.names if not self.labs.get_lab(name)]
+        specs = [self._spec(name) for name in missing]
+        failed = []
+        for name, res in self.labs.new_many(specs, max_parallel=self.max_parallel):
+            if res.error:
+                failed.append(res)
+            else:
+                self.labs.snapshot(name, self.SNAPSHOT_TAG)
+        ready = [name for name in self.names if self.labs.get_lab(name)]
+        if not ready:
+            raise LabPoolError(
+                "No lab in the pool could be provisioned: "
+                + "; ".join(res.message for res in failed)
+            )
+        with self._changed:
+            # Labs already in the pool are not added twice
+            for name in ready:
+                if name not in self._members:
+                    self._members.add(name)
+                    self.lost.pop(name, None)
+                    self._available.append(name)
+            self._changed.notify_all()
+        return failed
+
+    def lease(self, timeout: float | None = None) -> Lab:
+        """
+        Lease a warm lab from the pool.
+
+        A lab whose containers are no longer healthy is not handed out but
+        redeployed in the background, and the next available lab is leased.
+
+        Args:
+            timeout: Seconds to wait for a lab to become available. Unset to wait
+                as long as a leased or resetting lab can still come back.
+
+        Raises:
+            LabPoolError: If no lab became available in time, or none can
+                anymore since every lab failed to reset.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            name = self._take(deadline, timeout)
+            try:
+                healthy = self.labs.status(name) == "healthy"
+            except Exception:
+                self._put_back(name)
+                raise
+            if healthy:
+                with self._changed:
+                    self._leased.add(name)
+                return self.labs.get_lab(name)
+            # Its containers died while it sat in the pool
+            self._resets.submit(self._replace, name)
+
+    def release(self, lab: Lab | str, reset: bool = True):
+        """
+        Return a leased lab to the pool.
+
+        Args:
+            lab: The leased lab, or its name.
+            reset: Reset the lab in the background before it can be leased again.
+        """
+        name = lab.name if isinstance(lab, Lab) else lab
+        with self._changed:
+            if name not in self._leased:
+                raise LabPoolError(f"Lab '{name}' is not leased from this pool.")
+            self._leased.discard(name)
+        if not reset:
+            self._put_back(name)
+            return
+        self._resets.submit(self._reset, name)
+
+    def close(self, wait: bool = True):
+        """
+        Stop accepting resets. The pool labs are left running.
+
+        Args:
+            wait: Wait for the resets in flight to finish.
+        """
+        self._resets.shutdown(wait=wait)
+
+    def _reset(self, name: str):
+        """Bring a released lab back to a clean state and return it to the pool."""
+        try:
+            if not self.labs.restore(name, self.SNAPSHOT_TAG).error:
+                self._put_back(name)
+                return
+        except Exception as e:
+            return self._drop(name, str(e))
+        # No usable snapshot, redeploy from scratch
+        self._replace(name)
+
+    def _replace(self, name: str):
+        """Redeploy a lab from scratch, snapshot it and return it to the pool."""
+        try:
+            self.labs.stop(name)
+            res = self.labs.new(**self._spec(name))
+            if res.error:
+                return self._drop(name, res.message)
+            self.labs.snapshot(name, self.SNAPSHOT_TAG)
+            self._put_back(name)
+        except Exception as e:
+            self._drop(name, str(e))
+
+    def _take(self, deadline: float | None, timeout: float | None) -> str:
+        """Wait until a lab is available and take it out of the pool."""
+        with self._changed:
+            while not self._available:
+                if not self._members:
+                    raise LabPoolError(
+                        "No lab in the pool can become available: "
+                        + "; ".join(f"{n}: {e}" for n, e in self.lost.items())
+                    )
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise LabPoolError(
+                        f"No lab became available within {timeout} seconds."
+                    )
+                self._changed.wait(remaining)
+            return self._available.popleft()
+
+    def _put_back(self, name: str):
+        with self._changed:
+            self._available.append(name)
+            self._changed.notify()
+
+    def _drop(self, name: str, reason: str):
+        """Take a lab that could not be reset out of the pool."""
+        with self._changed:
+            self._members.discard(name)
+            self.lost[name] = f"Failed to reset lab '{name}': {reason}"
+            # Waiters may have nothing left to wait for
+            self._changed.notify_all()
+
+    def _spec(self, name: str) -> dict:
+        return {"name": name, "version": self.version}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,3 +1,23 @@
-from .fixtures import lab_svc, appwrite_file_path, appwrite_file, lab_config, lab
+from .fixtures import (
+    lab_svc,
+    appwrite_file_path,
+    appwrite_file,
+    lab_config,
+    lab,
+    lab_pool_config,
+    lab_pool,
+    lab_lease_timeout,
+    leased_lab,
+)
 
-__all__ = ("lab_svc", "appwrite_file_path", "appwrite_file", "lab_config", "lab")
+__all__ = (
+    "lab_svc",
+    "appwrite_file_path",
+    "appwrite_file",
+    "lab_config",
+    "lab",
+    "lab_pool_config",
+    "lab_pool",
+    "lab_lease_timeout",
+    "leased_lab",
+)
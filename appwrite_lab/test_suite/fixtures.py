@@ -2,8 +2,8 @@ from pathlib import Path
 
 from appwrite_lab.labs import Labs
 from appwrite_lab.models import Lab
+from appwrite_lab.pool import LabPool
 
-import hashlib
 import pytest
 
 
@@ -44,27 +44,18 @@ def lab_config():
 def lab(lab_svc: Labs, appwrite_file: Path, lab_config: dict) -> Lab:
     """Create or get existing lab with optional appwrite.json sync."""
     lab_name = lab_config["name"]
-    hash_file_path = Path.home() / ".config" / "appwrite-lab" / "json_hashes"
-    hash_file_path.touch()
 
-    if lab := lab_svc.get_lab(lab_name):
-        # Check if the file has changed before unnecessary sync
+    if lab_svc.get_lab(lab_name):
+        # Only the resources that changed since the last sync are pushed
         if appwrite_file and appwrite_file.exists():
-            hash = hash_file(appwrite_file)
-            data = hash_file_path.read_text()
-            if len(data) > 0 and data.strip() == hash:
-                print("Skipping sync because the file has not changed")
-            else:
-                lab_svc.sync_with_appwrite_config(
-                    name=lab_name, appwrite_json=appwrite_file
-                )
-                hash_file_path.write_text(hash)
-        return lab
+            lab_svc.sync_with_appwrite_config(
+                name=lab_name, appwrite_json=appwrite_file
+            )
+        return lab_svc.get_lab(lab_name)
 
     res = lab_svc.new(**lab_config)
 
     if appwrite_file and appwrite_file.exists():
-        hash_file_path.write_text(hash_file(appwrite_file))
         lab_svc.sync_with_appwrite_config(name=lab_name, appwrite_json=appwrite_file)
 
     if not res.error:
@@ -72,9 +63,31 @@ def lab(lab_svc: Labs, appwrite_file: Path, lab_config: dict) -> Lab:
     raise ValueError(res.message)
 
 
-def hash_file(path, algo="sha256"):
-    h = hashlib.new(algo)
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+@pytest.fixture(scope="session")
+def lab_pool_config():
+    """Default lab pool configuration. Override in your test files."""
+    return {"size": 2, "prefix": "test-pool", "version": "1.7.4"}
+
+
+@pytest.fixture(scope="session")
+def lab_pool(lab_svc: Labs, lab_pool_config: dict):
+    """Pool of warm labs. The labs are kept running for the next session."""
+    pool = LabPool(lab_svc, **lab_pool_config)
+    pool.fill()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def lab_lease_timeout() -> float:
+    """Seconds a test waits to lease a pool lab. Override in your test files."""
+    # Long enough for a lab to be redeployed when its snapshot cannot be restored
+    return 900
+
+
+@pytest.fixture
+def leased_lab(lab_pool: LabPool, lab_lease_timeout: float) -> Lab:
+    """A warm lab leased for a single test and reset in the background after it."""
+    lab = lab_pool.lease(timeout=lab_lease_timeout)
+    yield lab
+    lab_pool.release(lab)
@@ -0,0 +1,328 @@
+import asyncio
+import json
+import random
+import secrets
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+
+import httpx
+
+from appwrite_lab._readiness import wait_until_ready
+from appwrite_lab.automations.automations import LabContext, LabRequestError
+from appwrite_lab.models import Lab
+
+# Request mixes `Bench` can drive
+SCENARIOS = (
+    "documents.list",
+    "documents.create",
+    "account.session",
+    "storage.upload",
+    "storage.download",
+    "functions.execute",
+)
+
+DEFAULT_MIX = {"documents.list": 4, "documents.create": 1, "storage.download": 1}
+
+# Prefix of the IDs of the scratch resources the benchmark creates and removes
+BENCH_ID_PREFIX = "awlab-bench"
+
+
+@dataclass
+class ScenarioStats:
+    requests: int = 0
+    errors: int = 0
+    statuses: dict[str, int] = field(default_factory=dict)
+    latencies: list[float] = field(default_factory=list)
+
+    def summary(self, elapsed: float) -> dict:
+        """Sum up the requests, throughput and latency percentiles in milliseconds."""
+        latencies = sorted(self.latencies)
+        if len(latencies) > 1:
+            q = statistics.quantiles(latencies, n=100, method="inclusive")
+            p50, p95, p99 = q[49], q[94], q[98]
+        else:
+            p50 = p95 = p99 = latencies[0] if latencies else 0.0
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "statuses": dict(sorted(self.statuses.items())),
+            "throughput_rps": round(self.requests / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(p50, 2),
+                "p95": round(p95, 2),
+                "p99": round(p99, 2),
+                "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+        }
+
+
+@dataclass
+class BenchReport:
+    lab: str
+    version: str
+    url: str
+    mix: dict[str, float]
+    concurrency: int
+    duration_s: float
+    requests: int
+    errors: int
+    throughput_rps: float
+    scenarios: dict[str, dict]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2)
+
+
+class Bench:
+    def __init__(
+        self,
+        lab: Lab,
+        project: str = "default",
+        mix: dict[str, float] | None = None,
+        concurrency: int = 16,
+        function_id: str | None = None,
+        payload_size: int = 1024,
+        seed: int | None = None,
+    ):
+        """
+        Drive a weighted mix of requests against a lab and measure them.
+
+        `setup` creates a scratch database, collection, bucket, file and user
+        for the mix to hit, and `teardown` removes them. Function executions
+        need an already deployed function.
+
+        Account sessions are rate limited by Appwrite unless
+        `_APP_OPTIONS_ABUSE` is disabled, which shows as 429 statuses.
+
+        Args:
+            lab: The lab to benchmark.
+            project: The name of the project, which must have an API key.
+            mix: The relative weight of each scenario, among `SCENARIOS`.
+            concurrency: The number of requests in flight.
+            function_id: The function `functions.execute` runs.
+            payload_size: The size in bytes of uploaded files and documents.
+            seed: Seed of the scenario picks, for repeatable runs.
+        """
+        self.mix = mix or DEFAULT_MIX
+        if unknown := set(self.mix) - set(SCENARIOS):
+            raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        if "functions.execute" in self.mix and not function_id:
+            raise ValueError("functions.execute needs a function_id.")
+        self.lab = lab
+        self.project = lab.projects[project]
+        self.concurrency = concurrency
+        self.function_id = function_id
+        self.payload = secrets.token_hex(payload_size // 2 or 1)
+        self.random = random.Random(seed)
+        # Unique per run, so leftovers of an interrupted run never collide
+        self.scratch_id = f"{BENCH_ID_PREFIX}-{secrets.token_hex(4)}"
+        self.email = f"bench-{secrets.token_hex(4)}@loadtest.local"
+        self.password = secrets.token_urlsafe(12)
+        self.user_id: str | None = None
+        self.file_id: str | None = None
+
+    def setup(self):
+        """Create the scratch resources the mix needs."""
+        scratch_id = self.scratch_id
+        with LabContext(self.lab, self.project) as context:
+            collection = f"/databases/{scratch_id}/collections/{scratch_id}"
+            if {"documents.list", "documents.create"} & set(self.mix):
+                context.request(
+                    "POST",
+                    "/databases",
+                    json={"databaseId": scratch_id, "name": scratch_id},
+                )
+                context.request(
+                    "POST",
+                    f"/databases/{scratch_id}/collections",
+                    json={"collectionId": scratch_id, "name": scratch_id},
+                )
+                context.request(
+                    "POST",
+                    f"{collection}/attributes/string",
+                    json={"key": "value", "size": len(self.payload), "required": False},
+                )
+                wait_until_ready(
+                    {
+                        "value": lambda: context.request(
+                            "GET", f"{collection}/attributes/value"
+                        )["status"]
+                        == "available"
+                    },
+                    timeout=60,
+                )
+            if {"storage.upload", "storage.download"} & set(self.mix):
+                context.request(
+                    "POST",
+                    "/storage/buckets",
+                    json={"bucketId": scratch_id, "name": scratch_id},
+                )
+                self.file_id = context.request(
+                    "POST",
+                    f"/storage/buckets/{scratch_id}/files",
+                    data={"fileId": "unique()"},
+                    files={"file": ("bench.txt", self.payload.encode())},
+                )["$id"]
+            if "account.session" in self.mix:
+                self.user_id = context.request(
+                    "POST",
+                    "/users",
+                    json={
+                        "userId": "unique()",
+                        "email": self.email,
+                        "password": self.password,
+                    },
+                )["$id"]
+
+    def teardown(self):
+        """Remove the scratch resources, ignoring the ones that do not exist."""
+        paths = [f"/databases/{self.scratch_id}", f"/storage/buckets/{self.scratch_id}"]
+        if self.user_id:
+            paths.append(f"/users/{self.user_id}")
+        with LabContext(self.lab, self.project, retries=1) as context:
+            for path in paths:
+                try:
+                    context.request("DELETE", path)
+                except LabRequestError:
+                    pass
+
+    async def run(
+        self, duration: float = 10.0, requests: int | None = None
+    ) -> BenchReport:
+        """
+        Run the mix until the duration is up or the number of requests is reached.
+
+        Args:
+            duration: The seconds to run for.
+            requests: Stop after this many requests instead, if set.
+
+        Returns:
+            The throughput and latency percentiles, overall and per scenario.
+        """
+        stats = {scenario: ScenarioStats() for scenario in self.mix}
+        scenarios, weights = list(self.mix), list(self.mix.values())
+        remaining = requests
+        start = time.perf_counter()
+        deadline = start + duration
+
+        def more() -> bool:
+            nonlocal remaining
+            if requests is None:
+                return time.perf_counter() < deadline
+            remaining -= 1
+            return remaining >= 0
+
+        async def worker(client: httpx.AsyncClient):
+            while more():
+                scenario = self.random.choices(scenarios, weights)[0]
+                sent = time.perf_counter()
+                try:
+                    response = await self._send(client, scenario)
+                    status = str(response.status_code)
+                    error = response.is_error
+                except httpx.HTTPError as e:
+                    status, error = type(e).__name__, True
+                latency = (time.perf_counter() - sent) * 1000
+                scenario_stats = stats[scenario]
+                scenario_stats.requests += 1
+                scenario_stats.errors += error
+                scenario_stats.statuses[status] = (
+                    scenario_stats.statuses.get(status, 0) + 1
+                )
+                scenario_stats.latencies.append(latency)
+
+        async with httpx.AsyncClient(
+            base_url=f"{self.lab.url}/v1",
+            headers={"X-Appwrite-Project": self.project.project_id},
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+            timeout=30,
+        ) as client:
+            await asyncio.gather(*(worker(client) for _ in range(self.concurrency)))
+        elapsed = time.perf_counter() - start
+
+        total = sum(s.requests for s in stats.values())
+        return BenchReport(
+            lab=self.lab.name,
+            version=self.lab.version,
+            url=self.lab.url,
+            mix=self.mix,
+            concurrency=self.concurrency,
+            duration_s=round(elapsed, 3),
+            requests=total,
+            errors=sum(s.errors for s in stats.values()),
+            throughput_rps=round(total / elapsed, 2) if elapsed else 0.0,
+            scenarios={
+                scenario: scenario_stats.summary(elapsed)
+                for scenario, scenario_stats in stats.items()
+            },
+        )
+
+    def _send(self, client: httpx.AsyncClient, scenario: str):
+        """Start the request of a scenario."""
+        key = {"X-Appwrite-Key": self.project.api_key}
+        documents = (
+            f"/databases/{self.scratch_id}/collections/{self.scratch_id}/documents"
+        )
+        files = f"/storage/buckets/{self.scratch_id}/files"
+        match scenario:
+            case "documents.list":
+                return client.get(documents, headers=key)
+            case "documents.create":
+                return client.post(
+                    documents,
+                    headers=key,
+                    json={"documentId": "unique()", "data": {"value": self.payload}},
+                )
+            case "account.session":
+                return client.post(
+                    "/account/sessions/email",
+                    json={"email": self.email, "password": self.password},
+                )
+            case "storage.upload":
+                return client.post(
+                    files,
+                    headers=key,
+                    data={"fileId": "unique()"},
+                    files={"file": ("bench.txt", self.payload.encode())},
+                )
+            case "storage.download":
+                return client.get(f"{files}/{self.file_id}/download", headers=key)
+            case "functions.execute":
+                return client.post(
+                    f"/functions/{self.function_id}/executions",
+                    headers=key,
+                    json={"async": False},
+                )
+
+
+def run_bench(
+    lab: Lab,
+    mix: dict[str, float] | None = None,
+    duration: float = 10.0,
+    requests: int | None = None,
+    **kwargs,
+) -> BenchReport:
+    """
+    Benchmark a lab: set up scratch resources, run the mix, then clean up.
+
+    Args:
+        lab: The lab to benchmark.
+        mix: The relative weight of each scenario, among `SCENARIOS`.
+        duration: The seconds to run for.
+        requests: Stop after this many requests instead, if set.
+        **kwargs: Passed on to `Bench`.
+
+    Returns:
+        The throughput and latency percentiles, overall and per scenario.
+    """
+    bench = Bench(lab, mix=mix, **kwargs)
+    try:
+        bench.setup()
+        return asyncio.run(bench.run(duration=duration, requests=requests))
+    finally:
+        bench.teardown()
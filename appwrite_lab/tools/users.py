@@ -0,0 +1,189 @@
+import json
+import secrets
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import IO, Iterable, Iterator, NamedTuple, Sequence
+
+from appwrite_lab.automations.automations import LabContext, LabRequestError
+from appwrite_lab.models import Lab
+
+
+class GeneratedUser(NamedTuple):
+    user_id: str
+    email: str
+    password: str
+    phone: str | None = None
+    # Secret of a server-created session, sent as `X-Appwrite-Session`
+    session: str | None = None
+    team_id: str | None = None
+
+
+class UserGenerator:
+    def __init__(
+        self,
+        lab: Lab,
+        project: str = "default",
+        max_parallel: int = 16,
+        password: str | None = None,
+        domain: str = "loadtest.local",
+    ):
+        """
+        Create many users in a project of a lab through the server API.
+
+        Args:
+            lab: The lab to create users in.
+            project: The name of the project, which must have an API key.
+            max_parallel: The maximum number of requests in flight.
+            password: The password of every user, random per run if not set.
+            domain: The domain of the generated emails.
+        """
+        self.context = LabContext(lab, lab.projects[project], max_parallel=max_parallel)
+        self.password = password or secrets.token_urlsafe(12)
+        self.domain = domain
+        # Failed users, as `user_id: error`
+        self.errors: dict[str, str] = {}
+        self._pending = max_parallel * 2
+        self._workers = ThreadPoolExecutor(max_workers=self._pending)
+        self._lock = threading.Lock()
+
+    def generate(
+        self,
+        count: int,
+        *,
+        sessions: bool = False,
+        phones: bool = False,
+        teams: Sequence[str] = (),
+        prefix: str = "lt",
+    ) -> Iterator[GeneratedUser]:
+        """
+        Create users concurrently, yielding their credentials as they are created.
+
+        User IDs, emails and phone numbers carry a random token per call, so
+        several runs against the same lab do not collide. Users that fail to
+        be created are left out and recorded in `errors`.
+
+        Args:
+            count: The number of users to create.
+            sessions: Also create a session for each user.
+            phones: Also give each user a phone number.
+            teams: IDs of existing teams, which users join in turn.
+            prefix: The prefix of the user IDs.
+
+        Yields:
+            The credentials of each created user, in completion order.
+        """
+        token = secrets.token_hex(3)
+        # Phone numbers are +1, the token in 8 digits and the index of the
+        # user in 6, the 15 digits E.164 allows
+        phone_prefix = f"+1{int(token, 16):08d}"
+        pending: set[Future] = set()
+        for index in range(count):
+            if len(pending) >= self._pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from self._results(done)
+            user = GeneratedUser(
+                user_id=f"{prefix}{token}{index}",
+                email=f"{prefix}{token}{index}@{self.domain}",
+                password=self.password,
+                phone=f"{phone_prefix}{index:06d}" if phones else None,
+                team_id=teams[index % len(teams)] if teams else None,
+            )
+            pending.add(self._workers.submit(self._create, user, sessions))
+        yield from self._results(wait(pending).done)
+
+    def _results(self, done: Iterable[Future]) -> Iterator[GeneratedUser]:
+        for future in done:
+            if user := future.result():
+                yield user
+
+    def _create(self, user: GeneratedUser, session: bool) -> GeneratedUser | None:
+        body = {
+            "userId": user.user_id,
+            "email": user.email,
+            "password": user.password,
+            "name": user.user_id,
+        }
+        if user.phone:
+            body["phone"] = user.phone
+        try:
+            self.context.request("POST", "/users", json=body)
+            if user.team_id:
+                self.context.request(
+                    "POST",
+                    f"/teams/{user.team_id}/memberships",
+                    json={"userId": user.user_id, "roles": []},
+                )
+            if session:
+                created = self.context.request(
+                    "POST", f"/users/{user.user_id}/sessions"
+                )
+                user = user._replace(session=created["secret"])
+        except LabRequestError as e:
+            with self._lock:
+                self.errors[user.user_id] = e.args[0]
+            return None
+        return user
+
+    def delete(self, user_ids: Iterable[str]) -> int:
+        """
+        Delete generated users concurrently.
+
+        Args:
+            user_ids: The IDs of the users to delete.
+
+        Returns:
+            The number of users deleted.
+        """
+
+        def delete(user_id: str) -> bool:
+            try:
+                self.context.request("DELETE", f"/users/{user_id}")
+            except LabRequestError as e:
+                with self._lock:
+                    self.errors[user_id] = e.args[0]
+                return False
+            return True
+
+        return sum(self._workers.map(delete, user_ids))
+
+    def close(self):
+        self._workers.shutdown()
+        self.context.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_credentials(users: Iterable[GeneratedUser], f: IO[str]) -> int:
+    """
+    Stream credentials to a file as NDJSON, one compact array per user.
+
+    Each line holds the fields of `GeneratedUser` in order.
+
+    Args:
+        users: The users, e.g. straight from `UserGenerator.generate`.
+        f: The text file to write to.
+
+    Returns:
+        The number of users written.
+    """
+    written = 0
+    for user in users:
+        f.write(json.dumps(user, separators=(",", ":")) + "\n")
+        written += 1
+    return written
+
+
+def read_credentials(f: IO[str]) -> Iterator[GeneratedUser]:
+    """
+    Stream credentials written by `write_credentials`.
+
+    Args:
+        f: The text file to read from.
+    """
+    for line in f:
+        if line.strip():
+            yield GeneratedUser(*json.loads(line))
@@ -1,12 +1,20 @@
+import contextlib
+import hashlib
 import os
 import platform
 import json
 import socket
+from typing import Iterator
 
 from rich.console import Console
 from rich.table import Table
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: file locks are left out
+    fcntl = None
+
 is_cli_setting: bool = False
 
 console = Console()
@@ -46,6 +54,37 @@ def get_state_path():
     return state_dir / "state.json"
 
 
+def get_discovery_path() -> Path:
+    """Get the file the discovered container backend and binaries are cached in."""
+    return get_state_path().parent / "discovery.json"
+
+
+def get_snapshot_dir(name: str, tag: str) -> Path:
+    """Get the directory a lab snapshot is stored in.
+
+    Args:
+        name: The name of the lab the snapshot was taken from.
+        tag: The tag of the snapshot.
+    """
+    return get_state_path().parent / "snapshots" / name / tag
+
+
+def get_sessions_path() -> Path:
+    """Get the directory cached console and CLI sessions are stored in."""
+    return get_state_path().parent / "sessions"
+
+
+def get_session_dir(name: str, admin_email: str) -> Path:
+    """Get the directory the sessions of a lab's admin user are cached in.
+
+    Args:
+        name: The name of the lab.
+        admin_email: The email of the admin user.
+    """
+    user = hashlib.sha256(admin_email.encode()).hexdigest()[:16]
+    return get_sessions_path() / name / user
+
+
 def set_cli_true():
     """Set the CLI setting to true."""
     global is_cli_setting
@@ -89,3 +128,36 @@ def port_in_use(port: int, host: str = "0.0.0.0") -> bool:
             return False
         except OSError:
             return True
+
+
+def get_free_ports(count: int, host: str = "0.0.0.0") -> list[int]:
+    """Ask the OS for several distinct free ephemeral ports.
+
+    Every socket stays bound until all ports are picked, so no port is
+    handed out twice.
+
+    Args:
+        count: The number of ports.
+        host: The host to bind to.
+    """
+    with contextlib.ExitStack() as stack:
+        ports = []
+        for _ in range(count):
+            s = stack.enter_context(socket.socket(socket.AF_INET, socket.SOCK_STREAM))
+            s.bind((host, 0))
+            ports.append(s.getsockname()[1])
+        return ports
+
+
+@contextlib.contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a file, shared with other processes.
+
+    Args:
+        path: The lock file, created if missing.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
@@ -0,0 +1,295 @@
+"""
+A stand-in for the `docker` and `docker-compose` binaries, without a daemon.
+
+It understands the commands the orchestrator runs: `compose ... up -d`,
+`compose -p <name> down|stop|start`, `compose version` and
+`ps [--filter label=...|name=...] --format json`. Containers are kept in the JSON file
+named by `FAKE_DOCKER_STATE`, one per service of the compose files brought up,
+all running and healthy. Traefik publishes `FAKE_DOCKER_HTTP_PORT`, so
+readiness checks can hit a local server.
+
+Use `install` to put it first on the PATH of the current process, and
+`serve_engine_api` to answer Engine API queries on a unix socket from the same
+containers.
+"""
+
+import fcntl
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from socketserver import ThreadingUnixStreamServer
+from urllib.parse import parse_qs, urlsplit
+
+# Services of a compose file, as the keys indented once under `services:`
+_SERVICE = re.compile(r"^  ([A-Za-z0-9_.-]+):\s*$")
+
+
+def install(bin_dir: Path, state_file: Path, http_port: int):
+    """
+    Install the fake binaries in a directory and put it first on the PATH.
+
+    Args:
+        bin_dir: The directory to install `docker` and `docker-compose` in.
+        state_file: The file the fake containers are kept in.
+        http_port: The port traefik reports as published.
+    """
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    script = f"#!{sys.executable}\n" + Path(__file__).read_text()
+    for name in ("docker", "docker-compose"):
+        path = bin_dir / name
+        path.write_text(script)
+        path.chmod(0o755)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+    os.environ["FAKE_DOCKER_STATE"] = str(state_file)
+    os.environ["FAKE_DOCKER_HTTP_PORT"] = str(http_port)
+
+
+def compose_services(path: str) -> list[str]:
+    """Read the service names of a compose file."""
+    services, in_services = [], False
+    for line in Path(path).read_text().splitlines():
+        if line.rstrip() == "services:":
+            in_services = True
+        elif in_services and re.match(r"[A-Za-z_]", line):
+            break
+        elif in_services and (match := _SERVICE.match(line)):
+            services.append(match.group(1))
+    return services
+
+
+def container(project: str, service: str) -> dict:
+    """A container as `docker ps --format json` prints it."""
+    ports = ""
+    if service == "traefik":
+        ports = f"0.0.0.0:{os.environ.get('FAKE_DOCKER_HTTP_PORT', '80')}->80/tcp"
+    return {
+        "Names": f"{project}-{service}-1",
+        "Labels": f"com.docker.compose.project={project},"
+        f"com.docker.compose.service={service}",
+        "Ports": ports,
+        "State": "running",
+        "Status": "Up 1 second (healthy)",
+    }
+
+
+def to_api(item: dict) -> dict:
+    """A container as the Engine API `/containers/json` lists it."""
+    ports = []
+    if match := re.fullmatch(r"(.*):(\d+)->(\d+)/(\w+)", item["Ports"]):
+        ip, public, private, protocol = match.groups()
+        ports.append(
+            {
+                "IP": ip,
+                "PublicPort": int(public),
+                "PrivatePort": int(private),
+                "Type": protocol,
+            }
+        )
+    return {
+        "Id": item["Names"],
+        "Names": [f"/{item['Names']}"],
+        "Labels": dict(
+            label.split("=", 1) for label in item["Labels"].split(",") if label
+        ),
+        "Ports": ports,
+        "State": item["State"],
+        "Status": item["Status"],
+    }
+
+
+def matches(item: dict, filters: dict) -> bool:
+    """Whether an Engine API container passes `label`, `name` and `id` filters."""
+    labels = {f"{key}={value}" for key, value in item["Labels"].items()}
+    return (
+        all(f in labels or f in item["Labels"] for f in filters.get("label", []))
+        and all(name in item["Names"][0] for name in filters.get("name", []))
+        and all(item["Id"].startswith(id) for id in filters.get("id", []))
+    )
+
+
+class _EngineHandler(BaseHTTPRequestHandler):
+    """Answers `/_ping`, `/containers/json` and `/events` like the Docker Engine API."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        filters = json.loads(parse_qs(url.query).get("filters", ["{}"])[0])
+        if url.path == "/_ping":
+            return self._reply(b"OK", "text/plain")
+        if url.path == "/events":
+            since = parse_qs(url.query).get("since")
+            return self._events(filters, float(since[0]) if since else None)
+        if url.path != "/containers/json":
+            return self._reply(b'{"message": "page not found"}', status=404)
+        containers = [
+            item
+            for item in map(to_api, load(self.server.state_file))
+            if matches(item, filters)
+        ]
+        self._reply(json.dumps(containers).encode())
+
+    def _events(self, filters: dict, since: float | None):
+        """Stream the events of the server, replaying the ones since `since`."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        log, changed = self.server.events, self.server.changed
+        with changed:
+            sent = len(log)
+            if since is not None:
+                sent = next((i for i, (at, *_) in enumerate(log) if at >= since), sent)
+        while not self.server.done.is_set():
+            with changed:
+                changed.wait_for(lambda: len(log) > sent or self.server.done.is_set())
+                events = [
+                    event for _, item, event in log[sent:] if matches(item, filters)
+                ]
+                sent = len(log)
+            for event in events:
+                chunk = json.dumps(event).encode() + b"\n"
+                try:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    self.wfile.flush()
+                except OSError:
+                    return
+        self.close_connection = True
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _reply(self, body: bytes, content_type="application/json", status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return "unix"
+
+    def log_message(self, *args):
+        pass
+
+
+class _EngineServer(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, state_file: Path):
+        super().__init__(str(socket_path), _EngineHandler)
+        self.state_file = state_file
+        # A `start` or `destroy` event per container that appeared or went, as
+        # `(unix time, container, event)`, found by polling the fake containers
+        self.events: list[tuple[float, dict, dict]] = []
+        self.changed = threading.Condition()
+        self.done = threading.Event()
+        threading.Thread(target=self._watch, daemon=True).start()
+
+    def _watch(self):
+        known = {item["Names"]: item for item in load(self.state_file)}
+        while not self.done.wait(0.02):
+            current = {item["Names"]: item for item in load(self.state_file)}
+            changes = [(known[name], "destroy") for name in known.keys() - current]
+            changes += [(current[name], "start") for name in current.keys() - known]
+            known = current
+            if changes:
+                with self.changed:
+                    for item, action in changes:
+                        event = {"Type": "container", "Action": action}
+                        event["id"] = item["Names"]
+                        self.events.append((time.time(), to_api(item), event))
+                    self.changed.notify_all()
+
+    def shutdown(self):
+        self.done.set()
+        with self.changed:
+            self.changed.notify_all()
+        super().shutdown()
+        self.server_close()
+
+
+def serve_engine_api(socket_path: Path, state_file: Path) -> ThreadingUnixStreamServer:
+    """
+    Serve the fake containers on an Engine API socket, in a background thread.
+
+    Points `DOCKER_HOST` at the socket, so the orchestrator queries it instead
+    of a real daemon. Call `shutdown` on the returned server to stop it.
+
+    Args:
+        socket_path: The unix socket to listen on.
+        state_file: The file the fake containers are kept in.
+    """
+    socket_path.unlink(missing_ok=True)
+    server = _EngineServer(socket_path, state_file)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["DOCKER_HOST"] = f"unix://{socket_path}"
+    return server
+
+
+def load(state_file: Path) -> list[dict]:
+    return json.loads(state_file.read_text()) if state_file.exists() else []
+
+
+def save(state_file: Path, containers: list[dict]):
+    temp = state_file.with_suffix(f".{os.getpid()}.tmp")
+    temp.write_text(json.dumps(containers))
+    os.replace(temp, state_file)
+
+
+def main(argv: list[str]) -> int:
+    state_file = Path(os.environ["FAKE_DOCKER_STATE"])
+    # Concurrent commands change the containers one at a time, like a daemon
+    with open(state_file.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return run(argv, state_file)
+
+
+def run(argv: list[str], state_file: Path) -> int:
+    containers = load(state_file)
+    if argv[:1] == ["compose"]:
+        argv = argv[1:]
+    elif Path(sys.argv[0]).name != "docker-compose" and argv[:1] != ["ps"]:
+        print(f"fake docker: unsupported command {argv}", file=sys.stderr)
+        return 1
+
+    if argv[:1] == ["ps"]:
+        filters = [argv[i + 1] for i, arg in enumerate(argv) if arg == "--filter"]
+        filters = {
+            "label": [
+                f.removeprefix("label=") for f in filters if f.startswith("label=")
+            ],
+            "name": [f.removeprefix("name=") for f in filters if f.startswith("name=")],
+        }
+        for item in containers:
+            if matches(to_api(item), filters):
+                print(json.dumps(item))
+        return 0
+    if argv[:1] == ["version"]:
+        print("Docker Compose version v2.0.0-fake")
+        return 0
+
+    project = argv[argv.index("-p") + 1]
+    files = [argv[i + 1] for i, arg in enumerate(argv) if arg == "-f"]
+    if "up" in argv:
+        existing = {item["Names"] for item in containers}
+        for path in files:
+            for service in compose_services(path):
+                item = container(project, service)
+                if item["Names"] not in existing:
+                    containers.append(item)
+        save(state_file, containers)
+    elif "down" in argv:
+        prefix = f"com.docker.compose.project={project},"
+        save(
+            state_file,
+            [item for item in containers if not item["Labels"].startswith(prefix)],
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,230 @@
+"""
+Benchmark the lab lifecycle against a fake container backend.
+
+Times deploying and tearing down labs, reading them from the state, state
+round-trips and CLI startup, without a Docker daemon (see `fake_docker`, which
+answers container queries on an Engine API socket like a daemon would), and
+writes a JSON report. With a baseline report, exits non-zero when a benchmark
+got slower than the threshold allows.
+
+    python -m benchmarks.lifecycle --output report.json
+    python -m benchmarks.lifecycle --baseline report.json --threshold 1.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+from appwrite_lab._orchestrator import ServiceOrchestrator
+from appwrite_lab._state import State
+from appwrite_lab.models import Lab, Project
+
+from . import fake_docker
+
+VERSION = "1.7.4"
+
+
+class _HealthyHandler(BaseHTTPRequestHandler):
+    """Answers every request like a healthy Appwrite API and console."""
+
+    def do_GET(self):
+        body = b'{"version": "' + VERSION.encode() + b'"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def summarize(samples: list[float]) -> dict:
+    """Sum up the durations of a benchmark in milliseconds."""
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "runs": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, round(0.95 * (len(ms) - 1)))], 3),
+        "min_ms": round(ms[0], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def timed(fn: Callable, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def fake_lab(name: str) -> dict:
+    lab = Lab(
+        name=name,
+        version=VERSION,
+        url="http://localhost:80",
+        admin_email=f"admin@{name}.local",
+        admin_password="password",
+        projects={"default": Project(name, f"Default_{name}", "key")},
+    )
+    return lab.to_dict()
+
+
+def run(iterations: int, labs: int, work_dir: Path) -> dict:
+    """
+    Run every benchmark.
+
+    Args:
+        iterations: How many times each benchmark runs.
+        labs: How many labs the state holds while reading it.
+        work_dir: A scratch directory for the state and the fake backend.
+
+    Returns:
+        The report, with the summary of each benchmark under `results`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HealthyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["HOME"] = str(work_dir)
+    fake_docker.install(
+        work_dir / "bin", work_dir / "containers.json", server.server_address[1]
+    )
+    engine = fake_docker.serve_engine_api(
+        work_dir / "docker.sock", work_dir / "containers.json"
+    )
+
+    state_file = work_dir / "state.json"
+    state = State(str(state_file))
+    orchestrator = ServiceOrchestrator(state, backend="docker")
+    results, errors = {}, {}
+
+    deploys, teardowns = [], []
+    for i in range(iterations):
+        name = f"bench-{i}"
+        start = time.perf_counter()
+        res = orchestrator.deploy_appwrite_lab(
+            name, VERSION, just_deploy=True, ready_timeout=10
+        )
+        deploys.append(time.perf_counter() - start)
+        if res.error:
+            errors["deploy_appwrite_lab"] = res.message
+            break
+        start = time.perf_counter()
+        orchestrator.teardown_service(name)
+        teardowns.append(time.perf_counter() - start)
+    results["deploy_appwrite_lab"] = summarize(deploys)
+    if teardowns:
+        results["teardown_service"] = summarize(teardowns)
+
+    for i in range(labs):
+        state.set_item("labs", f"lab-{i}", fake_lab(f"lab-{i}"))
+    runs = iterations * 20
+    results["get_lab"] = summarize(
+        timed(lambda: orchestrator.get_lab(f"lab-{labs // 2}"), runs)
+    )
+    results["get_formatted_labs"] = summarize(
+        timed(lambda: orchestrator.get_formatted_labs(collapsed=True), runs)
+    )
+    results["state_load"] = summarize(timed(lambda: State(str(state_file)), runs))
+
+    def round_trip():
+        state.set_item("labs", "round-trip", fake_lab("round-trip"))
+        state.pop_item("labs", "round-trip")
+
+    results["state_round_trip"] = summarize(timed(round_trip, runs))
+
+    cli = [
+        sys.executable,
+        "-c",
+        "from appwrite_lab.cli.entry import app; app(['--help'])",
+    ]
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        proc = subprocess.run(cli, capture_output=True, text=True)
+        samples.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            errors["cli_startup"] = proc.stderr.strip().splitlines()[-1]
+            break
+    if "cli_startup" not in errors:
+        results["cli_startup"] = summarize(samples)
+
+    engine_api = orchestrator.engine is not None
+    engine.shutdown()
+    server.shutdown()
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": "fake",
+        "engine_api": engine_api,
+        "iterations": iterations,
+        "labs": labs,
+        "results": results,
+        "errors": errors,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Find the benchmarks whose mean got slower than the baseline allows.
+
+    Args:
+        report: The report of this run.
+        baseline: A report of an earlier run.
+        threshold: The allowed ratio of the mean to the baseline mean.
+
+    Returns:
+        A line per regression.
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        if before := baseline.get("results", {}).get(name):
+            ratio = result["mean_ms"] / before["mean_ms"]
+            if ratio > threshold:
+                regressions.append(
+                    f"{name}: {before['mean_ms']}ms -> {result['mean_ms']}ms "
+                    f"({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--labs", type=int, default=50)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--baseline", type=Path, help="A report to compare with.")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        report = run(args.iterations, args.labs, Path(work_dir))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+
+    if args.baseline:
+        regressions = compare(
+            report, json.loads(args.baseline.read_text()), args.threshold
+        )
+        for line in regressions:
+            print(f"Regression: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Benchmark how fast the CLI starts.
+
+Times importing the CLI and running commands that need no lab (`--help`,
+`list versions`) in fresh interpreters, and checks that importing the CLI
+neither imports the modules a command only needs once it runs nor touches the
+state. With a baseline report, exits non-zero when a benchmark got slower than
+the threshold allows, or when the CLI does work at import time again.
+
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --baseline startup.json --threshold 1.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .lifecycle import compare, summarize
+
+# Modules only the commands that run against a lab should import
+DEFERRED_MODULES = [
+    "dotenv",
+    "httpx",
+    "appwrite_lab._engine",
+    "appwrite_lab._orchestrator",
+    "appwrite_lab._state",
+    "appwrite_lab.labs",
+]
+
+COMMANDS = {
+    "import_cli": "import appwrite_lab.cli.entry",
+    "cli_help": "from appwrite_lab.cli.entry import app; app(['--help'])",
+    "cli_list_versions": (
+        "from appwrite_lab.cli.entry import app; app(['list', 'versions'])"
+    ),
+}
+
+
+def _python(code: str, env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+
+
+def eager_imports(env: dict) -> list[str]:
+    """List the deferred modules that importing the CLI imports anyway."""
+    proc = _python(
+        "import json, sys, appwrite_lab.cli.entry; "
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))",
+        env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout)
+
+
+def run(iterations: int, work_dir: Path) -> dict:
+    """
+    Run every benchmark.
+
+    Args:
+        iterations: How many times each command runs.
+        work_dir: The home directory of the commands, to see whether they
+            touch the state.
+
+    Returns:
+        The report, with the summary of each benchmark under `results`.
+    """
+    env = {**os.environ, "HOME": str(work_dir)}
+    results, errors = {}, {}
+    for name, code in COMMANDS.items():
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            proc = _python(code, env)
+            samples.append(time.perf_counter() - start)
+            if proc.returncode != 0:
+                errors[name] = proc.stderr.strip().splitlines()[-1]
+                break
+        if name not in errors:
+            results[name] = summarize(samples)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "eager_imports": eager_imports(env),
+        "touches_state": any(work_dir.rglob("state.json")),
+        "results": results,
+        "errors": errors,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--baseline", type=Path, help="A report to compare with.")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        report = run(args.iterations, Path(work_dir))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+
+    failures = [f"{name} imported at startup" for name in report["eager_imports"]]
+    if report["touches_state"]:
+        failures.append("the state is read at startup")
+    if args.baseline:
+        failures += compare(
+            report, json.loads(args.baseline.read_text()), args.threshold
+        )
+    for line in failures:
+        print(f"Regression: {line}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
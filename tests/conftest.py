@@ -1,6 +1,9 @@
+import functools
+import os
+import httpx
 import pytest
 from pathlib import Path
-from appwrite_lab.models import Lab
+from appwrite_lab.models import Lab, Project
 from appwrite_lab.test_suite import lab_svc, appwrite_file, lab_config, lab
 from appwrite_lab.tools.sms import SMS
 
@@ -16,6 +19,59 @@ def sms(lab: Lab):
 
 
 @pytest.fixture(autouse=True)
-async def clear_sms(sms: SMS):
+async def clear_sms(request: pytest.FixtureRequest):
+    # Only e2e tests have a lab to send messages to
+    if not request.node.get_closest_marker("e2e"):
+        yield
+        return
+    sms: SMS = request.getfixturevalue("sms")
     yield
     await sms.clear_messages()
+
+
+@pytest.fixture
+def mock_lab() -> Lab:
+    """A lab that is never deployed, for tests against a mocked Appwrite."""
+    return Lab(
+        name="test",
+        version="1.7.4",
+        url="http://lab",
+        projects={"default": Project("project", "default", "key")},
+    )
+
+
+@pytest.fixture
+def mock_transport(monkeypatch):
+    """
+    Route every httpx client created during the test to a handler instead of
+    the network, e.g. `mock_transport(handler, "Client", "AsyncClient")`.
+    """
+
+    def route(handler, *clients: str):
+        transport = httpx.MockTransport(handler)
+        for client in clients or ("Client",):
+            monkeypatch.setattr(
+                httpx,
+                client,
+                functools.partial(getattr(httpx, client), transport=transport),
+            )
+
+    return route
+
+
+@pytest.fixture
+def fake_docker_env(monkeypatch):
+    """Restore what installing the fake Docker backend changes in the environment."""
+    for var in (
+        "PATH",
+        "HOME",
+        "DOCKER_HOST",
+        "FAKE_DOCKER_STATE",
+        "FAKE_DOCKER_HTTP_PORT",
+    ):
+        if var in os.environ:
+            monkeypatch.setenv(var, os.environ[var])
+        else:
+            # Left unset, but removed again if the test sets it
+            monkeypatch.setenv(var, "")
+            monkeypatch.delenv(var)
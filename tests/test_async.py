@@ -0,0 +1,109 @@
+import asyncio
+import fcntl
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from appwrite_lab import AsyncLabs
+from appwrite_lab._async_orchestrator import run_cmd_async
+from appwrite_lab import _async_orchestrator, _orchestrator
+from appwrite_lab._orchestrator import OrchestratorError, port_allocation
+from appwrite_lab.utils import get_state_path
+from benchmarks import fake_docker
+from benchmarks.lifecycle import VERSION, _HealthyHandler
+
+
+@pytest.fixture
+def fake_backend(tmp_path, fake_docker_env, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HealthyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fake_docker.install(
+        tmp_path / "bin", tmp_path / "containers.json", server.server_address[1]
+    )
+    yield tmp_path
+    server.shutdown()
+
+
+@pytest.mark.parametrize("engine_api", [True, False])
+def test_async_labs_deploy_and_stop_together(fake_backend, monkeypatch, engine_api):
+    engine = None
+    if engine_api:
+        engine = fake_docker.serve_engine_api(
+            fake_backend / "docker.sock", fake_backend / "containers.json"
+        )
+    else:
+        monkeypatch.setenv("DOCKER_HOST", f"unix://{fake_backend}/missing.sock")
+
+    async def scenario():
+        async with AsyncLabs() as labs:
+            specs = [
+                {"name": f"async-{i}", "version": VERSION, "just_deploy": True}
+                for i in range(3)
+            ]
+            deployed = {name: res async for name, res in labs.new_many(specs)}
+            assert not any(res.error for res in deployed.values())
+            assert (await labs.orchestrator.engine() is not None) == engine_api
+            statuses = await asyncio.gather(*(labs.status(name) for name in deployed))
+            assert statuses == ["healthy"] * 3
+            assert await labs.orchestrator.check_pod_status("async-0-traefik-1")
+
+            stopped = await asyncio.gather(*(labs.stop(name) for name in deployed))
+            assert not any(res.error for res in stopped)
+            assert await labs.orchestrator.get_running_pods() == {}
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        if engine:
+            engine.shutdown()
+
+
+def test_cancelled_deploy_releases_the_port_lock(fake_backend, monkeypatch):
+    engine = fake_docker.serve_engine_api(
+        fake_backend / "docker.sock", fake_backend / "containers.json"
+    )
+    waiting = asyncio.Event()
+
+    def port_allocation_of_deploy():
+        waiting.set()
+        return port_allocation()
+
+    monkeypatch.setattr(
+        _async_orchestrator, "port_allocation", port_allocation_of_deploy
+    )
+
+    async def scenario():
+        async with AsyncLabs() as labs:
+            with port_allocation():
+                deploy = asyncio.create_task(
+                    labs.new("cancelled", VERSION, just_deploy=True)
+                )
+                # The deploy waits for the lock in a thread
+                await waiting.wait()
+                await asyncio.sleep(0.1)
+                deploy.cancel()
+                with pytest.raises(asyncio.CancelledError) as cancelled:
+                    await deploy
+        return cancelled
+
+    try:
+        # Its traceback keeps the cancelled deploy's frames alive
+        cancelled = asyncio.run(scenario())
+    finally:
+        engine.shutdown()
+    # The waiting thread took the lock after the cancel, and gave it back
+    assert _orchestrator._port_lock.acquire(timeout=5)
+    _orchestrator._port_lock.release()
+    with open(get_state_path().parent / "ports.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    assert cancelled.type is asyncio.CancelledError
+
+
+def test_run_cmd_async_raises_like_run_cmd():
+    assert asyncio.run(run_cmd_async(["echo", "hi"])).stdout == "hi\n"
+    with pytest.raises(OrchestratorError, match="command: boom"):
+        asyncio.run(
+            run_cmd_async(["sh", "-c", "echo 'x OrchestratorError: boom' >&2; exit 1"])
+        )
@@ -0,0 +1,35 @@
+from benchmarks import startup
+from benchmarks.lifecycle import compare, run
+
+
+def test_lifecycle_benchmarks_run_on_fake_backend(tmp_path, fake_docker_env):
+    report = run(iterations=1, labs=3, work_dir=tmp_path)
+    assert "deploy_appwrite_lab" not in report["errors"]
+    assert report["engine_api"]
+    assert {
+        "deploy_appwrite_lab",
+        "teardown_service",
+        "get_lab",
+        "get_formatted_labs",
+        "state_load",
+        "state_round_trip",
+    } <= report["results"].keys()
+    assert report["results"]["get_lab"]["runs"] == 20
+
+
+def test_compare_flags_regressions():
+    baseline = {
+        "results": {"get_lab": {"mean_ms": 1.0}, "state_load": {"mean_ms": 1.0}}
+    }
+    report = {"results": {"get_lab": {"mean_ms": 2.0}, "state_load": {"mean_ms": 1.2}}}
+    assert compare(report, baseline, threshold=1.5) == [
+        "get_lab: 1.0ms -> 2.0ms (2.00x)"
+    ]
+
+
+def test_cli_startup_defers_labs(tmp_path):
+    report = startup.run(iterations=1, work_dir=tmp_path)
+    assert report["errors"] == {}
+    assert report["eager_imports"] == []
+    assert not report["touches_state"]
+    assert report["results"].keys() == startup.COMMANDS.keys()
@@ -0,0 +1,188 @@
+import httpx
+import pytest
+from appwrite_lab import _orchestrator
+from appwrite_lab._orchestrator import ServiceOrchestrator
+from appwrite_lab._state import State
+from appwrite_lab.automations import console
+from appwrite_lab.automations.console import (
+    ConsoleAPIError,
+    ConsoleClient,
+    expiration_to_date,
+    run_console_automation,
+)
+from appwrite_lab.automations.models import (
+    AppwriteAPIKeyCreation,
+    AppwriteProjectCreation,
+)
+from appwrite_lab.models import Automation, Lab, Project
+
+
+@pytest.fixture
+def overrides() -> dict[tuple[str, str], tuple[int, dict]]:
+    """Status and body of fake console responses to replace, by method and path."""
+    return {}
+
+
+@pytest.fixture
+def console_calls(mock_transport, monkeypatch, tmp_path, overrides):
+    """Route console calls to a fake Appwrite and record them."""
+    seen = []
+    monkeypatch.setattr(
+        console, "get_session_dir", lambda name, email: tmp_path / name / email
+    )
+
+    def handler(request: httpx.Request):
+        seen.append((request.method, request.url.path))
+        path = request.url.path
+        if (request.method, path) in overrides:
+            status, body = overrides[request.method, path]
+            return httpx.Response(status, json=body)
+        if path == "/v1/teams":
+            return httpx.Response(201, json={"$id": "team", "teams": []})
+        if path.endswith("/keys"):
+            return httpx.Response(201, json={"secret": "standard_key"})
+        if request.method == "GET" and path == "/v1/projects":
+            return httpx.Response(
+                200, json={"projects": [{"$id": "proj", "name": "Proj"}]}
+            )
+        if path == "/v1/projects/existing":
+            return httpx.Response(200, json={"$id": "existing"})
+        if request.method == "GET" and path.startswith("/v1/projects/"):
+            return httpx.Response(404, json={"message": "Project not found"})
+        return httpx.Response(201, json={})
+
+    mock_transport(handler)
+    return seen
+
+
+@pytest.fixture
+def lab(mock_lab: Lab):
+    mock_lab.admin_email = "a@b.c"
+    return mock_lab
+
+
+def test_create_user_and_api_key(console_calls, lab: Lab):
+    key = run_console_automation(
+        lab,
+        Automation.CREATE_USER_AND_API_KEY,
+        Project("proj", "Proj"),
+        AppwriteAPIKeyCreation("Proj", "default_key", "Never"),
+    )
+    assert key == "standard_key"
+    assert console_calls == [
+        ("POST", "/v1/account"),
+        ("POST", "/v1/account/sessions/email"),
+        ("GET", "/v1/teams"),
+        ("POST", "/v1/teams"),
+        ("POST", "/v1/projects"),
+        ("POST", "/v1/projects/proj/keys"),
+    ]
+
+
+def test_create_user_and_api_key_resumes(console_calls, overrides, lab: Lab):
+    # Account and project left behind by an interrupted run
+    overrides["POST", "/v1/account"] = (409, {"message": "user_already_exists"})
+    overrides["POST", "/v1/projects"] = (409, {"message": "project_already_exists"})
+    key = run_console_automation(
+        lab,
+        Automation.CREATE_USER_AND_API_KEY,
+        Project("proj", "Proj"),
+        AppwriteAPIKeyCreation("Proj", "default_key", "Never"),
+    )
+    assert key == "standard_key"
+
+
+def test_failure_after_a_change_is_not_fallback_safe(
+    console_calls, overrides, lab: Lab
+):
+    overrides["POST", "/v1/projects/proj/keys"] = (500, {"message": "boom"})
+    with pytest.raises(ConsoleAPIError) as raised:
+        run_console_automation(
+            lab,
+            Automation.CREATE_USER_AND_API_KEY,
+            Project("proj", "Proj"),
+            AppwriteAPIKeyCreation("Proj", "default_key", "Never"),
+        )
+    assert raised.value.status == 500
+    assert not raised.value.fallback_safe
+
+
+def test_project_is_only_created_when_missing(console_calls, overrides, lab: Lab):
+    overrides["GET", "/v1/projects/proj"] = (503, {"message": "unavailable"})
+    with pytest.raises(ConsoleAPIError) as raised:
+        run_console_automation(
+            lab,
+            Automation.CREATE_PROJECT,
+            Project("proj", "Proj"),
+            AppwriteProjectCreation("proj", "Proj"),
+        )
+    assert raised.value.fallback_safe
+    assert ("POST", "/v1/projects") not in console_calls
+
+
+def test_create_existing_project_fails(console_calls, lab: Lab):
+    with pytest.raises(ConsoleAPIError, match="already exists") as raised:
+        run_console_automation(
+            lab,
+            Automation.CREATE_PROJECT,
+            Project("existing", "Existing"),
+            AppwriteProjectCreation("existing", "Existing"),
+        )
+    # Playwright would only try to create it again
+    assert not raised.value.fallback_safe
+
+
+def test_shared_client_logs_in_once(console_calls, lab: Lab):
+    with ConsoleClient(lab.url) as client:
+        run_console_automation(
+            lab,
+            Automation.CREATE_PROJECT,
+            Project("proj", "Proj"),
+            AppwriteProjectCreation("proj", "Proj"),
+            client,
+        )
+        run_console_automation(
+            lab,
+            Automation.CREATE_API_KEY,
+            Project("proj", "Proj"),
+            AppwriteAPIKeyCreation("Proj", "key", "Never"),
+            client,
+        )
+    logins = [call for call in console_calls if call[1].startswith("/v1/account")]
+    assert logins == [("POST", "/v1/account/sessions/email")]
+
+
+def test_cached_session_is_reused(console_calls, lab: Lab):
+    for _ in range(2):
+        run_console_automation(
+            lab,
+            Automation.CREATE_API_KEY,
+            Project("proj", "Proj"),
+            AppwriteAPIKeyCreation("Proj", "key", "Never"),
+        )
+    assert console_calls.count(("POST", "/v1/account/sessions/email")) == 1
+    assert ("GET", "/v1/account") in console_calls
+
+
+def test_expiration_to_date():
+    assert expiration_to_date("Never") is None
+    assert expiration_to_date("30 days") is not None
+
+
+def test_auto_engine_does_not_fall_back_after_a_change(monkeypatch, tmp_path, lab):
+    def fail(*args):
+        raise ConsoleAPIError("boom", status=500, fallback_safe=False)
+
+    monkeypatch.setattr(_orchestrator, "run_console_automation", fail)
+    orchestrator = ServiceOrchestrator(State(tmp_path / "state.json"))
+    # Falling back would start the worker or a container
+    monkeypatch.setattr(ServiceOrchestrator, "worker", None)
+    res = orchestrator.deploy_playwright_automation(
+        lab,
+        Automation.CREATE_PROJECT,
+        Project("proj", "Proj"),
+        AppwriteProjectCreation("proj", "Proj"),
+        engine="auto",
+    )
+    assert res.error
+    assert res.data == "boom"
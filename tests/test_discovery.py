@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from appwrite_lab import _discovery
+from appwrite_lab._discovery import DiscoveryError, discover
+
+FAKE_COMPOSE = """#!/bin/sh
+echo "$0 $@" >> "$CALLS"
+echo "Docker Compose version v2.29.1"
+"""
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    path = tmp_path / "bin"
+    path.mkdir()
+    for name in ("docker", "docker-compose"):
+        (path / name).write_text(FAKE_COMPOSE)
+        (path / name).chmod(0o755)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("PATH", str(path))
+    monkeypatch.setenv("CALLS", str(tmp_path / "calls"))
+    return path
+
+
+def calls(bin_dir) -> int:
+    path = bin_dir.parent / "calls"
+    return len(path.read_text().splitlines()) if path.exists() else 0
+
+
+def test_discover_caches_until_a_binary_changes(bin_dir):
+    toolchain = discover()
+    assert toolchain.backend == "docker"
+    assert toolchain.util == str(bin_dir / "docker")
+    assert toolchain.compose == (str(bin_dir / "docker-compose"),)
+    assert toolchain.flavor == "docker-compose"
+    assert toolchain.version == "v2.29.1"
+    assert calls(bin_dir) == 1
+
+    assert discover() == toolchain
+    assert calls(bin_dir) == 1
+
+    stat = os.stat(bin_dir / "docker-compose")
+    os.utime(bin_dir / "docker-compose", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert discover().version == "v2.29.1"
+    assert calls(bin_dir) == 2
+
+    (bin_dir / "docker-compose").unlink()
+    toolchain = discover()
+    assert toolchain.compose == (str(bin_dir / "docker"), "compose")
+    assert toolchain.flavor == "compose-plugin"
+    assert calls(bin_dir) == 3
+
+
+def test_discover_is_keyed_by_path(bin_dir, tmp_path, monkeypatch):
+    discover()
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    with pytest.raises(DiscoveryError):
+        discover()
+    assert discover("docker").util is None
+
+
+def test_discover_recovers_from_a_broken_cache(bin_dir):
+    _discovery.get_discovery_path().write_text("{not json")
+    assert discover().backend == "docker"
+    assert discover(cache=False) == discover()
+
+
+def test_cli_reuses_the_discovered_backend(bin_dir):
+    code = (
+        "from appwrite_lab._orchestrator import detect_backend; print(detect_backend())"
+    )
+    for _ in range(2):
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        assert out.strip() == "docker"
+    assert calls(bin_dir) == 1
+
+
+def test_discover_notices_an_upgraded_compose_plugin(bin_dir, tmp_path, monkeypatch):
+    monkeypatch.delenv("DOCKER_CONFIG", raising=False)
+    (bin_dir / "docker-compose").unlink()
+    plugin = tmp_path / ".docker" / "cli-plugins" / "docker-compose"
+    plugin.parent.mkdir(parents=True)
+    plugin.write_text(FAKE_COMPOSE)
+    plugin.chmod(0o755)
+
+    toolchain = discover()
+    assert toolchain.flavor == "compose-plugin"
+    assert str(plugin) in toolchain.binaries
+    assert discover() == toolchain
+    assert calls(bin_dir) == 1
+
+    stat = os.stat(plugin)
+    os.utime(plugin, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    discover()
+    assert calls(bin_dir) == 2
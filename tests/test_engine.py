@@ -0,0 +1,182 @@
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from appwrite_lab import _orchestrator
+from appwrite_lab._engine import (
+    EngineClient,
+    PortBinding,
+    find_socket,
+    parse_ps_output,
+)
+from appwrite_lab._orchestrator import ServiceOrchestrator, extract_port_from_pod_info
+from appwrite_lab._readiness import is_pod_healthy
+from appwrite_lab._state import State
+from benchmarks import fake_docker
+from benchmarks.lifecycle import fake_lab
+
+DOCKER_PS_LINE = {
+    "ID": "abc123",
+    "Names": "lab-traefik-1",
+    "Image": "traefik:2.11",
+    "Labels": "com.docker.compose.project=lab,com.docker.compose.service=traefik",
+    "Ports": "0.0.0.0:8005->80/tcp, [::]:8005->80/tcp, 443/tcp",
+    "State": "running",
+    "Status": "Up 5 seconds (healthy)",
+}
+
+
+def test_containers_parse_docker_and_podman_ps():
+    podman = [
+        {
+            "Id": "def456",
+            "Names": ["lab-traefik-1"],
+            "Labels": {"com.docker.compose.project": "lab"},
+            "Ports": [{"host_ip": "", "container_port": 80, "host_port": 8005}],
+            "State": "running",
+            "Status": "Up 5 seconds",
+        }
+    ]
+    (docker,) = parse_ps_output(json.dumps(DOCKER_PS_LINE) + "\n")
+    (podman,) = parse_ps_output(json.dumps(podman))
+
+    assert docker.project == "lab" and docker.service == "traefik"
+    assert docker.ports == (
+        PortBinding(80, "tcp", 8005, "0.0.0.0"),
+        PortBinding(80, "tcp", 8005, "::"),
+        PortBinding(443, "tcp"),
+    )
+    assert docker.to_ps() == DOCKER_PS_LINE
+    assert podman.name == "lab-traefik-1" and podman.project == "lab"
+    assert extract_port_from_pod_info(podman.to_ps()) == 8005
+
+
+def test_engine_client_filters_on_labels_and_names(tmp_path, monkeypatch):
+    # Serving the fake engine points DOCKER_HOST at it; restore it after
+    monkeypatch.setenv("DOCKER_HOST", "")
+    monkeypatch.setenv("FAKE_DOCKER_HTTP_PORT", "8005")
+    state_file = tmp_path / "containers.json"
+    fake_docker.save(
+        state_file,
+        [
+            fake_docker.container("lab", "traefik"),
+            fake_docker.container("lab", "appwrite"),
+            fake_docker.container("other", "traefik"),
+        ],
+    )
+    server = fake_docker.serve_engine_api(tmp_path / "docker.sock", state_file)
+    try:
+        assert find_socket() == tmp_path / "docker.sock"
+        with EngineClient(tmp_path / "docker.sock") as engine:
+            assert engine.ping()
+            assert len(engine.containers()) == 3
+            (traefik,) = engine.containers(
+                labels={
+                    "com.docker.compose.project": "lab",
+                    "com.docker.compose.service": "traefik",
+                }
+            )
+            assert traefik.name == "lab-traefik-1"
+            assert is_pod_healthy(traefik.to_ps())
+            assert extract_port_from_pod_info(traefik.to_ps()) == 8005
+            assert [c.name for c in engine.containers(name="other-")] == [
+                "other-traefik-1"
+            ]
+    finally:
+        server.shutdown()
+
+
+def test_find_socket_only_considers_sockets_of_the_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{tmp_path}/docker.sock")
+    monkeypatch.delenv("CONTAINER_HOST", raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert find_socket("docker") == tmp_path / "docker.sock"
+    assert find_socket("podman") in (None, Path("/run/podman/podman.sock"))
+
+    monkeypatch.setenv("CONTAINER_HOST", f"unix://{tmp_path}/podman.sock")
+    assert find_socket("podman") == tmp_path / "podman.sock"
+
+
+def test_orchestrator_sees_containers_of_no_compose_project(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", "")
+    state_file = tmp_path / "containers.json"
+    registry = {**fake_docker.container("", ""), "Names": "registry", "Labels": ""}
+    fake_docker.save(state_file, [fake_docker.container("lab", "traefik"), registry])
+    server = fake_docker.serve_engine_api(tmp_path / "docker.sock", state_file)
+    orchestrator = ServiceOrchestrator(State(str(tmp_path / "state.json")), "docker")
+    try:
+        assert set(orchestrator.get_running_pods()) == {"lab-traefik-1", "registry"}
+        assert orchestrator.check_pod_status("registry")
+        assert orchestrator.check_pod_status("lab-traefik-1")
+        assert not orchestrator.check_pod_status("missing")
+        assert [pod.name for pod in orchestrator.containers()] == ["lab-traefik-1"]
+    finally:
+        if orchestrator.inventory is not None:
+            orchestrator.inventory.close()
+        server.shutdown()
+
+
+def test_orchestrator_falls_back_to_cli_without_socket(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{tmp_path}/missing.sock")
+    commands = []
+
+    def run_cmd(cmd, envs=None):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, json.dumps(DOCKER_PS_LINE), "")
+
+    monkeypatch.setattr(_orchestrator, "run_cmd", run_cmd)
+    orchestrator = ServiceOrchestrator(State(str(tmp_path / "state.json")), "docker")
+
+    assert orchestrator.engine is None
+    assert orchestrator.get_pod_by_service("lab", "traefik") == DOCKER_PS_LINE
+    assert orchestrator.check_pod_status("lab-traefik-1")
+    assert commands[0][1:] == [
+        "ps",
+        "--filter",
+        "label=com.docker.compose.project=lab",
+        "--filter",
+        "label=com.docker.compose.service=traefik",
+        "--format",
+        "json",
+    ]
+
+
+def test_orchestrator_reads_inventory_kept_current_by_events(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCKER_HOST", "")
+    state_file = tmp_path / "containers.json"
+    fake_docker.save(state_file, [fake_docker.container("lab", "traefik")])
+    server = fake_docker.serve_engine_api(tmp_path / "docker.sock", state_file)
+    state = State(str(tmp_path / "state.json"))
+    state.set_item("labs", "lab", fake_lab("lab"))
+    orchestrator = ServiceOrchestrator(state, "docker")
+    try:
+        assert orchestrator.check_pod_status("lab-traefik-1")
+        assert orchestrator.inventory.live
+
+        # Reads no longer list containers
+        def containers(**filters):
+            raise AssertionError("listed containers")
+
+        monkeypatch.setattr(orchestrator, "containers", containers)
+        fake_docker.save(
+            state_file,
+            [
+                fake_docker.container("lab", "traefik"),
+                fake_docker.container("lab", "appwrite"),
+            ],
+        )
+        deadline = time.monotonic() + 5
+        while len(orchestrator.get_pods_by_project("lab")) < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+        assert orchestrator.get_formatted_labs(collapsed=True)[1][0][-1] == "healthy"
+
+        fake_docker.save(state_file, [])
+        while orchestrator.get_pods_by_project("lab"):
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+        assert orchestrator.get_formatted_labs(collapsed=True)[1][0][-1] == "stopped"
+    finally:
+        orchestrator.inventory.close()
+        server.shutdown()
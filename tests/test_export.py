@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from appwrite_lab import _export
+from appwrite_lab._export import Exporter
+from appwrite_lab._seed import read_records
+from appwrite_lab.automations.automations import LabContext
+from appwrite_lab.models import Lab
+
+LISTS = {
+    "/databases": {"databases": [{"$id": "main"}]},
+    "/databases/main/collections": {
+        "collections": [
+            {
+                "$id": "posts",
+                "databaseId": "main",
+                "attributes": [{"key": "author", "type": "relationship"}],
+            }
+        ]
+    },
+    "/databases/main/collections/posts/documents": {
+        "documents": [
+            {
+                "$id": f"post{i}",
+                "title": f"Post {i}",
+                "author": {"$id": "alice", "name": "Alice"},
+                "$createdAt": "now",
+                "$permissions": [],
+            }
+            for i in range(5)
+        ]
+    },
+    "/users": {"users": [{"$id": "alice", "password": "hash", "hash": "argon2"}]},
+    "/storage/buckets": {"buckets": [{"$id": "avatars"}]},
+    "/storage/buckets/avatars/files": {
+        "files": [{"$id": f"file{i}", "name": f"{i}.png"} for i in range(3)]
+    },
+}
+
+
+class FakeAppwrite:
+    """Read-only list and download API paging with cursors."""
+
+    def __init__(self):
+        self.queries: list[list[str]] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/v1")
+        if path.endswith("/download"):
+            return httpx.Response(200, content=path.split("/")[-2].encode())
+        queries = [json.loads(q) for q in request.url.params.get_list("queries[]")]
+        self.queries.append(queries)
+        (key, items), *_ = LISTS[path].items()
+        limit = next(q["values"][0] for q in queries if q["method"] == "limit")
+        cursor = next(
+            (q["values"][0] for q in queries if q["method"] == "cursorAfter"), None
+        )
+        start = [item["$id"] for item in items].index(cursor) + 1 if cursor else 0
+        return httpx.Response(200, json={key: items[start : start + limit]})
+
+
+@pytest.fixture
+def server(mock_transport, monkeypatch):
+    fake = FakeAppwrite()
+    mock_transport(fake.handle)
+    monkeypatch.setattr(_export, "PAGE_SIZE", 2)
+    return fake
+
+
+def test_export_writes_a_seed_source(
+    server: FakeAppwrite, mock_lab: Lab, tmp_path: Path
+):
+    project = mock_lab.projects["default"]
+    with LabContext(mock_lab, project) as context, Exporter(context) as exporter:
+        report = exporter.export(tmp_path)
+
+    assert not report.errors
+    assert report.documents == {"main/posts": 5}
+    assert (report.users, report.files) == (1, 3)
+
+    documents = list(read_records(tmp_path / "collections" / "main" / "posts.ndjson"))
+    assert [d["$id"] for d in documents] == [f"post{i}" for i in range(5)]
+    assert documents[0] == {
+        "$id": "post0",
+        "title": "Post 0",
+        "author": "alice",
+        "$permissions": [],
+    }
+    assert list(read_records(tmp_path / "users.ndjson"))[0]["hash"] == "argon2"
+    assert (tmp_path / "buckets" / "avatars" / "file2" / "2.png").read_bytes() == (
+        b"file2"
+    )
+    # Pages of two: two cursor requests for the documents, one for the files
+    assert sum(len(queries) == 2 for queries in server.queries) == 3
@@ -1,8 +1,13 @@
 from appwrite_lab.models import Lab
 from appwrite_lab.labs import Labs
 from appwrite_lab.automations.models import Expiration
+from appwrite_lab._orchestrator import Response
+from appwrite_lab.cli import new_menu
 import pytest
+import threading
+import time
 import uuid
+from typer.testing import CliRunner
 
 @pytest.mark.e2e
 def test_labs_new(lab: Lab):
@@ -58,3 +63,61 @@ def test_labs_create_project(lab: Lab, lab_svc: Labs):
     assert not res.error
     assert type(res.data) is str
     assert res.data.startswith("standard_")
+
+
+class SlowLabs(Labs):
+    """Labs whose `new` only takes as long as the lab's number, and records it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.most_running = 0
+        self.specs = []
+
+    def new(self, name: str, version: str, **kwargs):
+        with self.lock:
+            self.specs.append({"name": name, "version": version, **kwargs})
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        try:
+            delay = int(name.rsplit("-", 1)[1])
+            time.sleep(delay * 0.1)
+            if delay == 2:
+                raise RuntimeError("compose up failed")
+            return Response(message=f"Lab '{name}' deployed.", data=name)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_labs_new_many():
+    labs = SlowLabs()
+    specs = [{"name": f"lab-{i}", "version": "1.7.4"} for i in (4, 2, 1, 3)]
+    results = list(labs.new_many(specs, max_parallel=2))
+
+    assert labs.most_running == 2
+    # lab-4 and lab-2 start first; lab-1 and lab-3 take lab-2's slot in turn
+    assert [name for name, _ in results] == ["lab-2", "lab-1", "lab-4", "lab-3"]
+    res = dict(results)
+    assert res["lab-2"].error
+    assert "compose up failed" in res["lab-2"].message
+    assert not res["lab-4"].error and res["lab-4"].data == "lab-4"
+
+
+def test_new_lab_cli_with_count(monkeypatch):
+    labs = SlowLabs()
+    monkeypatch.setattr(new_menu, "get_global_labs", lambda: labs)
+    result = CliRunner().invoke(
+        new_menu.new_menu,
+        ["lab", "lab", "--count", "3", "--max-parallel", "3", "--just-deploy"],
+    )
+    assert result.exit_code == 0
+    assert labs.most_running == 3
+    assert sorted(spec["name"] for spec in labs.specs) == ["lab-1", "lab-2", "lab-3"]
+    assert all(spec["just_deploy"] for spec in labs.specs)
+
+    result = CliRunner().invoke(
+        new_menu.new_menu, ["lab", "lab", "--count", "2", "--port", "8080"]
+    )
+    assert result.exit_code == 1
+    assert len(labs.specs) == 3
@@ -1,6 +1,16 @@
+import json
 import pytest
-from appwrite_lab._orchestrator import ServiceOrchestrator, get_template_versions
+from appwrite_lab import _orchestrator
+from appwrite_lab._orchestrator import (
+    ServiceOrchestrator,
+    get_template_versions,
+    allocate_lab_ports,
+    get_lab_env_vars,
+    LAB_PORT_VARS,
+    Response,
+)
 from appwrite_lab._state import State
+from appwrite_lab.models import Automation, AutomationStep, Lab
 
 
 @pytest.fixture()
@@ -16,6 +26,7 @@ def orchestrator(state: State):
     return ServiceOrchestrator(state)
 
 
+@pytest.mark.e2e
 def test_orchestrator_init(orchestrator: ServiceOrchestrator):
     assert orchestrator.backend == "docker"
     assert orchestrator.util.endswith("docker")
@@ -30,10 +41,66 @@ def test_get_templates():
     # assert all(template.endswith(".yml") for template in templates)
 
 
+def test_allocate_lab_ports():
+    ports = allocate_lab_ports()
+    assert set(ports) == set(LAB_PORT_VARS)
+    assert len(set(ports.values())) == len(ports)
+    assert allocate_lab_ports(8085)["http"] == 8085
+
+
+def test_lab_env_vars_are_namespaced():
+    env_vars = get_lab_env_vars("lab-1", allocate_lab_ports(8085))
+    assert env_vars["_APP_LAB_NAMESPACE"] == "lab-1"
+    assert env_vars["_APP_LAB_NETWORK"] == "lab-1_appwrite"
+    assert env_vars["_APP_COMPUTE_RUNTIMES_NETWORK"] == "lab-1_runtimes"
+    assert env_vars["_APP_PORT"] == "8085"
+
+
+def test_automation_plan_batches_playwright_steps(
+    orchestrator: ServiceOrchestrator, monkeypatch
+):
+    runs = []
+
+    def run_console_automation(lab, automation, project, model, client):
+        runs.append(("http", [automation.value]))
+        return f"{automation.value}-result"
+
+    def deploy_playwright_automation(lab, automation, project, model, **kwargs):
+        plan = [step["automation"] for step in json.loads(model.plan)]
+        runs.append(("playwright", plan))
+        return Response(
+            message="", data=json.dumps([f"{step}-result" for step in plan])
+        )
+
+    monkeypatch.setattr(_orchestrator, "run_console_automation", run_console_automation)
+    monkeypatch.setattr(
+        orchestrator, "deploy_playwright_automation", deploy_playwright_automation
+    )
+    lab = Lab(name="lab", version="1.7.4", url="http://lab")
+    res = orchestrator.run_automation_plan(
+        lab,
+        [
+            AutomationStep(Automation.CREATE_PROJECT),
+            AutomationStep(Automation.SYNC_PROJECT),
+            AutomationStep(Automation.SYNC_PROJECT),
+            AutomationStep(Automation.CREATE_API_KEY),
+        ],
+    )
+    assert not res.error
+    assert runs == [
+        ("http", ["create_project"]),
+        ("playwright", ["sync_project", "sync_project"]),
+        ("http", ["create_api_key"]),
+    ]
+    assert res.data[-1] == "create_api_key-result"
+
+
+@pytest.mark.e2e
 def test_check_pod_status(orchestrator: ServiceOrchestrator):
     running = orchestrator.check_pod_status("appwrite")
 
 
+@pytest.mark.e2e
 def test_deploy_service(orchestrator: ServiceOrchestrator):
     response = orchestrator.deploy_appwrite_lab(
         name="lab-1", version="1.7.4", port=8085
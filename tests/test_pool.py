@@ -0,0 +1,103 @@
+import pytest
+from appwrite_lab._orchestrator import Response
+from appwrite_lab.models import Lab
+from appwrite_lab.pool import LabPool, LabPoolError
+
+
+class FakeLabs:
+    def __init__(self):
+        self.labs: dict[str, Lab] = {}
+        self.broken = False
+        self.snapshots: set[tuple[str, str]] = set()
+        self.restored: list[str] = []
+        # Labs whose containers are gone
+        self.dead: set[str] = set()
+
+    def get_lab(self, name: str):
+        return self.labs.get(name)
+
+    def new(self, name: str, version: str):
+        if self.broken:
+            return Response(message="compose up failed", error=True)
+        self.labs[name] = Lab(name=name, version=version, url="")
+        self.dead.discard(name)
+        return Response(message=f"Lab '{name}' deployed.")
+
+    def new_many(self, specs: list[dict], max_parallel: int = 4):
+        for spec in specs:
+            yield spec["name"], self.new(**spec)
+
+    def status(self, name: str) -> str:
+        return "stopped" if name in self.dead else "healthy"
+
+    def stop(self, name: str):
+        self.labs.pop(name)
+
+    def snapshot(self, name: str, tag: str):
+        self.snapshots.add((name, tag))
+        return Response(message=f"Snapshot '{tag}' of lab '{name}' created.")
+
+    def restore(self, name: str, tag: str):
+        self.restored.append(name)
+        broken = self.broken or (name, tag) not in self.snapshots
+        return Response(message="", error=broken)
+
+
+def test_lab_pool_lease_and_release():
+    labs = FakeLabs()
+    with LabPool(labs, size=2, prefix="pool") as pool:
+        pool.fill()
+        leased = {pool.lease(timeout=1).name, pool.lease(timeout=1).name}
+        assert leased == {"pool-1", "pool-2"}
+        with pytest.raises(LabPoolError):
+            pool.lease(timeout=0.05)
+
+        pool.release("pool-1")
+        assert pool.lease(timeout=1).name == "pool-1"
+        assert labs.restored == ["pool-1"]
+
+
+def test_lab_pool_release_unknown_lab():
+    with LabPool(FakeLabs(), size=1) as pool:
+        with pytest.raises(LabPoolError):
+            pool.release("not-leased")
+
+
+def test_lab_pool_fill_is_idempotent():
+    with LabPool(FakeLabs(), size=2) as pool:
+        pool.fill()
+        pool.fill()
+        pool.lease(timeout=1)
+        pool.lease(timeout=1)
+        with pytest.raises(LabPoolError, match="within"):
+            pool.lease(timeout=0.05)
+
+
+def test_lab_pool_raises_once_no_lab_can_come_back():
+    labs = FakeLabs()
+    with LabPool(labs, size=1) as pool:
+        pool.fill()
+        lab = pool.lease(timeout=1)
+        labs.broken = True
+        pool.release(lab)
+        # No timeout: the lease must fail instead of waiting forever
+        with pytest.raises(LabPoolError, match="compose up failed"):
+            pool.lease()
+        assert "pool-1" in pool.lost
+
+
+def test_lab_pool_replaces_dead_labs_on_lease():
+    labs = FakeLabs()
+    with LabPool(labs, size=1) as pool:
+        pool.fill()
+        labs.dead.add("pool-1")
+        assert pool.lease(timeout=5).name == "pool-1"
+        # Redeployed and snapshotted again, not restored
+        assert not labs.dead
+        assert not labs.restored
+
+        labs.dead.add("pool-1")
+        labs.broken = True
+        pool.release("pool-1", reset=False)
+        with pytest.raises(LabPoolError, match="compose up failed"):
+            pool.lease()
@@ -0,0 +1,41 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from appwrite_lab._orchestrator import (
+    LAB_PORT_VARS,
+    allocate_lab_ports,
+    port_allocation,
+)
+from appwrite_lab.utils import get_free_ports
+
+
+def test_free_ports_are_distinct():
+    ports = get_free_ports(32)
+    assert len(set(ports)) == 32
+
+
+def test_allocate_lab_ports_keeps_the_requested_port():
+    ports = allocate_lab_ports(8123)
+    assert ports["http"] == 8123
+    assert set(ports) == set(LAB_PORT_VARS)
+    assert len(set(ports.values())) == len(LAB_PORT_VARS)
+
+
+def test_port_allocation_is_held_by_one_deploy_at_a_time(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    holders, overlaps = [], []
+    lock = threading.Lock()
+
+    def deploy(_):
+        with port_allocation():
+            with lock:
+                holders.append(1)
+                overlaps.append(len(holders))
+            time.sleep(0.01)
+            with lock:
+                holders.pop()
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(deploy, range(16)))
+    assert max(overlaps) == 1
@@ -0,0 +1,206 @@
+import copy
+import json
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from appwrite_lab._push import SchemaPusher, attribute_changes, attribute_endpoint
+from appwrite_lab.models import SyncType
+from appwrite_lab.utils import load_config
+
+
+class FakeAppwrite:
+    """In-memory databases and buckets API that settles attributes instantly."""
+
+    def __init__(self):
+        self.resources: dict[str, dict] = {}
+        self.calls: list[tuple[str, str]] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        method, path = request.method, request.url.path.removeprefix("/v1")
+        body = json.loads(request.content) if request.content else {}
+        self.calls.append((method, path))
+        parts = path.strip("/").split("/")
+
+        if method == "GET":
+            if path not in self.resources:
+                return httpx.Response(404, json={"message": "Not found"})
+            return httpx.Response(200, json=self.resources[path])
+        if method == "DELETE":
+            collection = self.resources["/" + "/".join(parts[:-2])]
+            collection[parts[-2]] = [
+                item for item in collection[parts[-2]] if item["key"] != parts[-1]
+            ]
+            return httpx.Response(204)
+        if "attributes" in parts:
+            collection = self.resources[
+                "/" + "/".join(parts[: parts.index("attributes")])
+            ]
+            kind = parts[parts.index("attributes") + 1]
+            if method == "POST":
+                attribute = {**body, "type": kind, "status": "available"}
+                if kind == "relationship":
+                    # Listed with the names appwrite.json uses
+                    attribute["relatedCollection"] = body["relatedCollectionId"]
+                    attribute["relationType"] = body["type"]
+                    attribute.update(array=False, required=False)
+                collection["attributes"].append(attribute)
+            else:
+                # Relationships are updated at `/attributes/{key}/relationship`
+                if kind == "relationship":
+                    return httpx.Response(404, json={"message": "Route not found"})
+                key = parts[-2] if parts[-1] == "relationship" else parts[-1]
+                attribute = next(a for a in collection["attributes"] if a["key"] == key)
+                attribute.update(body)
+            return httpx.Response(201, json=attribute)
+        if parts[-1] == "indexes":
+            index = {**body, "status": "available"}
+            self.resources["/" + "/".join(parts[:-1])]["indexes"].append(index)
+            return httpx.Response(201, json=index)
+        if method == "POST":
+            resource_id = next(v for k, v in body.items() if k.endswith("Id"))
+            resource = {"$id": resource_id, "attributes": [], "indexes": []}
+            resource.update(body)
+            if "permissions" in body:
+                resource["$permissions"] = body["permissions"]
+            self.resources[f"{path}/{resource_id}"] = resource
+            return httpx.Response(201, json=resource)
+        self.resources[path].update(body)
+        return httpx.Response(200, json=self.resources[path])
+
+
+@pytest.fixture
+def server(mock_transport):
+    fake = FakeAppwrite()
+    mock_transport(fake.handle)
+    return fake
+
+
+@pytest.fixture
+def config():
+    config = load_config(Path(__file__).parent / "data" / "appwrite.json")
+    config["collections"][0]["indexes"] = [
+        {"key": "by_error", "type": "key", "attributes": ["is_error"], "orders": []}
+    ]
+    return config
+
+
+def push(config: dict, allow_recreate: bool = False):
+    with SchemaPusher(
+        "http://lab", "project", "key", allow_recreate=allow_recreate
+    ) as pusher:
+        return pusher.push(config, resources=[SyncType.COLLECTIONS])
+
+
+def test_push_creates_then_skips(server: FakeAppwrite, config: dict):
+    report = push(config)
+    assert "database:6886997800119a565d99" in report.created
+    assert "attribute:6886998b001f814e0099.log_data" in report.created
+    assert "index:6886998b001f814e0099.by_error" in report.created
+
+    assert {"collections", "collection:6886998b001f814e0099"} <= report.timings.keys()
+
+    before = len(server.calls)
+    report = push(config)
+    assert not report.changed
+    assert all(method == "GET" for method, _ in server.calls[before:])
+
+
+def test_push_applies_only_changes(server: FakeAppwrite, config: dict):
+    push(config)
+    changed = copy.deepcopy(config)
+    attributes = changed["collections"][0]["attributes"]
+    attributes[0]["size"] = 2000
+    attributes[1]["type"] = "integer"
+    changed["collections"][0]["indexes"] = []
+
+    report = push(changed, allow_recreate=True)
+    assert report.updated == ["attribute:6886998b001f814e0099.log_data"]
+    assert report.recreated == ["attribute:6886998b001f814e0099.is_error"]
+    assert "attribute:6886998b001f814e0099.is_error" in report.deleted
+    assert "attribute:6886998b001f814e0099.is_error" in report.created
+    assert "index:6886998b001f814e0099.by_error" in report.deleted
+
+
+def test_push_reports_recreates_unless_allowed(server: FakeAppwrite, config: dict):
+    push(config)
+    changed = copy.deepcopy(config)
+    changed["collections"][0]["attributes"][1]["type"] = "integer"
+
+    report = push(changed)
+    assert report.recreate_skipped == ["attribute:6886998b001f814e0099.is_error"]
+    assert not report.deleted
+    assert not any(method == "DELETE" for method, _ in server.calls)
+
+
+def test_push_updates_relationships(server: FakeAppwrite, config: dict):
+    collection = config["collections"][0]
+    collection["attributes"].append(
+        {
+            "key": "parent",
+            "type": "relationship",
+            "required": False,
+            "array": False,
+            "relatedCollection": collection["$id"],
+            "relationType": "manyToOne",
+            "twoWay": False,
+            "onDelete": "restrict",
+        }
+    )
+    push(config)
+    changed = copy.deepcopy(config)
+    changed["collections"][0]["attributes"][-1]["onDelete"] = "cascade"
+
+    report = push(changed)
+    assert report.updated == ["attribute:6886998b001f814e0099.parent"]
+    path = f"/databases/{collection['databaseId']}/collections/{collection['$id']}"
+    assert ("PATCH", f"{path}/attributes/parent/relationship") in server.calls
+    assert not push(changed).changed
+
+
+def test_push_limits_requests_in_flight(server: FakeAppwrite, monkeypatch):
+    in_flight, peak, lock = 0, 0, threading.Lock()
+    handle = server.handle
+
+    def slow_handle(request: httpx.Request):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return handle(request)
+
+    monkeypatch.setattr(server, "handle", slow_handle)
+    config = {
+        "buckets": [{"$id": f"bucket{i}", "name": f"Bucket {i}"} for i in range(6)],
+        "teams": [{"$id": f"team{i}", "name": f"Team {i}"} for i in range(6)],
+    }
+    with SchemaPusher("http://lab", "project", "key", max_parallel=2) as pusher:
+        report = pusher.push(config, resources=[SyncType.BUCKETS, SyncType.TEAMS])
+    assert len(report.created) == 12
+    assert peak <= 2
+    assert {"buckets", "teams"} <= report.timings.keys()
+
+
+def test_attribute_changes():
+    local = {"key": "a", "type": "string", "size": 10, "required": False}
+    assert attribute_changes(local, {**local, "status": "available"}) is None
+    assert attribute_changes(local, {**local, "size": 20}) == "update"
+    assert attribute_changes(local, {**local, "array": True}) is None
+    assert attribute_changes({**local, "array": False}, {**local, "array": True}) == (
+        "recreate"
+    )
+    # The server leaves out an empty format
+    assert attribute_changes({**local, "format": ""}, local) is None
+    assert attribute_changes(local, {**local, "format": ""}) is None
+    assert attribute_changes({**local, "format": "email"}, local) == "recreate"
+
+
+def test_attribute_endpoint():
+    assert attribute_endpoint({"type": "string", "format": "email"}) == "email"
+    assert attribute_endpoint({"type": "double"}) == "float"
+    assert attribute_endpoint({"type": "string", "format": ""}) == "string"
@@ -0,0 +1,33 @@
+from appwrite_lab._readiness import wait_until_ready, is_pod_healthy
+
+
+def test_wait_until_ready_records_ready_components():
+    calls = {"n": 0}
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise ConnectionError("not yet")
+        return True
+
+    report = wait_until_ready(
+        {"api": flaky, "db": lambda: True}, timeout=5, initial_delay=0.01
+    )
+    assert report.is_ready
+    assert set(report.ready) == {"api", "db"}
+    assert report.ready["db"] <= report.ready["api"]
+
+
+def test_wait_until_ready_reports_pending_at_deadline():
+    report = wait_until_ready({"api": lambda: False}, timeout=0.1, initial_delay=0.01)
+    assert not report.is_ready
+    assert report.pending == ["api"]
+
+
+def test_is_pod_healthy():
+    assert is_pod_healthy({"State": "running", "Status": "Up 3 seconds"})
+    assert is_pod_healthy({"State": "running", "Status": "Up 3 seconds (healthy)"})
+    assert not is_pod_healthy(
+        {"State": "running", "Status": "Up 1 second (health: starting)"}
+    )
+    assert not is_pod_healthy({"State": "exited", "Status": "Exited (1)"})
@@ -0,0 +1,190 @@
+import json
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+from appwrite_lab._seed import Seeder, coerce_csv_record
+from appwrite_lab.automations.automations import LabContext, LabRequestError
+from appwrite_lab.models import Lab
+
+
+class FakeAppwrite:
+    """In-memory documents, users and files API that rate limits the first request."""
+
+    def __init__(self):
+        self.documents: dict[str, dict] = {}
+        self.users: dict[str, dict] = {}
+        self.files: dict[str, bytes] = {}
+        self.calls: list[tuple[str, str]] = []
+        self.rate_limited = False
+        self.lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        method, path = request.method, request.url.path.removeprefix("/v1")
+        with self.lock:
+            self.calls.append((method, path))
+            if not self.rate_limited:
+                self.rate_limited = True
+                return httpx.Response(429, headers={"Retry-After": "0"})
+        parts = path.strip("/").split("/")
+
+        if parts[-1] == "documents":
+            body = json.loads(request.content)
+            documents = body.get("documents") or [
+                {"$id": body["documentId"], **body["data"]}
+            ]
+            with self.lock:
+                if any(d.get("$id") in self.documents for d in documents):
+                    return httpx.Response(409, json={"message": "Document exists"})
+                for document in documents:
+                    self.documents[document.get("$id", str(len(self.documents)))] = (
+                        document
+                    )
+            return httpx.Response(201, json={"total": len(documents)})
+        if method == "GET":
+            return httpx.Response(
+                200,
+                json={
+                    "attributes": [
+                        {"key": "count", "type": "integer"},
+                        {"key": "done", "type": "boolean"},
+                        {"key": "tags", "type": "string", "array": True},
+                    ]
+                },
+            )
+        if parts[0] == "users" and len(parts) <= 2:
+            body = json.loads(request.content)
+            with self.lock:
+                if body["userId"] in self.users:
+                    return httpx.Response(409, json={"message": "User exists"})
+                self.users[body["userId"]] = {**body, "endpoint": path}
+            return httpx.Response(201, json={"$id": body["userId"]})
+        if parts[0] == "users":
+            self.users[parts[1]][parts[2]] = json.loads(request.content)
+            return httpx.Response(200, json={})
+        if parts[-1] == "files":
+            with self.lock:
+                self.files[f"{parts[2]}/{len(self.files)}"] = request.content
+            return httpx.Response(201, json={"$id": "file"})
+        return httpx.Response(404, json={"message": "Not found"})
+
+
+@pytest.fixture
+def server(mock_transport):
+    fake = FakeAppwrite()
+    mock_transport(fake.handle)
+    return fake
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    collection = tmp_path / "collections" / "main"
+    collection.mkdir(parents=True)
+    (collection / "logs.ndjson").write_text(
+        "\n".join(
+            json.dumps({"$id": f"log{i}", "message": f"Log {i}", "$createdAt": "now"})
+            for i in range(5)
+        )
+    )
+    (collection / "tasks.csv").write_text(
+        'count,done,tags\n1,true,"[""a""]"\n2,false,\n'
+    )
+    (tmp_path / "users.json").write_text(
+        json.dumps(
+            [
+                {"$id": "alice", "email": "alice@local.dev", "password": "password12"},
+                {
+                    "$id": "bob",
+                    "email": "bob@local.dev",
+                    "password": "$2y$10$hash",
+                    "hash": "bcrypt",
+                    "labels": ["admin"],
+                },
+            ]
+        )
+    )
+    bucket = tmp_path / "buckets" / "avatars"
+    (bucket / "kept-id").mkdir(parents=True)
+    (bucket / "a.png").write_bytes(b"a")
+    (bucket / "kept-id" / "b.png").write_bytes(b"b")
+    return tmp_path
+
+
+def seed(source: Path, lab: Lab):
+    project = lab.projects["default"]
+    with (
+        LabContext(lab, project, max_parallel=4, backoff=0) as context,
+        Seeder(context, batch_size=2) as seeder,
+    ):
+        return seeder.seed(source)
+
+
+def test_seed_writes_every_source(server: FakeAppwrite, source: Path, mock_lab: Lab):
+    report = seed(source, mock_lab)
+    assert not report.errors
+    assert report.documents == {"main/logs": 5, "main/tasks": 2}
+    assert (report.users, report.files) == (2, 2)
+    assert {"users", "collection:main/logs", "bucket:avatars"} <= report.timings.keys()
+
+    assert "$createdAt" not in server.documents["log0"]
+    assert server.users["bob"]["endpoint"] == "/users/bcrypt"
+    assert server.users["bob"]["labels"] == {"labels": ["admin"]}
+    # Logs go in batches of two, after the rate limited request is retried
+    batches = [call for call in server.calls if call[1].endswith("logs/documents")]
+    assert len(batches) <= 4
+
+
+def test_seed_again_skips_existing(server: FakeAppwrite, source: Path, mock_lab: Lab):
+    seed(source, mock_lab)
+    report = seed(source, mock_lab)
+    assert not report.errors
+    assert report.documents["main/logs"] == 0
+    # Logs and users have IDs; tasks without one are created again
+    assert report.skipped == 5 + 2
+    assert report.documents["main/tasks"] == 2
+
+
+def test_seed_without_bulk_api(server: FakeAppwrite, source: Path, mock_lab: Lab):
+    mock_lab.version = "1.6.2"
+    report = seed(source, mock_lab)
+    assert report.documents["main/logs"] == 5
+    writes = [call for call in server.calls if call[1].endswith("logs/documents")]
+    assert len(writes) >= 5
+
+
+def test_unique_ids_are_not_retried_on_server_errors(mock_transport, mock_lab: Lab):
+    bodies = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(503, json={"message": "Unavailable"})
+
+    mock_transport(handle)
+    path = "/databases/main/collections/logs/documents"
+    with LabContext(mock_lab, mock_lab.projects["default"], backoff=0) as context:
+        with pytest.raises(LabRequestError):
+            context.request("POST", path, json={"documentId": "unique()", "data": {}})
+        with pytest.raises(LabRequestError):
+            context.request("POST", path, json={"documents": [{"message": "a"}]})
+        assert len(bodies) == 2
+        # A fixed ID cannot create a duplicate, so it is retried
+        with pytest.raises(LabRequestError):
+            context.request("POST", path, json={"documentId": "log0", "data": {}})
+        assert len(bodies) == 2 + 6
+
+
+def test_coerce_csv_record():
+    attributes = {
+        "count": {"type": "integer"},
+        "score": {"type": "double"},
+        "done": {"type": "boolean"},
+        "tags": {"type": "string", "array": True},
+    }
+    record = {"count": "3", "score": "1.5", "done": "TRUE", "tags": '["a"]', "x": ""}
+    assert coerce_csv_record(record, attributes) == {
+        "count": 3,
+        "score": 1.5,
+        "done": True,
+        "tags": ["a"],
+    }
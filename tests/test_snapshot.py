@@ -0,0 +1,112 @@
+import json
+
+import httpx
+import pytest
+
+from appwrite_lab._discovery import Toolchain
+from appwrite_lab._orchestrator import Response, ServiceOrchestrator, get_golden_name
+from appwrite_lab._readiness import ReadinessReport
+from appwrite_lab._state import State
+from appwrite_lab.models import Lab, Project
+from appwrite_lab.utils import get_snapshot_dir
+from benchmarks.lifecycle import fake_lab
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    orchestrator = ServiceOrchestrator(State(tmp_path / "state.json"))
+    orchestrator.toolchain = Toolchain(
+        "docker", "/usr/bin/docker", ("/usr/bin/docker", "compose"), "compose-plugin"
+    )
+    return orchestrator
+
+
+def test_volume_archive_cmd(orchestrator, tmp_path):
+    cmd = orchestrator._volume_archive_cmd("lab_mariadb", "mariadb", tmp_path)
+    assert cmd[:3] == ["/usr/bin/docker", "run", "--rm"]
+    assert "lab_mariadb:/data:ro" in cmd
+    assert f"{tmp_path}:/snapshot:Z" in cmd
+    assert cmd[-1] == "tar -C /data -cf /snapshot/mariadb.tar ."
+
+    cmd = orchestrator._volume_archive_cmd(
+        "lab_mariadb", "mariadb", tmp_path, restore=True
+    )
+    assert "lab_mariadb:/data" in cmd
+    assert cmd[-1] == (
+        "find /data -mindepth 1 -delete && tar -C /data -xf /snapshot/mariadb.tar"
+    )
+
+
+def test_restore_fails_when_the_lab_does_not_come_back(orchestrator, monkeypatch):
+    lab = fake_lab("lab")
+    orchestrator.state.set_item("labs", "lab", lab)
+    snapshot_dir = get_snapshot_dir("lab", "clean")
+    snapshot_dir.mkdir(parents=True)
+    (snapshot_dir / "mariadb.tar").write_bytes(b"")
+    (snapshot_dir / "lab.json").write_text(
+        json.dumps({**lab, "admin_password": "from-snapshot"})
+    )
+    jobs = []
+    monkeypatch.setattr(
+        orchestrator,
+        "_with_lab_stopped",
+        lambda name, cmds: jobs.extend(cmds) or Response(message=""),
+    )
+    monkeypatch.setattr(
+        orchestrator,
+        "wait_for_lab",
+        lambda name, url: ReadinessReport(ready={"api": 1.0}, pending=["console"]),
+    )
+
+    res = orchestrator.restore_lab("lab", "clean")
+    assert res.error
+    assert "console" in res.message
+    assert len(jobs) == 1
+    assert orchestrator.get_lab("lab").admin_password == "password"
+
+
+def test_golden_name():
+    assert get_golden_name("1.7.4") == "golden-1-7-4"
+
+
+def test_deploy_from_golden_issues_a_fresh_user_and_team(
+    orchestrator, mock_transport, monkeypatch
+):
+    golden = Lab(**fake_lab(get_golden_name("1.7.4")))
+    golden.projects = {"default": Project("golden-project", "Golden")}
+    lab = Lab(name="lab", version="1.7.4", url="http://lab")
+    monkeypatch.setattr(
+        orchestrator,
+        "restore_lab",
+        lambda name, tag, source: Response(message="", data=golden),
+    )
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append((request.method, request.url.path))
+        if request.url.path == "/v1/projects/golden-project":
+            return httpx.Response(200, json={"teamId": "golden-team"})
+        if request.url.path == "/v1/teams":
+            return httpx.Response(201, json={"$id": "team"})
+        return httpx.Response(201, json={"secret": "key"})
+
+    mock_transport(handler)
+
+    res = orchestrator._deploy_from_golden(lab)
+    assert not res.error
+    project = lab.projects["default"]
+    assert calls == [
+        ("POST", "/v1/account/sessions/email"),
+        ("GET", "/v1/projects/golden-project"),
+        ("DELETE", "/v1/projects/golden-project"),
+        ("DELETE", "/v1/teams/golden-team"),
+        ("PATCH", "/v1/account/status"),
+        ("POST", "/v1/account"),
+        ("POST", "/v1/account/sessions/email"),
+        ("POST", "/v1/teams"),
+        ("POST", "/v1/projects"),
+        ("POST", f"/v1/projects/{project.project_id}/keys"),
+    ]
+    assert project.api_key == "key"
+    assert orchestrator.get_lab("lab").admin_email == lab.admin_email
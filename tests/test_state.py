@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from appwrite_lab._state import State, StateError
+
+WRITER = """
+import sys
+from appwrite_lab._state import State
+
+state = State(sys.argv[1])
+for i in range(25):
+    state.set_item("labs", f"{sys.argv[2]}-{i}", {"name": f"{sys.argv[2]}-{i}"})
+"""
+
+
+def test_states_see_and_keep_each_others_labs(tmp_path):
+    path = tmp_path / "state.json"
+    first, second = State(path), State(path)
+    first.set_item("labs", "a", {"name": "a"})
+    second.set_item("labs", "b", {"name": "b"})
+    assert first.get("labs").keys() == {"a", "b"}
+
+    assert first.pop_item("labs", "b") == {"name": "b"}
+    assert second.get("labs") == {"a": {"name": "a"}}
+    assert json.loads(path.read_text()) == {"labs": {"a": {"name": "a"}}}
+
+
+def test_concurrent_processes_keep_every_lab(tmp_path):
+    path = tmp_path / "state.json"
+    workers = [
+        subprocess.Popen([sys.executable, "-c", WRITER, str(path), f"worker{n}"])
+        for n in range(4)
+    ]
+    assert all(worker.wait() == 0 for worker in workers)
+    assert len(State(path).get("labs")) == 100
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_failed_transaction_is_not_saved(tmp_path):
+    state = State(tmp_path / "state.json")
+    state.set("version", 1)
+    with pytest.raises(RuntimeError):
+        with state.transaction() as data:
+            data["version"] = 2
+            raise RuntimeError
+    assert state.get("version") == 1
+
+
+def test_corrupt_state_file_raises(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text("{")
+    with pytest.raises(StateError):
+        State(path)
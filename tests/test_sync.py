@@ -0,0 +1,47 @@
+import copy
+from pathlib import Path
+
+import pytest
+from appwrite_lab._sync import changed_resources, filter_config, fingerprint_config
+from appwrite_lab.models import SyncType
+from appwrite_lab.utils import load_config
+
+
+@pytest.fixture
+def config():
+    return load_config(Path(__file__).parent / "data" / "appwrite.json")
+
+
+def test_fingerprint_config(config: dict):
+    fingerprints = fingerprint_config(config)
+    assert set(fingerprints) == {SyncType.CONFIG, SyncType.COLLECTIONS}
+    assert set(fingerprints[SyncType.COLLECTIONS]) == {
+        "databases/6886997800119a565d99",
+        "6886998b001f814e0099",
+    }
+    assert fingerprint_config(copy.deepcopy(config)) == fingerprints
+
+
+def test_only_edited_collection_changes(config: dict):
+    old = fingerprint_config(config)
+    config["collections"][0]["attributes"][0]["size"] = 2000
+    config["collections"].append(
+        {"$id": "new", "databaseId": "6886997800119a565d99", "name": "New"}
+    )
+    changes = changed_resources(old, fingerprint_config(config))
+    assert changes == {SyncType.COLLECTIONS: ["6886998b001f814e0099", "new"]}
+    assert (
+        changed_resources(fingerprint_config(config), fingerprint_config(config)) == {}
+    )
+
+
+def test_filter_config(config: dict):
+    filtered = filter_config(config, {SyncType.COLLECTIONS: ["6886998b001f814e0099"]})
+    assert filtered["projectId"] == config["projectId"]
+    assert "settings" not in filtered
+    assert filtered["collections"] == config["collections"]
+    assert filtered["databases"] == config["databases"]
+
+    filtered = filter_config(config, {SyncType.CONFIG: ["settings"]})
+    assert filtered["settings"] == config["settings"]
+    assert "collections" not in filtered and "databases" not in filtered
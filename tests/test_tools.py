@@ -1,8 +1,13 @@
 import pytest
+from appwrite_lab.tools import bench
 from appwrite_lab.tools.sms import SMS
+from appwrite_lab.tools.users import UserGenerator, read_credentials, write_credentials
 from appwrite_lab.models import Lab
 from httpx import AsyncClient
 import asyncio
+import httpx
+import io
+import json
 
 @pytest.mark.e2e
 @pytest.mark.asyncio
@@ -25,3 +30,55 @@ async def test_sms_get_messages(sms: SMS, lab: Lab):
     assert len(messages[0].get("body")) == 6
 
 
+def test_generate_users(mock_transport, mock_lab: Lab):
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        body = json.loads(request.content) if request.content else {}
+        if request.url.path == "/v1/users" and body["phone"].endswith("000013"):
+            return httpx.Response(409, json={"message": "User exists"})
+        return httpx.Response(201, json={"secret": "s3cret", **body})
+
+    mock_transport(handle)
+    with UserGenerator(mock_lab, max_parallel=4) as generator:
+        users = list(
+            generator.generate(20, sessions=True, phones=True, teams=["a", "b"])
+        )
+    assert len(users) == 19 and len(generator.errors) == 1
+    assert all(user.session == "s3cret" and user.phone for user in users)
+    # Phone numbers carry the run's token, like the user IDs
+    token = users[0].user_id[2:8]
+    assert all(user.phone.startswith(f"+1{int(token, 16):08d}") for user in users)
+    assert {user.team_id for user in users} == {"a", "b"}
+    assert sum(path.endswith("/memberships") for _, path in requests) == 19
+
+    f = io.StringIO()
+    assert write_credentials(users, f) == 19
+    f.seek(0)
+    assert list(read_credentials(f)) == users
+
+
+def test_bench_reports_percentiles(mock_transport, mock_lab: Lab):
+    statuses = {"GET": 200, "POST": 201, "DELETE": 204}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/attributes/value"):
+            return httpx.Response(200, json={"status": "available"})
+        return httpx.Response(statuses[request.method], json={"$id": "file"})
+
+    mock_transport(handle, "Client", "AsyncClient")
+    report = bench.run_bench(
+        mock_lab,
+        mix={"documents.list": 3, "storage.download": 1},
+        requests=200,
+        concurrency=8,
+        seed=1,
+    )
+    assert report.requests == 200 and report.errors == 0
+    assert set(report.scenarios) == {"documents.list", "storage.download"}
+    documents = report.scenarios["documents.list"]
+    assert documents["statuses"] == {"200": documents["requests"]}
+    latency = documents["latency_ms"]
+    assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    assert json.loads(report.to_json())["requests"] == 200
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+from appwrite_lab import _trace
+from appwrite_lab._orchestrator import Response
+from appwrite_lab._trace import annotate, emit, enable_tracing, span, traced
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    yield
+    enable_tracing(None)
+
+
+@traced
+def deploy(fail: bool = False):
+    annotate(lab="test")
+    with span("compose_up", services="appwrite"):
+        emit("ready:api", 0, 1_000_000)
+    return Response(message="Lab failed.", error=fail)
+
+
+def test_spans_nest_in_jsonl(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    enable_tracing(trace_file)
+    deploy()
+    deploy(fail=True)
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    names = [s["name"] for s in spans]
+    assert names == ["ready:api", "compose_up", "deploy"] * 2
+    ready, compose, root = spans[:3]
+    assert root["parent"] is None and root["attrs"] == {"lab": "test"}
+    assert compose["parent"] == root["id"] and ready["parent"] == compose["id"]
+    assert ready["duration_ms"] == 1.0
+    assert spans[5]["attrs"]["error"] == "Lab failed."
+
+
+def test_async_spans_cover_the_awaited_work(tmp_path):
+    @traced
+    async def deploy_async():
+        with span("compose_up"):
+            await asyncio.sleep(0.05)
+
+    async def deploy_many():
+        await asyncio.gather(deploy_async(), deploy_async())
+
+    trace_file = tmp_path / "trace.jsonl"
+    enable_tracing(trace_file)
+    asyncio.run(deploy_many())
+
+    spans = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    roots = {s["id"] for s in spans if s["name"] == "deploy_async"}
+    assert len(roots) == 2
+    assert {s["parent"] for s in spans if s["name"] == "compose_up"} == roots
+    assert all(s["duration_ms"] >= 50 for s in spans)
+
+
+def test_chrome_trace_events(tmp_path):
+    trace_file = tmp_path / "trace.json"
+    enable_tracing(trace_file)
+    with pytest.raises(ValueError):
+        with span("state_write"):
+            raise ValueError("disk full")
+
+    # The array is left open, so close it to parse it strictly
+    events = json.loads(trace_file.read_text().rstrip().rstrip(",") + "]")
+    assert events[0]["ph"] == "X" and events[0]["name"] == "state_write"
+    assert "disk full" in events[0]["args"]["error"]
+
+
+def test_disabled_tracing_writes_nothing(tmp_path):
+    assert not _trace.tracing_enabled()
+    with span("compose_up") as attrs:
+        attrs["services"] = "appwrite"
+    assert deploy().message == "Lab failed."
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,79 @@
+import json
+import socket
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from appwrite_lab import _worker
+from appwrite_lab._worker import AutomationWorker
+
+
+class FakeContainer:
+    """Stands in for the container CLI: `run` serves jobs on the worker socket."""
+
+    def __init__(self, worker: AutomationWorker):
+        self.worker = worker
+        self.starts = 0
+        self.server: socket.socket | None = None
+
+    def run(self, *args: str) -> subprocess.CompletedProcess:
+        stdout = ""
+        if args[0] == "ps" and self.server:
+            stdout = json.dumps({"Names": self.worker.name})
+        elif args[0] == "run":
+            self.starts += 1
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(str(self.worker.socket_path))
+            self.server.listen()
+            threading.Thread(
+                target=self.serve, args=(self.server,), daemon=True
+            ).start()
+        return subprocess.CompletedProcess(args, 0, stdout, "")
+
+    def serve(self, server: socket.socket):
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                if conn.makefile().readline():
+                    conn.sendall(b'{"ok": true, "data": {}}\n')
+
+    def stop(self):
+        if self.server:
+            self.server.close()
+            self.server = None
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    worker = AutomationWorker("docker")
+    container = FakeContainer(worker)
+    monkeypatch.setattr(worker, "_run", container.run)
+    monkeypatch.setattr(worker, "stop", container.stop)
+    yield worker, container
+    container.stop()
+
+
+def test_concurrent_runs_share_one_worker(worker):
+    worker, container = worker
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: worker.run("job", {}), range(16)))
+    assert all(result["ok"] for result in results)
+    assert container.starts == 1
+
+
+def test_worker_restarts_only_for_new_automation_code(worker, monkeypatch):
+    worker, container = worker
+    worker.run("job", {})
+    worker.run("job", {})
+    assert container.starts == 1
+
+    monkeypatch.setattr(_worker, "code_version", lambda: "upgraded")
+    assert worker.run("job", {})["ok"]
+    assert container.starts == 2
+    assert worker.version_path.read_text() == "upgraded"